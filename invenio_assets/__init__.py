@@ -95,11 +95,56 @@ flask webpack commands:
     * ``install`` - Run npm install command and download all dependencies.
     * ``build`` - Run npm run build.
 
+To find out which bundles, loaders and plugins make a build slow, enable
+``ASSETS_WEBPACK_PROFILE``, build the project and summarize the build profile
+per Python package:
+
+.. code-block:: console
+
+    $ flask webpack buildall
+    $ flask assets profile
+
+The assets can be built with webpack (the default) or rspack, selected with
+``ASSETS_BUNDLER``. To compare the build time, peak memory and output of the
+two bundlers, run:
+
+.. code-block:: console
+
+    $ flask assets compare
+
+The transpiler, minifier and source maps of the build are selected with a
+named preset. For instance, CI smoke builds can use esbuild and skip source
+maps with ``ASSETS_BUILD_PRESET = "ci-fast"``.
+
+During development, after changing the assets of some packages, only the
+entries of their bundles can be rebuilt, patching the manifest of the last
+build. Pass the changed files or the names of the packages:
+
+.. code-block:: console
+
+    $ flask assets rebuild invenio_search_ui
+
 Additionally if we have some static files we should collect them:
 
 .. code-block:: console
 
     $ flask collect -v
+
+With the file or link storages of Flask-Collect, the files can be copied or
+linked by several threads:
+
+.. code-block:: console
+
+    $ flask collect --jobs 8
+
+If ``ASSETS_FINGERPRINT`` is enabled, a copy of each collected file with a
+hash of its content in its name is written as well. Use ``assets_url_for``
+in templates (or ``current_assets.url_for``) to link to these copies, which
+can be cached forever by browsers:
+
+.. code-block:: html
+
+    <link rel="icon" href="{{ assets_url_for('images/favicon.ico') }}">
 """
 
 from .ext import InvenioAssets
@@ -0,0 +1,169 @@
+/*
+ * SPDX-FileCopyrightText: 2026 CERN.
+ * SPDX-License-Identifier: MIT
+ */
+
+// Plugin writing the timings of a build and the sizes of its entries as JSON,
+// enabled with ``ASSETS_WEBPACK_PROFILE`` and summarized by
+// ``flask assets profile``. It works with webpack and rspack.
+//
+// Timings are wall-clock milliseconds. As modules are built concurrently, the
+// sum of the module timings is larger than the duration of the build.
+
+const fs = require("fs");
+const path = require("path");
+
+const PLUGIN_NAME = "InvenioAssetsProfilePlugin";
+
+function now() {
+  return Number(process.hrtime.bigint()) / 1e6;
+}
+
+// Name of the npm package of a loader, from its resolved path
+function loaderName(loader) {
+  const parts = loader.split(/[\\/]node_modules[\\/]/);
+  const names = parts[parts.length - 1].split(/[\\/]/);
+  return names[0].startsWith("@") ? names[0] + "/" + names[1] : names[0];
+}
+
+class ProfilePlugin {
+  constructor(options) {
+    this.outputPath = options.outputPath;
+    this.plugins = {};
+    this.modules = {};
+    this.start = null;
+  }
+
+  addTime(name, time) {
+    this.plugins[name] = (this.plugins[name] || 0) + time;
+  }
+
+  // Time the callbacks registered by the other plugins on a hook
+  interceptHook(hook) {
+    if (!hook || typeof hook.intercept !== "function") {
+      return;
+    }
+    const profile = this;
+    try {
+      hook.intercept({
+        register(tap) {
+          const fn = tap.fn;
+          if (tap.name === PLUGIN_NAME || typeof fn !== "function") {
+            return tap;
+          }
+          if (tap.type === "async") {
+            tap.fn = function (...args) {
+              const callback = args.pop();
+              const start = now();
+              return fn.call(this, ...args, (...results) => {
+                profile.addTime(tap.name, now() - start);
+                return callback(...results);
+              });
+            };
+          } else if (tap.type === "promise") {
+            tap.fn = function (...args) {
+              const start = now();
+              return Promise.resolve(fn.apply(this, args)).finally(() => {
+                profile.addTime(tap.name, now() - start);
+              });
+            };
+          } else {
+            tap.fn = function (...args) {
+              const start = now();
+              try {
+                return fn.apply(this, args);
+              } finally {
+                profile.addTime(tap.name, now() - start);
+              }
+            };
+          }
+          return tap;
+        },
+      });
+    } catch (error) {
+      // Hooks of some bundlers do not support interceptors
+    }
+  }
+
+  interceptHooks(hooks) {
+    // Skip the getters of deprecated hooks, which throw
+    for (const descriptor of Object.values(
+      Object.getOwnPropertyDescriptors(hooks),
+    )) {
+      if ("value" in descriptor) {
+        this.interceptHook(descriptor.value);
+      }
+    }
+  }
+
+  apply(compiler) {
+    this.interceptHooks(compiler.hooks);
+
+    const started = () => {
+      this.start = now();
+    };
+    compiler.hooks.run.tap(PLUGIN_NAME, started);
+    compiler.hooks.watchRun.tap(PLUGIN_NAME, started);
+
+    compiler.hooks.thisCompilation.tap(PLUGIN_NAME, (compilation) => {
+      this.interceptHooks(compilation.hooks);
+
+      const starts = new Map();
+      compilation.hooks.buildModule.tap(PLUGIN_NAME, (module) => {
+        starts.set(module, now());
+      });
+      const built = (module) => {
+        const start = starts.get(module);
+        if (start === undefined || !module.resource) {
+          return;
+        }
+        starts.delete(module);
+        const name = path.relative(compiler.context, module.resource);
+        this.modules[name] = {
+          time: now() - start,
+          loaders: (module.loaders || []).map((l) => loaderName(l.loader)),
+        };
+      };
+      compilation.hooks.succeedModule.tap(PLUGIN_NAME, built);
+      compilation.hooks.failedModule.tap(PLUGIN_NAME, built);
+    });
+
+    compiler.hooks.done.tap(PLUGIN_NAME, (stats) => {
+      const compilation = stats.compilation;
+      const entries = {};
+      for (const [name, entrypoint] of compilation.entrypoints) {
+        const files = Array.from(entrypoint.getFiles()).sort();
+        let size = 0;
+        for (const file of files) {
+          const asset = compilation.getAsset(file);
+          size += asset ? asset.source.size() : 0;
+        }
+        entries[name] = { files, size };
+      }
+
+      const loaders = {};
+      for (const module of Object.values(this.modules)) {
+        // The time of a module is attributed to the loader which runs first,
+        // i.e. the last one of its chain (e.g. sass-loader, babel-loader).
+        const count = module.loaders.length;
+        const loader = count ? module.loaders[count - 1] : "(none)";
+        loaders[loader] = (loaders[loader] || 0) + module.time;
+      }
+
+      const profile = {
+        version: 1,
+        time: this.start === null ? null : now() - this.start,
+        modules: this.modules,
+        loaders,
+        plugins: this.plugins,
+        entries,
+      };
+      fs.mkdirSync(path.dirname(this.outputPath), { recursive: true });
+      fs.writeFileSync(this.outputPath, JSON.stringify(profile, null, 2));
+      this.modules = {};
+      this.plugins = {};
+    });
+  }
+}
+
+module.exports = ProfilePlugin;
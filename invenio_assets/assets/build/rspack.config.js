@@ -7,9 +7,22 @@
 // https://birtles.blog/2024/08/14/lessons-learned-switching-to-rspack/
 
 const BundleTracker = require("webpack-bundle-tracker");
-const config = require("./config");
 const path = require("path");
 
+// Each shard of a sharded build has its own config, see ``invenio_assets.shards``
+const configPath =
+  process.env.INVENIO_ASSETS_CONFIG || path.resolve(__dirname, "config.json");
+const config = require(configPath);
+const shard = config.build.shard;
+// Modern target of a differential build, see ``invenio_assets.differential``
+const modern = Boolean(config.build.target && config.build.target.name === "modern");
+
+// Build preset, see ``invenio_assets.presets``. rspack always uses its builtin
+// SWC loader and minimizers.
+const preset = config.build.preset || {};
+const minifier = preset.minifier === undefined ? "terser" : preset.minifier;
+const targets = modern ? config.build.target.browsers : preset.targets;
+
 // Use rspack
 const rspack = require("@rspack/core");
 
@@ -66,17 +79,23 @@ var webpackConfig = {
     },
   },
   output: {
-    clean: true, // replaces CleanWebpackPlugin
+    // replaces CleanWebpackPlugin; shards share the output directory, which
+    // is cleaned before building them
+    clean: !shard,
+    // Each shard has its own runtime and split chunks: runtimes of different
+    // shards loaded in the same page must not share their global chunk array
+    uniqueName: shard ? `invenio-assets-shard-${shard.index}` : undefined,
     path: config.build.assetsPath,
     filename: "js/[name].[chunkhash].js",
     chunkFilename: "js/[id].[chunkhash].js",
     publicPath: config.build.assetsURL,
   },
   optimization: {
+    minimize: prod && Boolean(minifier),
     minimizer: [
       new rspack.SwcJsMinimizerRspackPlugin({
         compress: {
-          ecma: 5,
+          ecma: modern ? 2020 : 5,
           // warnings: false,
           // Disabled because of an issue with Uglify breaking seemingly valid code:
           // https://github.com/facebook/create-react-app/issues/2376
@@ -90,7 +109,7 @@ var webpackConfig = {
           inline: 2,
         },
         mangle: {
-          safari10: true,
+          safari10: !modern,
         },
       }),
 
@@ -146,7 +165,7 @@ var webpackConfig = {
             },
           },
           env: {
-            targets: "Chrome >= 48",
+            targets: targets || "Chrome >= 48",
           },
         },
       },
@@ -196,7 +215,11 @@ var webpackConfig = {
     ],
   },
   devtool:
-    process.env.NODE_ENV === "production" ? "source-map" : "inline-source-map",
+    preset.sourceMap !== undefined
+      ? preset.sourceMap
+      : prod
+        ? "source-map"
+        : "inline-source-map",
   plugins: [
     new rspack.DefinePlugin({
       "process.env": process.env.NODE_ENV,
@@ -222,7 +245,9 @@ var webpackConfig = {
     // Write manifest file which Python will read.
     new BundleTracker({
       path: config.build.assetsPath,
-      filename: path.join(config.build.assetsPath, "manifest.json"),
+      filename: shard
+        ? shard.manifestPath
+        : path.join(config.build.assetsPath, "manifest.json"),
       publicPath: config.build.assetsURL,
     }),
   ],
@@ -240,6 +265,14 @@ var webpackConfig = {
   },
 };
 
+// Write the timings and output sizes of the build, see ``ASSETS_WEBPACK_PROFILE``
+if (config.build.profile) {
+  const ProfilePlugin = require("./profile-plugin");
+  webpackConfig.plugins.push(
+    new ProfilePlugin({ outputPath: config.build.profile }),
+  );
+}
+
 if (process.env.npm_config_report) {
   var BundleAnalyzerPlugin =
     require("webpack-bundle-analyzer").BundleAnalyzerPlugin;
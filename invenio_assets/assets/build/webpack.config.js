@@ -12,10 +12,105 @@ const ESLintPlugin = require("eslint-webpack-plugin");
 const CopyWebpackPlugin = require("copy-webpack-plugin");
 const MiniCssExtractPlugin = require("mini-css-extract-plugin");
 const TerserPlugin = require("terser-webpack-plugin");
-const config = require("./config");
 const path = require("path");
 const webpack = require("webpack");
 
+// Each shard of a sharded build has its own config, see ``invenio_assets.shards``
+const configPath =
+  process.env.INVENIO_ASSETS_CONFIG || path.resolve(__dirname, "config.json");
+const config = require(configPath);
+const shard = config.build.shard;
+// Modern target of a differential build, see ``invenio_assets.differential``
+const modern = Boolean(config.build.target && config.build.target.name === "modern");
+
+// Build preset, see ``invenio_assets.presets``
+const preset = config.build.preset || {};
+const transpiler = preset.transpiler || "babel";
+const minifier = preset.minifier === undefined ? "terser" : preset.minifier;
+const targets = modern ? config.build.target.browsers : preset.targets;
+const production = process.env.NODE_ENV === "production";
+
+// esbuild targets are engine versions (e.g. ``chrome80``) instead of
+// browserslist queries
+function esbuildTarget(queries) {
+  const engines = {
+    chrome: "chrome",
+    edge: "edge",
+    firefox: "firefox",
+    ios_saf: "ios",
+    safari: "safari",
+  };
+  const target = [];
+  for (const query of queries || []) {
+    const match = /^(\w+) >= ([\d.]+)$/.exec(query);
+    if (!match || !engines[match[1]]) {
+      return "es2015";
+    }
+    target.push(engines[match[1]] + match[2]);
+  }
+  return target.length > 0 ? target : "es2015";
+}
+
+// Minify functions of the JS and CSS minimizers, per minifier
+const minifiers = {
+  terser: [TerserPlugin.terserMinify, CssMinimizerPlugin.cssnanoMinify],
+  swc: [TerserPlugin.swcMinify, CssMinimizerPlugin.cssnanoMinify],
+  esbuild: [TerserPlugin.esbuildMinify, CssMinimizerPlugin.esbuildMinify],
+};
+const [jsMinify, cssMinify] = minifiers[minifier] || minifiers.terser;
+// The Terser options below only apply to Terser
+const minifierOptions = {
+  swc: {},
+  esbuild: { target: esbuildTarget(targets) },
+};
+
+// Loaders of the JavaScript sources, per transpiler
+const transpilers = {
+  babel: () => ({
+    loader: "babel-loader",
+    options: {
+      cacheDirectory: config.build.cache
+        ? path.join(config.build.cache.directory, "babel-loader")
+        : false,
+      cacheCompression: false,
+      presets: [
+        targets
+          ? ["@babel/preset-env", { targets: targets, bugfixes: true }]
+          : "@babel/preset-env",
+        "@babel/preset-react",
+      ],
+      plugins: [
+        "@babel/plugin-proposal-class-properties",
+        "@babel/plugin-transform-runtime",
+      ],
+    },
+  }),
+  swc: () => ({
+    loader: "swc-loader",
+    options: {
+      jsc: {
+        parser: {
+          syntax: "ecmascript",
+          jsx: true,
+        },
+        transform: {
+          react: {
+            development: !production,
+          },
+        },
+      },
+      env: targets ? { targets: targets } : undefined,
+    },
+  }),
+  esbuild: () => ({
+    loader: "esbuild-loader",
+    options: {
+      loader: "jsx",
+      target: esbuildTarget(targets),
+    },
+  }),
+};
+
 // Load aliases from config and resolve their full path
 let aliases = {};
 if (config.aliases) {
@@ -27,6 +122,11 @@ if (config.aliases) {
   );
 }
 
+// Parallelism of babel and of the minimizers, see ``invenio_config``
+const parallel = config.build.parallel || {};
+const minimizerParallel =
+  parallel.minimizer === undefined ? true : parallel.minimizer;
+
 // Create copy patterns from config
 let copyPatterns = [];
 if (config.copy) {
@@ -70,15 +170,20 @@ var webpackConfig = {
     filename: "js/[name].[chunkhash].js",
     chunkFilename: "js/[id].[chunkhash].js",
     publicPath: config.build.assetsURL,
+    // Each shard has its own runtime and split chunks: runtimes of different
+    // shards loaded in the same page must not share their global chunk array
+    uniqueName: shard ? `invenio-assets-shard-${shard.index}` : undefined,
   },
   optimization: {
     // Keep unminimized assets in development mode (i.e. `watch` and not `build`)
     // so that components inspection with the React Developer Tools browser extension
     // shows full component names.
-    minimize: process.env.NODE_ENV === "production",
+    minimize: production && Boolean(minifier),
     minimizer: [
       new TerserPlugin({
-        terserOptions: {
+        parallel: minimizerParallel,
+        minify: jsMinify,
+        terserOptions: minifierOptions[minifier] || {
           parse: {
             // We want terser to parse ecma 8 code. However, we don't want it
             // to apply any minification steps that turns valid ecma 5 code
@@ -88,7 +193,7 @@ var webpackConfig = {
             ecma: 8,
           },
           compress: {
-            ecma: 5,
+            ecma: modern ? 2020 : 5,
             warnings: false,
             // Disabled because of an issue with Uglify breaking seemingly valid code:
             // https://github.com/facebook/create-react-app/issues/2376
@@ -102,10 +207,10 @@ var webpackConfig = {
             inline: 2,
           },
           mangle: {
-            safari10: true,
+            safari10: !modern,
           },
           output: {
-            ecma: 5,
+            ecma: modern ? 2020 : 5,
             comments: false,
             // Turned on because emoji and regex is not minified properly using default
             // https://github.com/facebook/create-react-app/issues/2488
@@ -113,7 +218,7 @@ var webpackConfig = {
           },
         },
       }),
-      new CssMinimizerPlugin(),
+      new CssMinimizerPlugin({ parallel: minimizerParallel, minify: cssMinify }),
     ],
     splitChunks: {
       chunks: "all",
@@ -140,18 +245,7 @@ var webpackConfig = {
       {
         test: /\.(js|jsx)$/,
         exclude: [/node_modules/, /@babel(?:\/|\\{1,2})runtime/],
-        use: [
-          {
-            loader: "babel-loader",
-            options: {
-              presets: ["@babel/preset-env", "@babel/preset-react"],
-              plugins: [
-                "@babel/plugin-proposal-class-properties",
-                "@babel/plugin-transform-runtime",
-              ],
-            },
-          },
-        ],
+        use: [transpilers[transpiler]()],
       },
       {
         test: /\.(scss|css)$/,
@@ -203,7 +297,11 @@ var webpackConfig = {
     ],
   },
   devtool:
-    process.env.NODE_ENV === "production" ? "source-map" : "inline-source-map",
+    preset.sourceMap !== undefined
+      ? preset.sourceMap
+      : production
+        ? "source-map"
+        : "inline-source-map",
   plugins: [
     new ESLintPlugin({
       emitWarning: true,
@@ -238,7 +336,9 @@ var webpackConfig = {
     // Write manifest file which Python will read.
     new BundleTracker({
       path: config.build.assetsPath,
-      filename: path.join(config.build.assetsPath, "manifest.json"),
+      filename: shard
+        ? shard.manifestPath
+        : path.join(config.build.assetsPath, "manifest.json"),
       publicPath: config.build.assetsURL,
     }),
   ],
@@ -258,6 +358,47 @@ if (copyPatterns.length > 0) {
   webpackConfig.plugins.push(copyPlugin);
 }
 
+// Shards share the output directory, which is cleaned before building them
+if (shard) {
+  webpackConfig.plugins = webpackConfig.plugins.filter(
+    (plugin) => !(plugin instanceof CleanWebpackPlugin)
+  );
+}
+
+// Persistent build cache, invalidated when the generated config or the
+// dependencies change.
+if (config.build.cache) {
+  webpackConfig.cache = {
+    type: "filesystem",
+    cacheDirectory: config.build.cache.directory,
+    // Shards are built concurrently and must not share a cache
+    name: shard ? `shard-${shard.index}-${webpackConfig.mode}` : undefined,
+    version: config.build.cache.version,
+    buildDependencies: {
+      config: [__filename, configPath],
+    },
+  };
+}
+
+// Transpile files in a pool of worker processes
+if (parallel.babel > 0 && transpiler === "babel") {
+  const babelRule = webpackConfig.module.rules.find(
+    (rule) => rule.use && rule.use[0].loader === "babel-loader"
+  );
+  babelRule.use.unshift({
+    loader: "thread-loader",
+    options: { workers: parallel.babel },
+  });
+}
+
+// Write the timings and output sizes of the build, see ``ASSETS_WEBPACK_PROFILE``
+if (config.build.profile) {
+  const ProfilePlugin = require("./profile-plugin");
+  webpackConfig.plugins.push(
+    new ProfilePlugin({ outputPath: config.build.profile }),
+  );
+}
+
 if (process.env.npm_config_report) {
   var BundleAnalyzerPlugin =
     require("webpack-bundle-analyzer").BundleAnalyzerPlugin;
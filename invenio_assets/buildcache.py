@@ -0,0 +1,114 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Cache of the output of webpack builds.
+
+The inputs of a build (the files of the project template and of the bundles,
+the generated ``config.json`` and ``package.json``, and the lockfile of the
+package manager) are hashed into a fingerprint. The output of each build is
+stored in a cache directory under its fingerprint, and later builds with the
+same fingerprint restore it instead of running npm and webpack.
+"""
+
+import hashlib
+import os
+import shutil
+
+from .sync import file_hash
+
+LOCKFILES = ("package-lock.json", "yarn.lock", "pnpm-lock.yaml")
+"""Names of the lockfiles of the supported package managers."""
+
+
+def build_fingerprint(files, args=()):
+    """Compute the fingerprint of the inputs of a build.
+
+    :param files: Iterable of ``(path, relative path)`` tuples of the input
+        files. Directories (e.g. linked by the storage in debug mode) stand
+        for all the files inside them. If several files have the same
+        relative path, the first one wins. Missing files are skipped.
+    :param args: Arguments of the build script.
+    :returns: A hexadecimal SHA-256 hash.
+    """
+    digests = {}
+
+    def add(path, relpath):
+        if relpath not in digests:
+            digests[relpath] = file_hash(path)
+
+    for path, relpath in files:
+        if os.path.isdir(path):
+            for root, dirs, filenames in os.walk(path, followlinks=True):
+                dirs.sort()
+                for filename in sorted(filenames):
+                    filepath = os.path.join(root, filename)
+                    add(
+                        filepath,
+                        os.path.join(relpath, os.path.relpath(filepath, path)),
+                    )
+        elif os.path.isfile(path):
+            add(path, relpath)
+
+    sha = hashlib.sha256()
+    for arg in args:
+        sha.update("arg:{0}\n".format(arg).encode("utf-8"))
+    for relpath in sorted(digests):
+        sha.update("{0}:{1}\n".format(relpath, digests[relpath]).encode("utf-8"))
+    return sha.hexdigest()
+
+
+class BuildCache(object):
+    """Content-addressed cache of build outputs in a directory."""
+
+    def __init__(self, directory, max_entries=5):
+        """Initialize cache.
+
+        :param directory: Path of the cache directory.
+        :param max_entries: Number of build outputs to keep. The least
+            recently used ones are removed.
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+
+    def _path(self, fingerprint):
+        return os.path.join(self.directory, fingerprint)
+
+    def restore(self, fingerprint, dstdir):
+        """Replace a directory with the cached build output, if any.
+
+        :returns: ``True`` if the build output was restored.
+        """
+        path = self._path(fingerprint)
+        if not os.path.isdir(path):
+            return False
+        if os.path.isdir(dstdir):
+            shutil.rmtree(dstdir)
+        shutil.copytree(path, dstdir, symlinks=True)
+        # Mark as recently used
+        os.utime(path)
+        return True
+
+    def store(self, fingerprint, srcdir):
+        """Store a build output in the cache."""
+        path = self._path(fingerprint)
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        os.makedirs(self.directory, exist_ok=True)
+        shutil.copytree(srcdir, tmp_path, symlinks=True)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        os.rename(tmp_path, path)
+        self.prune()
+
+    def prune(self):
+        """Remove the least recently used build outputs."""
+        entries = sorted(
+            (
+                entry
+                for entry in os.scandir(self.directory)
+                if entry.is_dir() and not entry.name.endswith(".tmp")
+            ),
+            key=lambda entry: entry.stat().st_mtime_ns,
+            reverse=True,
+        )
+        for entry in entries[self.max_entries :]:
+            shutil.rmtree(entry.path)
@@ -3,17 +3,248 @@
 
 """Click command-line interface for assets and collect."""
 
+import os
+import time
+
 import click
+from flask import current_app
 from flask.cli import with_appcontext
+from flask_webpackext import current_webpack
 
+from .collect import collect_static
+from .compare import diff_entries, entry_sizes, run_build
+from .compress import compress_app_directory
+from .profile import bundle_packages, load_profile, summarize_profile, top
 from .proxies import current_assets
+from .rebuild import RebuildError, affected_entries
+from .webpack import BUNDLER_PROJECTS
 
-__all__ = ("collect",)
+__all__ = (
+    "assets",
+    "collect",
+)
 
 
 @click.command()
 @click.option("-v", "--verbose", default=False, is_flag=True)
+@click.option(
+    "-j",
+    "--jobs",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of threads copying or linking files.",
+)
+@click.option(
+    "--full",
+    default=False,
+    is_flag=True,
+    help="Collect all files again, ignoring the state of the previous run.",
+)
 @with_appcontext
-def collect(verbose=False):
+def collect(verbose=False, jobs=1, full=False):
     """Collect static files."""
-    current_assets.collect.collect(verbose=verbose)
+    stats = collect_static(
+        current_assets.collect,
+        verbose=verbose,
+        jobs=jobs,
+        state_path=(
+            current_app.config["ASSETS_COLLECT_STATE_PATH"]
+            if current_app.config["ASSETS_COLLECT_INCREMENTAL"]
+            else None
+        ),
+        full=full,
+        fingerprint_path=(
+            current_app.config["ASSETS_FINGERPRINT_MANIFEST"]
+            if current_app.config["ASSETS_FINGERPRINT"]
+            else None
+        ),
+    )
+    if stats is not None:
+        click.echo(
+            "Collected {0} files ({1} changed, {2} removed) in {3:.2f}s "
+            "({4:.0f} files/s).".format(
+                stats.files,
+                stats.changed,
+                stats.removed,
+                stats.seconds,
+                stats.files / stats.seconds if stats.seconds else 0,
+            )
+        )
+        if current_app.config["ASSETS_FINGERPRINT"]:
+            click.echo("Wrote {0} fingerprinted files.".format(stats.fingerprinted))
+    if current_app.config["ASSETS_COMPRESS"]:
+        compressed = compress_app_directory(
+            current_app, current_assets.collect.static_root
+        )
+        click.echo("Compressed {0} files ({1} sidecars written).".format(*compressed))
+
+
+@click.group()
+def assets():
+    """Invenio-Assets commands."""
+
+
+@assets.command()
+@click.option(
+    "-p",
+    "--path",
+    type=click.Path(dir_okay=False),
+    help="Path of the build profile, by default ASSETS_WEBPACK_PROFILE_PATH.",
+)
+@click.option(
+    "-n",
+    "--top",
+    "count",
+    default=10,
+    type=click.IntRange(min=0),
+    help="Number of loaders, plugins and modules to show.",
+)
+@with_appcontext
+def profile(path=None, count=10):
+    """Summarize the profile of the last webpack build."""
+    path = path or current_app.config["ASSETS_WEBPACK_PROFILE_PATH"]
+    try:
+        data = load_profile(path)
+    except (OSError, ValueError):
+        raise click.ClickException(
+            "No build profile found in {0}. Enable ASSETS_WEBPACK_PROFILE, "
+            "then run flask webpack buildall.".format(path)
+        )
+
+    files, entries = bundle_packages(current_webpack.project)
+    if data.get("time") is not None:
+        click.echo("Build time: {0:.1f}s".format(data["time"] / 1000))
+    click.echo("")
+    click.echo(
+        "{0:<40} {1:>10} {2:>8} {3:>10}".format(
+            "Package", "Time (s)", "Modules", "Size (kB)"
+        )
+    )
+    for stats in summarize_profile(data, files, entries):
+        click.echo(
+            "{0:<40} {1:>10.1f} {2:>8} {3:>10.1f}".format(
+                stats.package, stats.time / 1000, stats.modules, stats.size / 1024
+            )
+        )
+    for title, key in (("Loaders", "loaders"), ("Plugins", "plugins")):
+        click.echo("")
+        click.echo("{0:<51} {1:>10}".format(title, "Time (s)"))
+        for name, time in top(data.get(key, {}), count):
+            click.echo("{0:<51} {1:>10.1f}".format(name, time / 1000))
+    click.echo("")
+    click.echo("{0:<51} {1:>10}".format("Slowest modules", "Time (s)"))
+    modules = {name: m["time"] for name, m in data.get("modules", {}).items()}
+    for name, time in top(modules, count):
+        click.echo("{0:<51} {1:>10.1f}".format(name, time / 1000))
+
+
+@assets.command()
+@click.option(
+    "-b",
+    "--bundler",
+    "bundlers",
+    multiple=True,
+    type=click.Choice(sorted(BUNDLER_PROJECTS)),
+    help="Bundler to compare, by default all of them.",
+)
+@click.option(
+    "-o",
+    "--output-dir",
+    type=click.Path(file_okay=False),
+    help="Directory of the builds, by default in ASSETS_CACHE_DIR.",
+)
+@with_appcontext
+def compare(bundlers=(), output_dir=None):
+    """Build with several bundlers and compare the builds."""
+    bundlers = bundlers or ("webpack", "rspack")
+    output_dir = output_dir or os.path.join(
+        current_app.config["ASSETS_CACHE_DIR"] or current_app.instance_path,
+        "compare",
+    )
+    app = current_app._get_current_object()
+    results = [run_build(app, bundler, output_dir) for bundler in bundlers]
+
+    click.echo("")
+    click.echo(
+        "{0:<12} {1:>10} {2:>18}  Status".format(
+            "Bundler", "Time (s)", "Peak memory (MB)"
+        )
+    )
+    for result in results:
+        click.echo(
+            "{0:<12} {1:>10.1f} {2:>18.0f}  {3}".format(
+                result.bundler,
+                result.seconds,
+                result.max_rss / 2**20,
+                "ok" if result.exit_code == 0 else "failed",
+            )
+        )
+    if any(result.exit_code != 0 for result in results):
+        raise click.ClickException("Some builds failed.")
+
+    sizes = [entry_sizes(result.manifest) for result in results]
+    click.echo("")
+    click.echo(
+        "{0:<40}".format("Entry")
+        + "".join("{0:>16}".format(b + " (kB)") for b in bundlers)
+        + "{0:>10}".format("Diff")
+    )
+    mismatch = False
+    for diff in diff_entries(*sizes):
+        columns = [
+            "{0:>16}".format(
+                "missing" if size is None else "{0:.1f}".format(size / 1024)
+            )
+            for size in diff.sizes
+        ]
+        change = ""
+        if None in diff.sizes:
+            mismatch = True
+        elif diff.sizes[0]:
+            change = "{0:+.1f}%".format(100 * (diff.sizes[-1] / diff.sizes[0] - 1))
+        click.echo(
+            "{0:<40}".format(diff.name) + "".join(columns) + "{0:>10}".format(change)
+        )
+    if mismatch:
+        raise click.ClickException("The builds do not have the same entries.")
+
+
+@assets.command()
+@click.argument("targets", nargs=-1, required=True)
+@click.option(
+    "-n",
+    "--dry-run",
+    default=False,
+    is_flag=True,
+    help="Only show the entries which would be rebuilt.",
+)
+@with_appcontext
+def rebuild(targets, dry_run=False):
+    """Rebuild the entries affected by changed files or packages.
+
+    TARGETS are paths of changed files, or names of packages registering
+    webpack bundles.
+    """
+    project = current_webpack.project
+    try:
+        entries = affected_entries(project, targets)
+    except RebuildError as e:
+        raise click.ClickException("{0} Run flask webpack build instead.".format(e))
+    if not entries:
+        click.echo("No entries are affected.")
+        return
+    click.echo("Rebuilding {0}.".format(", ".join(entries)))
+    if dry_run:
+        return
+    start = time.monotonic()
+    try:
+        project.rebuild(entries)
+    except RebuildError as e:
+        raise click.ClickException("{0} Run flask webpack buildall first.".format(e))
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    click.echo(
+        "Rebuilt {0} entries in {1:.1f}s.".format(
+            len(entries), time.monotonic() - start
+        )
+    )
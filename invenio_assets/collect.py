@@ -3,6 +3,20 @@
 
 """Media asset management for Invenio."""
 
+import os
+import shutil
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from flask_collect.storage.base import BaseStorage
+
+from .compress import remove_sidecars
+from .fingerprint import fingerprint_files
+from .sync import SyncState, check_file, remove_deleted
+
+CollectStats = namedtuple("CollectStats", "files changed removed fingerprinted seconds")
+
 
 def collect_staticroot_removal(app, blueprints):
     """Remove collect's static root folder from list."""
@@ -12,3 +26,126 @@ def collect_staticroot_removal(app, blueprints):
         for bp in blueprints
         if (bp.has_static_folder and bp.static_folder != collect_root)
     ]
+
+
+def copy_file(bp, src, dst, relpath, force=False):
+    """Copy a file unless the destination is newer, like the file storage."""
+    if os.path.exists(dst):
+        if os.path.getmtime(dst) >= os.path.getmtime(src) and not force:
+            return None
+        os.remove(dst)
+    else:
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+    shutil.copy(src, dst)
+    return "Copied: [{0}] '{1}'".format(bp.name, dst)
+
+
+def link_file(bp, src, dst, relpath, force=False):
+    """Symlink a file unless already linked, like the link storage."""
+    if os.path.exists(dst) and os.path.realpath(src) == os.path.realpath(dst):
+        if not force:
+            return None
+    if os.path.islink(dst):
+        os.remove(dst)
+    else:
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+    os.symlink(src, dst)
+    return "{0}:{1} symbolink link created".format(bp.name, relpath)
+
+
+collect_functions = {
+    "flask_collect.storage.file": copy_file,
+    "flask_collect.storage.link": link_file,
+}
+"""Function collecting a single file, for each supported collect storage."""
+
+
+def collect_static(
+    collect, verbose=False, jobs=1, state_path=None, full=False, fingerprint_path=None
+):
+    """Collect static files from the application and blueprints.
+
+    Files are discovered in the same order and with the same precedence as
+    Flask-Collect (the first blueprint providing a file wins), and copied or
+    linked by a pool of threads. Storages other than the file and link
+    storages of Flask-Collect are run as is.
+
+    If a ``state_path`` is given, the source path, size, modification time and
+    content hash of each collected file are recorded in it. The following
+    runs skip the files which did not change, and remove the collected files
+    whose source disappeared.
+
+    If a ``fingerprint_path`` is given, a copy of each collected file with a
+    hash of its content in its name is written as well, and the manifest
+    mapping the collected files to their copies is written to this path (see
+    :mod:`invenio_assets.fingerprint`).
+
+    :param collect: The :class:`flask_collect.Collect` extension.
+    :param verbose: Print a message for each collected file.
+    :param jobs: Number of threads copying or linking files.
+    :param state_path: Path of the state file of incremental collection.
+    :param full: Collect all files again, regardless of the state.
+    :param fingerprint_path: Path of the manifest of fingerprinted files.
+    :returns: A :class:`CollectStats` tuple, or ``None`` if the storage was
+        run as is.
+    """
+    collect_file = collect_functions.get(collect.storage)
+    if collect_file is None:
+        collect.collect(verbose=verbose)
+        return None
+
+    storage = BaseStorage(collect, verbose=verbose)
+    storage.log("Collect static from blueprints.")
+    start = time.monotonic()
+
+    state = SyncState(state_path).load() if state_path else None
+    previous = state.files if state and not full else {}
+    # Symlinks always reflect the content of their source
+    hash_content = collect_file is not link_file
+
+    def run(item):
+        bp, src, relpath = item
+        dst = os.path.join(collect.static_root, relpath)
+        if state is None:
+            message = collect_file(bp, src, dst, relpath, force=full)
+            return relpath, src, None, message
+
+        prev = previous.get(relpath)
+        record, unchanged = check_file(src, dst, prev, hash_content=hash_content)
+        if unchanged:
+            return relpath, src, record, None
+        # Overwrite files known to have changed, even if the destination is
+        # newer than the source.
+        force = full or prev is not None
+        message = collect_file(bp, src, dst, relpath, force=force)
+        return relpath, src, record, message
+
+    files = {}
+    sources = []
+    changed = 0
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        # Results are yielded in order, so that the output is deterministic
+        for relpath, src, record, message in pool.map(run, storage):
+            files[relpath] = record
+            sources.append((src, relpath, record[3] if record else None))
+            if message is not None:
+                changed += 1
+                storage.log(message)
+
+    removed = []
+    if state is not None:
+        removed = remove_deleted(state.files, files, collect.static_root)
+        for relpath in removed:
+            remove_sidecars(os.path.join(collect.static_root, relpath))
+            storage.log("Removed: '{0}'".format(relpath))
+        state.files = files
+        state.save()
+
+    fingerprinted = 0
+    if fingerprint_path:
+        fingerprinted = fingerprint_files(
+            sources, collect.static_root, fingerprint_path
+        )
+    return CollectStats(
+        len(files), changed, len(removed), fingerprinted, time.monotonic() - start
+    )
@@ -0,0 +1,108 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Comparison of the builds of the webpack project with several bundlers.
+
+The project is built with each bundler in a child process, into separate
+project and output directories, so that the wall time and the peak memory of
+each build (including npm and the bundler processes) can be measured. The
+manifests of the builds are then compared entry by entry.
+
+Child processes are created with :func:`os.fork`, which is not available on
+Windows.
+"""
+
+import json
+import os
+import sys
+import time
+import traceback
+from collections import namedtuple
+
+from flask_webpackext import current_webpack
+
+from .webpack import BUNDLER_PROJECTS
+
+BuildResult = namedtuple("BuildResult", "bundler exit_code seconds max_rss manifest")
+
+EntryDiff = namedtuple("EntryDiff", "name sizes")
+
+
+def run_build(app, bundler, output_dir):
+    """Build the project with a bundler in a child process.
+
+    The build cache and the compression of the output are disabled, so that
+    only the bundler is measured.
+
+    :param app: An instance of :class:`~flask.Flask`.
+    :param bundler: Name of the bundler, see
+        :data:`~invenio_assets.webpack.BUNDLER_PROJECTS`.
+    :param output_dir: Directory of the project and output directories.
+    :returns: A :class:`BuildResult` tuple, with the peak memory in bytes.
+    """
+    distdir = os.path.join(output_dir, bundler, "dist")
+    sys.stdout.flush()
+    sys.stderr.flush()
+    start = time.monotonic()
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 1
+        try:
+            app.config.update(
+                WEBPACKEXT_PROJECT=BUNDLER_PROJECTS[bundler],
+                WEBPACKEXT_PROJECT_BUILDDIR=os.path.join(output_dir, bundler, "assets"),
+                WEBPACKEXT_PROJECT_DISTDIR=distdir,
+                ASSETS_BUILD_CACHE=False,
+                ASSETS_COMPRESS=False,
+            )
+            project = current_webpack.project
+            # The package is cached with the path of the project
+            project._npmpkg = None
+            project.buildall()
+            exit_code = 0
+        except Exception:
+            traceback.print_exc()
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exit_code)
+
+    _, status, rusage = os.wait4(pid, 0)
+    return BuildResult(
+        bundler,
+        os.waitstatus_to_exitcode(status),
+        time.monotonic() - start,
+        # Kilobytes on Linux
+        rusage.ru_maxrss * 1024,
+        os.path.join(distdir, "manifest.json"),
+    )
+
+
+def entry_sizes(manifest_path):
+    """Get the total size of the output files of each entry of a manifest.
+
+    :param manifest_path: Path of a manifest written by
+        webpack-bundle-tracker, next to the output files.
+    :returns: A dictionary of entry names and sizes in bytes.
+    """
+    with open(manifest_path) as fp:
+        manifest = json.load(fp)
+    distdir = os.path.dirname(manifest_path)
+    sizes = {}
+    for name, chunks in manifest["chunks"].items():
+        sizes[name] = sum(
+            os.path.getsize(os.path.join(distdir, manifest["assets"][chunk]["name"]))
+            for chunk in chunks
+        )
+    return sizes
+
+
+def diff_entries(*sizes):
+    """Compare the entry sizes of several builds.
+
+    :param sizes: Dictionaries of entry sizes, see :func:`entry_sizes`.
+    :returns: A list of :class:`EntryDiff` tuples sorted by name, with the
+        size of the entry in each build, or ``None`` if it is missing.
+    """
+    names = sorted(set().union(*sizes))
+    return [EntryDiff(name, tuple(s.get(name) for s in sizes)) for name in names]
@@ -0,0 +1,152 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Precompressed sidecars of static files.
+
+A gzip (``.gz``) and, if the `brotli <https://pypi.org/project/Brotli/>`_
+package is installed (e.g. with the ``brotli`` extra of invenio-assets), a
+brotli (``.br``) compressed copy is written next to each compressible file,
+so that a web server can send them as is (e.g. with the ``gzip_static`` and
+``brotli_static`` modules of nginx) instead of compressing the files on each
+request. Sidecars are removed together with their file (see
+:func:`remove_sidecars`), so that deleted files are not served anymore.
+"""
+
+import gzip
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CompressStats = namedtuple("CompressStats", "files written")
+
+COMPRESSIBLE_EXTENSIONS = (".js", ".css", ".svg", ".json", ".map")
+"""Extensions of the files which are compressed by default."""
+
+
+def _gzip(data, level):
+    """Compress data with gzip, with a level from 1 to 9."""
+    # Fixed modification time, so that the output is reproducible
+    return gzip.compress(data, compresslevel=max(1, min(level, 9)), mtime=0)
+
+
+def _brotli(data, level):
+    """Compress data with brotli, with a level from 0 to 11."""
+    return brotli.compress(data, quality=max(0, min(level, 11)))
+
+
+compressors = {".gz": _gzip}
+"""Function compressing data with a level, for each sidecar extension."""
+if brotli is not None:
+    compressors[".br"] = _brotli
+
+SIDECAR_SUFFIXES = (".gz", ".br")
+"""Extensions of all the sidecars, including the unavailable ones."""
+
+
+def remove_sidecars(path):
+    """Remove the compressed sidecars of a file, if any."""
+    for suffix in SIDECAR_SUFFIXES:
+        sidecar = path + suffix
+        if os.path.isfile(sidecar):
+            os.remove(sidecar)
+
+
+def compress_file(path, level=9, min_size=1024, suffixes=None):
+    """Write the compressed sidecars of a file.
+
+    Sidecars which are newer than the file are not written again.
+
+    :param path: Path of the file.
+    :param level: Compression level, capped to the maximum level of each
+        compression format.
+    :param min_size: Minimum size of the file in bytes. Smaller files are not
+        worth compressing.
+    :param suffixes: Extensions of the sidecars to write, by default all the
+        available ones (see :data:`compressors`).
+    :returns: The number of written sidecars.
+    """
+    stat = os.stat(path)
+    if stat.st_size < min_size:
+        return 0
+
+    written = 0
+    data = None
+    for suffix in suffixes or compressors:
+        sidecar = path + suffix
+        try:
+            if os.stat(sidecar).st_mtime_ns >= stat.st_mtime_ns:
+                continue
+        except OSError:
+            pass
+        if data is None:
+            with open(path, "rb") as fp:
+                data = fp.read()
+        tmp_path = "{}.{}.tmp".format(sidecar, os.getpid())
+        with open(tmp_path, "wb") as fp:
+            fp.write(compressors[suffix](data, level))
+        os.replace(tmp_path, sidecar)
+        written += 1
+    return written
+
+
+def compressible_files(dirpath, extensions=COMPRESSIBLE_EXTENSIONS):
+    """Find the files of a directory tree with one of the given extensions.
+
+    Hidden files (e.g. state files) are skipped. Symbolic links to files are
+    followed, but not symbolic links to directories.
+    """
+    for root, dirnames, filenames in os.walk(dirpath):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.endswith(tuple(extensions)) and filename[0] != ".":
+                path = os.path.join(root, filename)
+                if os.path.isfile(path):
+                    yield path
+
+
+def compress_files(paths, level=9, min_size=1024, suffixes=None, jobs=None):
+    """Write the compressed sidecars of several files in parallel.
+
+    The compression libraries release the global interpreter lock, so the
+    files are compressed by a pool of threads.
+
+    :param paths: Paths of the files.
+    :param jobs: Number of threads, by default the number of CPUs.
+    :returns: A :class:`CompressStats` tuple.
+    """
+
+    def run(path):
+        return compress_file(path, level=level, min_size=min_size, suffixes=suffixes)
+
+    files = written = 0
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        for count in pool.map(run, paths):
+            files += 1
+            written += count
+    return CompressStats(files, written)
+
+
+def compress_app_directory(app, dirpath, jobs=None):
+    """Write the sidecars of a directory, with the settings of an application.
+
+    :param app: An instance of :class:`~flask.Flask`.
+    :param dirpath: Path of the directory.
+    :param jobs: Number of threads, by default the number of CPUs.
+    :returns: A :class:`CompressStats` tuple.
+    """
+    config = app.config
+    if brotli is None:
+        app.logger.warning(
+            "The brotli package is not installed, only gzip sidecars are written."
+        )
+    return compress_files(
+        compressible_files(dirpath, config["ASSETS_COMPRESS_EXTENSIONS"]),
+        level=config["ASSETS_COMPRESS_LEVEL"],
+        min_size=config["ASSETS_COMPRESS_MIN_SIZE"],
+        jobs=jobs,
+    )
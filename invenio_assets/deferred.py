@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Deferred output of the tags of webpack entries.
+
+If ``ASSETS_DEFERRED_EMISSION`` is enabled, rendering a webpack entry in a
+template only outputs a marker comment with the name of the entry. Once the
+response is complete, the markers are removed, and the deduplicated tags of
+the marked entries, in the order of the markers, replace the placeholder
+output by ``{{ assets_placeholder() }}`` (typically in the ``<head>`` of the
+base template).
+
+As the output of an entry does not depend on the entries rendered before it
+in the request, rendered template fragments can be cached and replayed
+safely. If a response has no placeholder, each marker is replaced by the tags
+of its entry instead.
+"""
+
+import re
+
+from flask_webpackext.errors import ManifestKeyNotFoundError
+from markupsafe import Markup
+
+from .webpack import UniqueJinjaManifestEntry
+
+PLACEHOLDER = "<!--invenio-assets:placeholder-->"
+"""Placeholder replaced by the tags of the entries of the response."""
+
+ENTRY_MARKER = "<!--invenio-assets:entry:{0}-->"
+"""Marker of a rendered entry."""
+
+_ENTRY_MARKER_RE = re.compile(r"<!--invenio-assets:entry:([^<>]+?)-->")
+
+
+def assets_placeholder():
+    """Output the placeholder of the tags of the webpack entries."""
+    return Markup(PLACEHOLDER)
+
+
+class DeferredManifestEntry(UniqueJinjaManifestEntry):
+    """Manifest entry which outputs a marker instead of its tags."""
+
+    def __html__(self):
+        """Output the marker of the entry."""
+        return Markup(ENTRY_MARKER.format(self.name))
+
+    def emit(self):
+        """Output the chunk HTML tags that haven't been yet output."""
+        return super(DeferredManifestEntry, self).__html__()
+
+
+def emit_deferred(html, manifest):
+    """Replace the entry markers and the placeholder of a page by the tags.
+
+    Must be called in the request context, as the tags are deduplicated per
+    request.
+
+    :param html: Rendered page.
+    :param manifest: Webpack manifest.
+    :returns: The page with the tags, or ``None`` if it has no entry marker.
+    """
+
+    def emit(name):
+        try:
+            entry = manifest[name]
+        except ManifestKeyNotFoundError:
+            # The manifest was reloaded since the fragment was rendered
+            return ""
+        if isinstance(entry, DeferredManifestEntry):
+            return entry.emit()
+        return entry.__html__()
+
+    if PLACEHOLDER not in html:
+        if ENTRY_MARKER.split("{")[0] not in html:
+            return None
+        return _ENTRY_MARKER_RE.sub(lambda match: emit(match.group(1)), html)
+
+    names = _ENTRY_MARKER_RE.findall(html)
+    html = _ENTRY_MARKER_RE.sub("", html)
+    tags = "\n".join(filter(None, (emit(name) for name in names)))
+    return html.replace(PLACEHOLDER, tags, 1).replace(PLACEHOLDER, "")
@@ -0,0 +1,173 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Differential builds for modern and legacy browsers.
+
+If ``ASSETS_DIFFERENTIAL_BUILD`` is enabled, the webpack project is built
+twice, like the shards of a sharded build (see :mod:`invenio_assets.shards`):
+
+* a ``legacy`` build, identical to the regular build, whose manifest is
+  written to ``manifest.json``;
+* a ``modern`` build, transpiled and minified for the browsers of
+  ``ASSETS_MODERN_BROWSERS``, whose manifest is written to
+  ``manifest.modern.json``.
+
+The manifest used to render a request is selected from its ``User-Agent``
+header, so that modern browsers get the smaller bundles, and the responses
+rendering webpack entries get a ``Vary: User-Agent`` header. Unknown browsers
+get the legacy build.
+"""
+
+import json
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, request
+
+from .shards import run_build, shard_config, write_manifest
+
+TARGETS = ("legacy", "modern")
+"""Targets of a differential build."""
+
+MODERN_BROWSERS = {
+    "chrome": 80,
+    "edge": 80,
+    "firefox": 78,
+    "ios_saf": 14,
+    "safari": 14,
+}
+"""Minimum versions of the browsers getting the modern build.
+
+These browsers support ES2020 (e.g. optional chaining), so that little of
+the code has to be transpiled for them.
+
+The keys are `browserslist <https://github.com/browserslist/browserslist>`_
+browser names.
+"""
+
+_USER_AGENTS = (
+    # Checked in order, as user agents mention several browsers
+    ("ie", re.compile(r"(?:MSIE |Trident/)(\d+)")),
+    ("edge_legacy", re.compile(r"Edge/(\d+)")),
+    ("edge", re.compile(r"Edg(?:A|iOS)?/(\d+)")),
+    ("ios_saf", re.compile(r"(?:iPhone|iPad|iPod).* OS (\d+)_")),
+    ("firefox", re.compile(r"Firefox/(\d+)")),
+    ("chrome", re.compile(r"(?:Chrome|Chromium)/(\d+)")),
+    ("safari", re.compile(r"Version/(\d+).* Safari/")),
+)
+
+
+def browser_queries(browsers):
+    """Get the browserslist queries of minimum browser versions."""
+    return [
+        "{0} >= {1}".format(name, version) for name, version in sorted(browsers.items())
+    ]
+
+
+def is_modern_user_agent(user_agent, browsers=None):
+    """Check if a user agent is one of the modern browsers.
+
+    :param user_agent: Value of the ``User-Agent`` header.
+    :param browsers: Minimum browser versions, by default
+        ``ASSETS_MODERN_BROWSERS``.
+    """
+    if browsers is None:
+        browsers = current_app.config["ASSETS_MODERN_BROWSERS"]
+    for name, pattern in _USER_AGENTS:
+        match = pattern.search(user_agent or "")
+        if match is not None:
+            version = browsers.get(name)
+            return version is not None and int(match.group(1)) >= version
+    return False
+
+
+def is_modern_request():
+    """Check if the current request gets the modern build."""
+    modern = getattr(request, "_webpack_modern", None)
+    if modern is None:
+        modern = request._webpack_modern = is_modern_user_agent(
+            request.headers.get("User-Agent")
+        )
+    return modern
+
+
+def modern_manifest_path(filepath):
+    """Get the path of the manifest of the modern build."""
+    return os.path.splitext(filepath)[0] + ".modern.json"
+
+
+def target_options(target):
+    """Get the ``build.target`` key of the ``config.json`` of a target.
+
+    :param target: Name of the target, see :data:`TARGETS`.
+    """
+    return {
+        "name": target,
+        "browsers": (
+            browser_queries(current_app.config["ASSETS_MODERN_BROWSERS"])
+            if target == "modern"
+            else None
+        ),
+    }
+
+
+def target_config(config, target, manifest_path):
+    """Create the ``config.json`` of a target.
+
+    :param config: Configuration of the project.
+    :param target: Name of the target, see :data:`TARGETS`.
+    :param manifest_path: Path of the manifest written by the build.
+    """
+    config = shard_config(config, config["entry"], target, manifest_path)
+    config["build"]["target"] = target_options(target)
+    return config
+
+
+def build_targets(project, args, distdir, jobs=None):
+    """Build the legacy and modern targets of a webpack project.
+
+    :param project: A :class:`~invenio_assets.webpack.InvenioWebpackBundleProject`.
+    :param args: Arguments of the build script.
+    :param distdir: Output directory of the build, which is emptied first.
+    :param jobs: Number of targets built at the same time, by default all.
+    :raises RuntimeError: If the build of a target fails.
+    """
+    config = project.config
+    build_dir = os.path.dirname(project.config_path)
+    paths = {}
+    for target in TARGETS:
+        config_path = os.path.join(build_dir, "config.{0}.json".format(target))
+        manifest_path = os.path.join(build_dir, "manifest.{0}.json".format(target))
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        project._write_json(config_path, target_config(config, target, manifest_path))
+        paths[target] = (config_path, manifest_path)
+
+    # Targets do not clean the output directory, as they share it
+    if os.path.isdir(distdir):
+        shutil.rmtree(distdir)
+    os.makedirs(distdir)
+
+    npmpkg = project.npmpkg
+
+    def run(target):
+        prefix = "[{0}] ".format(target)
+        return run_build(npmpkg, paths[target][0], args, prefix=prefix)
+
+    with ThreadPoolExecutor(max_workers=jobs or len(TARGETS)) as pool:
+        exit_codes = list(pool.map(run, TARGETS))
+    for target, exit_code in zip(TARGETS, exit_codes):
+        if exit_code != 0:
+            raise RuntimeError(
+                "Build of the {0} target exited with code {1}".format(target, exit_code)
+            )
+
+    legacy_path = os.path.join(distdir, "manifest.json")
+    for target, dst in (
+        ("legacy", legacy_path),
+        ("modern", modern_manifest_path(legacy_path)),
+    ):
+        with open(paths[target][1]) as fp:
+            write_manifest(dst, json.load(fp))
@@ -3,13 +3,30 @@
 
 """Media asset management for Invenio."""
 
+import os
 from functools import partial
 
+from flask import current_app, request, url_for
 from flask_collect import Collect
-from flask_webpackext import FlaskWebpackExt
+from flask_webpackext import FlaskWebpackExt, current_webpack
+from invenio_base.utils import obj_or_import_string
 
 from .collect import collect_staticroot_removal
-from .webpack import UniqueJinjaManifestLoader
+from .compress import COMPRESSIBLE_EXTENSIONS
+from .deferred import DeferredManifestEntry, assets_placeholder, emit_deferred
+from .differential import MODERN_BROWSERS, is_modern_request
+from .fingerprint import load_fingerprints
+from .manifest import CompiledManifestLoader
+from .preload import preload_links, rendered_entries
+from .presets import BUILD_PRESETS, preset_config
+from .shards import runtime_chunks
+from .signals import request_rendered
+from .webpack import (
+    BUNDLER_PROJECTS,
+    UniqueJinjaManifest,
+    UniqueJinjaManifestLoader,
+    resolve_theme_bundles,
+)
 
 __all__ = ("InvenioAssets",)
 
@@ -23,6 +40,11 @@ class InvenioAssets(object):
         :param app: An instance of :class:`~flask.Flask`.
         :param \**kwargs: Keyword arguments are passed to ``init_app`` method.
         """
+        self._fingerprints = {}
+        self.metrics_sink = None
+        self._early_hints = {}
+        self.inline_csp_nonce = None
+        self._mixed_shard_endpoints = set()
         if app:
             self.init_app(app, **kwargs)
 
@@ -40,24 +62,285 @@ class InvenioAssets(object):
         self.webpack = FlaskWebpackExt(app)
 
         app.extensions["invenio-assets"] = self
+        app.add_template_global(self.url_for, "assets_url_for")
+        if app.config["ASSETS_FINGERPRINT"]:
+            app.after_request(self._set_cache_headers)
+        app.after_request(self._send_render_stats)
+        if app.config["ASSETS_PRELOAD_HEADERS"] or app.config["ASSETS_EARLY_HINTS"]:
+            app.after_request(self._set_preload_headers)
+        if app.config["ASSETS_EARLY_HINTS"]:
+            self._early_hints_handler = obj_or_import_string(
+                app.config["ASSETS_EARLY_HINTS_HANDLER"]
+            )
+            app.before_request(self._send_early_hints)
+        if app.config["ASSETS_WEBPACK_SHARDS"] > 1:
+            app.after_request(self._check_shard_runtimes)
+        if app.config["ASSETS_INLINE_CSP_NONCE"]:
+            self.inline_csp_nonce = obj_or_import_string(
+                app.config["ASSETS_INLINE_CSP_NONCE"]
+            )
+        if app.config["ASSETS_DIFFERENTIAL_BUILD"]:
+            app.after_request(self._set_vary_header)
+        app.add_template_global(assets_placeholder, "assets_placeholder")
+        if app.config["ASSETS_DEFERRED_EMISSION"]:
+            # Registered last to run first, before the hooks using the
+            # rendered entries.
+            app.after_request(self._emit_deferred)
+
+        sink = app.config["ASSETS_METRICS_SINK"]
+        if sink is not None:
+            sink = obj_or_import_string(sink)
+            if isinstance(sink, type):
+                sink = sink()
+            sink.connect(app)
+            self.metrics_sink = sink
+
+        if app.config["ASSETS_RESOLVE_THEMES_ON_INIT"]:
+            with app.app_context():
+                bundles = app.extensions["flask-webpackext"].project.bundles
+                resolve_theme_bundles(app, bundles)
+
+    @property
+    def render_cache(self):
+        """Render cache of the current webpack manifest.
+
+        The cache exposes its hit and miss counters, see
+        :class:`~invenio_assets.webpack.RenderCache`. It is ``None`` if the
+        manifest is not an :class:`~invenio_assets.webpack.UniqueJinjaManifest`.
+        """
+        manifest = current_webpack.manifest
+        if isinstance(manifest, UniqueJinjaManifest):
+            return manifest.render_cache
+        return None
+
+    def _load_fingerprints(self):
+        """Load the fingerprint manifest and the set of fingerprinted names.
+
+        The manifest is loaded once per process, or on each access in debug
+        mode.
+        """
+        if not current_app.config["ASSETS_FINGERPRINT"]:
+            return {}, frozenset()
+        path = current_app.config["ASSETS_FINGERPRINT_MANIFEST"]
+        loaded = self._fingerprints.get(path)
+        if loaded is None or current_app.debug:
+            fingerprints = load_fingerprints(path)
+            loaded = self._fingerprints[path] = (
+                fingerprints,
+                frozenset(fingerprints.values()),
+            )
+        return loaded
+
+    @property
+    def fingerprints(self):
+        """Mapping of the collected static files to their fingerprinted copies.
+
+        It is empty if fingerprinting is disabled.
+        """
+        return self._load_fingerprints()[0]
+
+    def url_for(self, filename, **kwargs):
+        r"""Build the URL of a static file, fingerprinted if possible.
+
+        Available in templates as ``assets_url_for``.
+
+        :param filename: Path of the file, relative to the static folder.
+        :param \**kwargs: Keyword arguments passed to :func:`flask.url_for`.
+        """
+        filename = self.fingerprints.get(filename, filename)
+        return url_for("static", filename=filename, **kwargs)
+
+    @staticmethod
+    def _emit_deferred(response):
+        """Output the tags of the webpack entries rendered in the response."""
+        if (
+            response.mimetype != "text/html"
+            or response.direct_passthrough
+            or response.is_streamed
+        ):
+            return response
+        html = emit_deferred(response.get_data(as_text=True), current_webpack.manifest)
+        if html is not None:
+            response.set_data(html)
+        return response
+
+    @staticmethod
+    def _set_vary_header(response):
+        """Mark responses using a manifest selected from the user agent."""
+        if getattr(request, "_webpack_rendered_entries", None):
+            response.vary.add("User-Agent")
+        return response
+
+    def _check_shard_runtimes(self, response):
+        """Warn when a response renders entries of several shards."""
+        if not getattr(request, "_webpack_rendered_entries", None):
+            return response
+        entries = rendered_entries(current_webpack.manifest)
+        if (
+            len(runtime_chunks(entries)) > 1
+            and request.endpoint not in self._mixed_shard_endpoints
+        ):
+            self._mixed_shard_endpoints.add(request.endpoint)
+            names = sorted({entry.name.rsplit(".", 1)[0] for entry in entries})
+            current_app.logger.warning(
+                "Endpoint %s renders webpack entries built in different shards "
+                "(%s), which load the modules they share once per shard. Add "
+                "them to ASSETS_WEBPACK_SHARD_GROUPS to build them in the same "
+                "shard.",
+                request.endpoint,
+                ", ".join(names),
+            )
+        return response
+
+    def _set_preload_headers(self, response):
+        """Announce the chunks of the rendered webpack entries."""
+        if not getattr(request, "_webpack_rendered_entries", None):
+            return response
+        links = preload_links(rendered_entries(current_webpack.manifest))
+        if current_app.config["ASSETS_PRELOAD_HEADERS"]:
+            for link in links:
+                response.headers.add("Link", link)
+        if current_app.config["ASSETS_EARLY_HINTS"] and response.status_code == 200:
+            self._early_hints[self._early_hints_key()] = links
+        return response
+
+    @staticmethod
+    def _early_hints_key():
+        """Key of the links learned for the current request."""
+        if current_app.config["ASSETS_DIFFERENTIAL_BUILD"]:
+            # Modern and legacy builds have different chunks
+            return request.endpoint, is_modern_request()
+        return request.endpoint
+
+    def _send_early_hints(self):
+        """Send the links learned from previous requests as Early Hints."""
+        links = self._early_hints.get(self._early_hints_key())
+        if links:
+            self._early_hints_handler(links)
+
+    @staticmethod
+    def _send_render_stats(response):
+        """Send the statistics of the entries rendered in the request."""
+        stats = getattr(request, "_webpack_render_stats", None)
+        if stats is not None:
+            request_rendered.send(
+                current_app._get_current_object(),
+                entries=stats[0],
+                emitted=stats[1],
+                deduplicated=stats[2],
+                seconds=stats[3],
+            )
+        return response
+
+    def _set_cache_headers(self, response):
+        """Allow caching fingerprinted static files forever."""
+        if request.endpoint == "static" and response.status_code in (200, 304):
+            filename = (request.view_args or {}).get("filename")
+            if filename in self._load_fingerprints()[1]:
+                response.cache_control.public = True
+                response.cache_control.max_age = current_app.config[
+                    "ASSETS_FINGERPRINT_MAX_AGE"
+                ]
+                response.cache_control.immutable = True
+        return response
 
     def init_config(self, app):
         """Initialize configuration.
 
         :param app: An instance of :class:`~flask.Flask`.
         """
+        app.config.setdefault(
+            "ASSETS_CACHE_DIR", os.path.join(app.instance_path, "assets-cache")
+        )
+
         # Flask-Collect config
         app.config.setdefault("COLLECT_STATIC_ROOT", app.static_folder)
         app.config.setdefault("COLLECT_STORAGE", "flask_collect.storage.link")
         app.config.setdefault(
             "COLLECT_FILTER", partial(collect_staticroot_removal, app)
         )
+        app.config.setdefault("ASSETS_COLLECT_INCREMENTAL", False)
+        app.config.setdefault(
+            "ASSETS_COLLECT_STATE_PATH",
+            os.path.join(app.instance_path, "collect-state.json"),
+        )
+        app.config.setdefault("ASSETS_FINGERPRINT", False)
+        app.config.setdefault(
+            "ASSETS_FINGERPRINT_MANIFEST",
+            os.path.join(app.config["COLLECT_STATIC_ROOT"], "fingerprints.json"),
+        )
+        app.config.setdefault("ASSETS_FINGERPRINT_MAX_AGE", 31536000)
+        app.config.setdefault("ASSETS_COMPRESS", False)
+        app.config.setdefault("ASSETS_COMPRESS_LEVEL", 9)
+        app.config.setdefault("ASSETS_COMPRESS_MIN_SIZE", 1024)
+        app.config.setdefault("ASSETS_COMPRESS_EXTENSIONS", COMPRESSIBLE_EXTENSIONS)
 
         # Flask-WebpackExt config
+        bundler = app.config.setdefault("ASSETS_BUNDLER", "webpack")
+        if bundler not in BUNDLER_PROJECTS:
+            raise ValueError(
+                "Invalid ASSETS_BUNDLER {0!r}, expected one of: {1}.".format(
+                    bundler, ", ".join(sorted(BUNDLER_PROJECTS))
+                )
+            )
+        app.config.setdefault("WEBPACKEXT_PROJECT", BUNDLER_PROJECTS[bundler])
+        loader = UniqueJinjaManifestLoader
+        if app.config.setdefault("ASSETS_MANIFEST_COMPILED", False):
+            loader = CompiledManifestLoader
+        reload_interval = app.config.setdefault("ASSETS_MANIFEST_RELOAD_INTERVAL", None)
+        if reload_interval is not None:  # check the manifest file for changes
+            loader = partial(loader, reload_interval=reload_interval)
+        if app.config.setdefault("ASSETS_DEFERRED_EMISSION", False):
+            loader = partial(loader, entry_cls=DeferredManifestEntry)
+        app.config.setdefault("WEBPACKEXT_MANIFEST_LOADER", loader)
+        app.config.setdefault("ASSETS_WEBPACK_INCREMENTAL_CREATE", False)
+        app.config.setdefault("ASSETS_WEBPACK_CACHE", False)
+        app.config.setdefault(
+            "ASSETS_WEBPACK_CACHE_DIR",
+            os.path.join(
+                app.config["ASSETS_CACHE_DIR"] or app.instance_path, "webpack"
+            ),
+        )
+        app.config.setdefault("ASSETS_WEBPACK_BABEL_WORKERS", 0)
+        app.config.setdefault("ASSETS_WEBPACK_MINIMIZER_PARALLEL", True)
+        app.config.setdefault("ASSETS_WEBPACK_SHARDS", 1)
+        app.config.setdefault("ASSETS_WEBPACK_SHARD_JOBS", None)
+        app.config.setdefault("ASSETS_WEBPACK_SHARD_GROUPS", [])
+        if (
+            app.config.setdefault("ASSETS_DIFFERENTIAL_BUILD", False)
+            and app.config["ASSETS_WEBPACK_SHARDS"] > 1
+        ):
+            raise ValueError(
+                "ASSETS_WEBPACK_SHARDS cannot be used with ASSETS_DIFFERENTIAL_BUILD."
+            )
+        app.config.setdefault("ASSETS_MODERN_BROWSERS", MODERN_BROWSERS)
+        app.config.setdefault("ASSETS_BUILD_PRESETS", BUILD_PRESETS)
+        if app.config.setdefault("ASSETS_BUILD_PRESET", None):
+            # Fail early on unknown presets, not when building
+            preset_config(
+                app.config["ASSETS_BUILD_PRESET"], app.config["ASSETS_BUILD_PRESETS"]
+            )
+        app.config.setdefault("ASSETS_WEBPACK_PROFILE", False)
+        app.config.setdefault(
+            "ASSETS_WEBPACK_PROFILE_PATH",
+            os.path.join(app.instance_path, "webpack-profile.json"),
+        )
+        app.config.setdefault("ASSETS_BUILD_CACHE", False)
+        app.config.setdefault(
+            "ASSETS_BUILD_CACHE_DIR",
+            os.path.join(app.config["ASSETS_CACHE_DIR"] or app.instance_path, "builds"),
+        )
+        app.config.setdefault("ASSETS_BUILD_CACHE_MAX_ENTRIES", 5)
+        app.config.setdefault("ASSETS_RENDER_CACHE_SIZE", 256)
+        app.config.setdefault("ASSETS_INLINE_CHUNK_MAX_SIZE", 0)
+        app.config.setdefault("ASSETS_INLINE_CSP_NONCE", None)
+        app.config.setdefault("ASSETS_METRICS_SINK", None)
+        app.config.setdefault("ASSETS_PRELOAD_HEADERS", False)
+        app.config.setdefault("ASSETS_EARLY_HINTS", False)
         app.config.setdefault(
-            "WEBPACKEXT_PROJECT", "invenio_assets.webpack:webpack_project"
+            "ASSETS_EARLY_HINTS_HANDLER", "invenio_assets.preload:wsgi_early_hints"
         )
-        app.config.setdefault("WEBPACKEXT_MANIFEST_LOADER", UniqueJinjaManifestLoader)
+        app.config.setdefault("ASSETS_RESOLVE_THEMES_ON_INIT", False)
         if app.debug:  # for development use 2-level deep symlinking
             from pywebpack.storage import LinkStorage
 
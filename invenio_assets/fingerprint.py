@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Content-hash fingerprinting of collected static files.
+
+Each collected file is copied to a name which contains a hash of its content
+(e.g. ``css/theme.3b5d5c37.css`` for ``css/theme.css``), and a JSON manifest
+maps the logical names of the files to their fingerprinted names. As the name
+of a fingerprinted file changes whenever its content changes, the file can be
+cached forever by browsers and proxies.
+"""
+
+import json
+import os
+import shutil
+
+from .compress import remove_sidecars
+from .sync import _remove, file_hash
+
+
+def fingerprint_name(relpath, digest, length=8):
+    """Insert a content hash before the extension of a path.
+
+    :param relpath: Path of the file, relative to the static root.
+    :param digest: Hexadecimal content hash of the file.
+    :param length: Number of characters of the hash to use.
+    """
+    dirname, basename = os.path.split(relpath)
+    name, ext = os.path.splitext(basename)
+    return os.path.join(dirname, "{0}.{1}{2}".format(name, digest[:length], ext))
+
+
+def load_fingerprints(filepath):
+    """Load a fingerprint manifest, or return an empty one if missing."""
+    try:
+        with open(filepath) as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return {}
+
+
+def fingerprint_files(files, static_root, manifest_path, length=8):
+    """Write fingerprinted copies of collected files and their manifest.
+
+    Fingerprinted copies which already exist are not written again, and the
+    copies of files which are not collected anymore are removed. Copies of
+    previous versions of a file are kept, so that pages which still reference
+    them keep working.
+
+    :param files: Iterable of ``(source path, relative path, content hash)``
+        tuples of the collected files. The content hash is computed when it
+        is ``None``.
+    :param static_root: Directory of the collected files.
+    :param manifest_path: Path of the JSON manifest mapping the logical names
+        to the fingerprinted names.
+    :param length: Number of characters of the hash in the file names.
+    :returns: The number of written fingerprinted copies.
+    """
+    previous = load_fingerprints(manifest_path)
+    fingerprints = {}
+    written = 0
+    for src, relpath, digest in files:
+        if not os.path.isfile(src):
+            continue
+        name = fingerprint_name(relpath, digest or file_hash(src), length=length)
+        dst = os.path.join(static_root, name)
+        if not os.path.exists(dst):
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            shutil.copy(src, dst)
+            written += 1
+        fingerprints[relpath] = name
+
+    for relpath in set(previous) - set(fingerprints):
+        path = os.path.join(static_root, previous[relpath])
+        _remove(path)
+        remove_sidecars(path)
+
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    tmp_path = "{}.{}.tmp".format(manifest_path, os.getpid())
+    with open(tmp_path, "w") as fp:
+        json.dump(fingerprints, fp, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+    return written
@@ -0,0 +1,131 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Inlining of small webpack chunks in the pages.
+
+If ``ASSETS_INLINE_CHUNK_MAX_SIZE`` is set, the chunks smaller than this
+number of bytes (e.g. the webpack runtime) are read once when the manifest is
+loaded, and output inline in ``<script>`` and ``<style>`` tags instead of
+being requested separately. Chunks are still output once per page.
+
+Chunks are read from the static folder of the application. Chunks which
+cannot be inlined safely are left as is: stylesheets referencing other files
+with relative URLs, and chunks containing their own closing tag.
+
+Inline tags are blocked by a ``Content-Security-Policy`` without
+``'unsafe-inline'``, such as the ``script-src 'self'`` policy usually set with
+Flask-Talisman. Set ``ASSETS_INLINE_CSP_NONCE`` to a function returning the
+nonce of the current request (e.g. :func:`request_csp_nonce` with the
+``content_security_policy_nonce_in`` option of Flask-Talisman) to add it to
+the inline tags when they are rendered, or allow the hashes of the inlined
+chunks in the policy.
+"""
+
+import os
+import posixpath
+import re
+
+from flask import current_app, request
+from markupsafe import escape
+
+INLINE_TEMPLATES = {
+    ".js": "<script>{}</script>",
+    ".css": "<style>{}</style>",
+}
+"""Templates of the inline tags, per extension."""
+
+_SOURCE_MAP_RE = re.compile(r"(sourceMappingURL=)([^\s*]+)")
+
+
+def chunk_filepath(url):
+    """Get the path of a chunk in the static folder from its URL."""
+    app = current_app
+    prefix = (app.static_url_path or "").rstrip("/") + "/"
+    if not app.static_folder or not url.startswith(prefix):
+        return None
+    relpath = posixpath.normpath(url[len(prefix) :])
+    if relpath.startswith(".."):
+        return None
+    return os.path.join(app.static_folder, *relpath.split("/"))
+
+
+def inline_tag(url, content):
+    """Render the inline tag of a chunk.
+
+    :param url: URL of the chunk.
+    :param content: Content of the chunk.
+    :returns: The tag, or ``None`` if the chunk cannot be inlined.
+    """
+    ext = os.path.splitext(url.lower())[1]
+    template = INLINE_TEMPLATES.get(ext)
+    if template is None:
+        return None
+    closing_tag = "</script" if ext == ".js" else "</style"
+    if closing_tag in content.lower():
+        return None
+    if ext == ".css" and ("url(" in content or "@import" in content):
+        return None
+    # Source maps are relative to the URL of the chunk
+    content = _SOURCE_MAP_RE.sub(
+        lambda m: m.group(1) + posixpath.join(posixpath.dirname(url), m.group(2)),
+        content,
+    )
+    return template.format(content)
+
+
+def is_inline(ext, tag):
+    """Check if the tag of a chunk is an inline tag."""
+    template = INLINE_TEMPLATES.get(ext)
+    return template is not None and tag.startswith(template.split("{")[0])
+
+
+def nonce_tag(tag, nonce):
+    """Add a CSP nonce to an inline tag.
+
+    :param tag: Inline tag rendered by :func:`inline_tag`.
+    :param nonce: Nonce of the current request.
+    :returns: The tag with a ``nonce`` attribute.
+    """
+    end = tag.index(">")
+    return '{0} nonce="{1}"{2}'.format(tag[:end], escape(nonce), tag[end:])
+
+
+def request_csp_nonce():
+    """Get the CSP nonce set on the current request by Flask-Talisman."""
+    return getattr(request, "csp_nonce", None)
+
+
+def inline_chunks(manifest, max_size):
+    """Inline the small chunks of the entries of a manifest.
+
+    :param manifest: Manifest with
+        :class:`~invenio_assets.webpack.UniqueJinjaManifestEntry` entries.
+    :param max_size: Maximum size in bytes of the inlined chunks.
+    :returns: The number of inlined chunks.
+    """
+    tags = {}
+
+    def tag(url):
+        if url not in tags:
+            tags[url] = None
+            filepath = chunk_filepath(url)
+            try:
+                if filepath and os.path.getsize(filepath) < max_size:
+                    with open(filepath, encoding="utf-8") as fp:
+                        tags[url] = inline_tag(url, fp.read())
+            except (OSError, UnicodeDecodeError):
+                pass
+        return tags[url]
+
+    for entry in manifest:
+        chunks = []
+        inlined = set(entry.inlined)
+        for chunk_id, ext, path, chunk_tag in entry._chunks:
+            inline = tag(path)
+            if inline is not None:
+                chunk_tag = inline
+                inlined.add(path)
+            chunks.append((chunk_id, ext, path, chunk_tag))
+        entry._chunks = tuple(chunks)
+        entry.inlined = frozenset(inlined)
+    return sum(1 for inline in tags.values() if inline is not None)
@@ -0,0 +1,336 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Compiled webpack manifest shared between processes.
+
+The JSON manifest written by webpack is compiled once into a compact binary
+file next to it, which each application process memory-maps instead of
+building its own dictionaries of entries. The pages of the file are shared by
+all processes through the operating system's page cache, and entries are only
+created when a template uses them.
+
+The file consists of a header, a table of chunks, an index of the entries
+sorted by name, the list of chunk IDs of each entry and a table of strings
+(entry names, chunk paths and pre-rendered HTML tags of the chunks).
+"""
+
+import mmap
+import os
+import struct
+import zlib
+
+from flask import current_app
+from pywebpack import ManifestLoader
+
+from .inline import inline_chunks
+from .webpack import (
+    UniqueJinjaManifest,
+    UniqueJinjaManifestEntry,
+    UniqueJinjaManifestLoader,
+)
+
+MAGIC = b"IAWM"
+"""Magic number of compiled manifest files."""
+
+VERSION = 1
+"""Version of the compiled manifest format."""
+
+# magic, version, templates checksum, source size, source modification time,
+# number of entries, number of chunks, and offsets of the entry index, chunk
+# IDs and strings.
+_HEADER = struct.Struct("<4sHIQqIIIII")
+# Chunk: path offset and length, tag offset and length
+_CHUNK = struct.Struct("<IIII")
+# Entry: name offset and length, index of the first chunk ID, number of chunks
+_ENTRY = struct.Struct("<IIII")
+_ID = struct.Struct("<I")
+
+
+class InvalidCompiledManifestError(Exception):
+    """Compiled manifest is invalid or outdated."""
+
+
+def _templates_checksum(entry_cls, inline_max_size=0):
+    """Checksum of the tag templates used to pre-render the chunks."""
+    templates = repr(sorted(entry_cls.templates.items()))
+    if inline_max_size:
+        templates += ":inline<{0}".format(inline_max_size)
+    return zlib.crc32(templates.encode("utf-8"))
+
+
+def compile_manifest(
+    manifest, filepath, source_stat, entry_cls=None, inline_max_size=0
+):
+    """Write a compiled manifest file.
+
+    The file is written to a temporary file first and then renamed, so that
+    other processes never see a partially written file.
+
+    :param manifest: Manifest with
+        :class:`~invenio_assets.webpack.UniqueJinjaManifestEntry` entries.
+    :param filepath: Path of the compiled manifest file.
+    :param source_stat: Result of :func:`os.stat` on the JSON manifest, used
+        to detect outdated compiled manifests.
+    :param entry_cls: Manifest entry class which rendered the chunk tags.
+    :param inline_max_size: Maximum size of the inlined chunks, see
+        :mod:`invenio_assets.inline`.
+    """
+    entry_cls = entry_cls or UniqueJinjaManifestEntry
+    strings = bytearray()
+    string_offsets = {}
+
+    def add_string(value):
+        if value not in string_offsets:
+            data = value.encode("utf-8")
+            string_offsets[value] = (len(strings), len(data))
+            strings.extend(data)
+        return string_offsets[value]
+
+    chunk_ids = {}
+    chunks = bytearray()
+    ids = bytearray()
+    entries = bytearray()
+    n_ids = 0
+    for entry in sorted(manifest, key=lambda e: e.name.encode("utf-8")):
+        for _, _, path, tag in entry._chunks:
+            if path not in chunk_ids:
+                chunk_ids[path] = len(chunk_ids)
+                chunks.extend(_CHUNK.pack(*add_string(path) + add_string(tag)))
+            ids.extend(_ID.pack(chunk_ids[path]))
+        entries.extend(_ENTRY.pack(*add_string(entry.name), n_ids, len(entry._chunks)))
+        n_ids += len(entry._chunks)
+
+    chunks_offset = _HEADER.size
+    entries_offset = chunks_offset + len(chunks)
+    ids_offset = entries_offset + len(entries)
+    strings_offset = ids_offset + len(ids)
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        _templates_checksum(entry_cls, inline_max_size),
+        source_stat.st_size,
+        source_stat.st_mtime_ns,
+        len(entries) // _ENTRY.size,
+        len(chunk_ids),
+        entries_offset,
+        ids_offset,
+        strings_offset,
+    )
+
+    tmp_filepath = "{}.{}.tmp".format(filepath, os.getpid())
+    try:
+        with open(tmp_filepath, "wb") as fp:
+            for data in (header, chunks, entries, ids, strings):
+                fp.write(data)
+        os.replace(tmp_filepath, filepath)
+    except OSError:
+        if os.path.exists(tmp_filepath):
+            os.remove(tmp_filepath)
+        raise
+
+
+def compiled_manifest_path(filepath):
+    """Get the path of the compiled manifest of a JSON manifest."""
+    return os.path.splitext(filepath)[0] + ".bin"
+
+
+class CompiledManifest(UniqueJinjaManifest):
+    """Manifest backed by a memory-mapped compiled manifest file.
+
+    Entries are looked up in the file and created on first access.
+    """
+
+    def __init__(self, buf=None, entry_cls=UniqueJinjaManifestEntry):
+        """Initialize manifest.
+
+        :param buf: Buffer with the content of a compiled manifest file.
+        :param entry_cls: Manifest entry class.
+        """
+        super(CompiledManifest, self).__init__()
+        self._buf = buf
+        self._entry_cls = entry_cls
+        self._n_entries = 0
+        if buf is not None:
+            header = _HEADER.unpack_from(buf)
+            (
+                self._n_entries,
+                self._n_chunks,
+                self._entries_offset,
+                self._ids_offset,
+                self._strings_offset,
+            ) = header[5:]
+
+    @classmethod
+    def open(
+        cls,
+        filepath,
+        source_stat,
+        entry_cls=UniqueJinjaManifestEntry,
+        inline_max_size=0,
+    ):
+        """Memory-map a compiled manifest file.
+
+        :param filepath: Path of the compiled manifest file.
+        :param source_stat: Result of :func:`os.stat` on the JSON manifest.
+        :param entry_cls: Manifest entry class.
+        :param inline_max_size: Maximum size of the inlined chunks.
+        :raises InvalidCompiledManifestError: If the file is not a compiled
+            manifest, or was compiled from another JSON manifest.
+        """
+        with open(filepath, "rb") as fp:
+            try:
+                buf = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise InvalidCompiledManifestError(filepath)
+        try:
+            magic, version, checksum, size, mtime_ns = _HEADER.unpack_from(buf)[:5]
+        except struct.error:
+            buf.close()
+            raise InvalidCompiledManifestError(filepath)
+        if (
+            magic != MAGIC
+            or version != VERSION
+            or checksum != _templates_checksum(entry_cls, inline_max_size)
+            or (size, mtime_ns) != (source_stat.st_size, source_stat.st_mtime_ns)
+        ):
+            buf.close()
+            raise InvalidCompiledManifestError(filepath)
+        return cls(buf, entry_cls=entry_cls)
+
+    def _string(self, offset, length):
+        """Read a string from the strings table."""
+        start = self._strings_offset + offset
+        return self._buf[start : start + length].decode("utf-8")
+
+    def _find(self, name):
+        """Binary search an entry by name in the entry index."""
+        key = name.encode("utf-8")
+        lo, hi = 0, self._n_entries
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset, length, first, count = _ENTRY.unpack_from(
+                self._buf, self._entries_offset + mid * _ENTRY.size
+            )
+            start = self._strings_offset + offset
+            current = self._buf[start : start + length]
+            if current == key:
+                return first, count
+            if current < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def _create_entry(self, name, first, count):
+        """Create an entry from its chunks in the compiled manifest."""
+        paths, tags = [], []
+        for i in range(first, first + count):
+            (chunk_id,) = _ID.unpack_from(self._buf, self._ids_offset + i * _ID.size)
+            path_offset, path_length, tag_offset, tag_length = _CHUNK.unpack_from(
+                self._buf, _HEADER.size + chunk_id * _CHUNK.size
+            )
+            paths.append(self._string(path_offset, path_length))
+            tags.append(self._string(tag_offset, tag_length))
+        entry = self._entry_cls(name, paths, tags=tags, chunk_table=self.chunk_table)
+        entry._render_cache = self.render_cache
+        return entry
+
+    def __getitem__(self, key):
+        """Get a manifest entry."""
+        try:
+            return self._entries[key]
+        except KeyError:
+            pass
+        found = self._find(key) if self._buf is not None else None
+        if found is None:
+            return super(CompiledManifest, self).__getitem__(key)
+        entry = self._entries.setdefault(key, self._create_entry(key, *found))
+        return entry
+
+    def __getattr__(self, name):
+        """Get a manifest entry."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __iter__(self):
+        """Iterate over entries in the manifest."""
+        for i in range(self._n_entries):
+            offset, length = _ENTRY.unpack_from(
+                self._buf, self._entries_offset + i * _ENTRY.size
+            )[:2]
+            yield self[self._string(offset, length)]
+
+
+class CompiledManifestLoader(UniqueJinjaManifestLoader):
+    """Loader which memory-maps a compiled version of the manifest.
+
+    The compiled manifest is written next to the JSON manifest (e.g.
+    ``manifest.bin`` for ``manifest.json``) after each build (see
+    :meth:`compile`). Otherwise, it is written by the first process loading
+    the manifest, and compiled again whenever the JSON manifest changes. If
+    it cannot be written (e.g. in a read-only static folder), the JSON
+    manifest is used.
+    """
+
+    def __init__(
+        self,
+        manifest_cls=CompiledManifest,
+        entry_cls=UniqueJinjaManifestEntry,
+        reload_interval=None,
+    ):
+        """Initialize manifest loader."""
+        super(CompiledManifestLoader, self).__init__(
+            manifest_cls=manifest_cls,
+            entry_cls=entry_cls,
+            reload_interval=reload_interval,
+        )
+
+    def _options(self):
+        """Options of the compiled manifest."""
+        return dict(
+            entry_cls=self.entry_cls,
+            inline_max_size=current_app.config.get("ASSETS_INLINE_CHUNK_MAX_SIZE", 0),
+        )
+
+    def _load_json(self, filepath, options):
+        """Load the JSON manifest."""
+        manifest = ManifestLoader(
+            manifest_cls=UniqueJinjaManifest, entry_cls=self.entry_cls
+        ).load(filepath)
+        if options["inline_max_size"]:
+            inline_chunks(manifest, options["inline_max_size"])
+        return manifest
+
+    def compile(self, filepath):
+        """Compile a JSON manifest ahead of the requests, e.g. after a build.
+
+        :param filepath: Path of the JSON manifest.
+        :raises OSError: If the compiled manifest cannot be written.
+        """
+        source_stat = os.stat(filepath)
+        options = self._options()
+        manifest = self._load_json(filepath, options)
+        compile_manifest(
+            manifest, compiled_manifest_path(filepath), source_stat, **options
+        )
+
+    def parse(self, filepath):
+        """Memory-map the compiled manifest, compiling it if needed."""
+        compiled_filepath = compiled_manifest_path(filepath)
+        source_stat = os.stat(filepath)
+        options = self._options()
+        try:
+            return self.manifest_cls.open(compiled_filepath, source_stat, **options)
+        except (OSError, InvalidCompiledManifestError):
+            pass
+
+        manifest = self._load_json(filepath, options)
+        try:
+            compile_manifest(manifest, compiled_filepath, source_stat, **options)
+            return self.manifest_cls.open(compiled_filepath, source_stat, **options)
+        except (OSError, InvalidCompiledManifestError):
+            current_app.logger.warning(
+                "Could not compile webpack manifest %s.", filepath, exc_info=True
+            )
+            return manifest
@@ -0,0 +1,163 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Metrics of the rendering of webpack entries and of the manifest loading.
+
+A metrics sink, set with ``ASSETS_METRICS_SINK``, receives the signals of
+:mod:`invenio_assets.signals` sent by the application and records them as
+counters and observations:
+
+* ``assets_entries_rendered_total``: webpack entries rendered.
+* ``assets_chunks_emitted_total``: chunk tags output.
+* ``assets_chunks_deduplicated_total``: chunk tags skipped, as they were
+  already output in the request.
+* ``assets_render_seconds``: time spent rendering the entries of a request.
+* ``assets_manifest_load_seconds``: time spent loading a manifest, with a
+  ``reload`` label.
+
+The `prometheus_client <https://pypi.org/project/prometheus-client/>`_
+package is needed by :class:`PrometheusMetricsSink`, install it with the
+``prometheus`` extra (``pip install invenio-assets[prometheus]``).
+"""
+
+import threading
+import weakref
+from abc import ABC, abstractmethod
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+from .signals import manifest_loaded, request_rendered
+
+METRICS = {
+    "assets_entries_rendered_total": "Webpack entries rendered.",
+    "assets_chunks_emitted_total": "Webpack chunk tags output.",
+    "assets_chunks_deduplicated_total": "Webpack chunk tags already output.",
+    "assets_render_seconds": "Time spent rendering the entries of a request.",
+    "assets_manifest_load_seconds": "Time spent loading a webpack manifest.",
+}
+"""Names and descriptions of the metrics."""
+
+
+class MetricsSink(ABC):
+    """Base class of the metrics sinks.
+
+    Subclasses implement :meth:`increment` and :meth:`observe`.
+    """
+
+    def connect(self, app):
+        """Record the metrics of an application."""
+        request_rendered.connect(self._request_rendered, sender=app, weak=False)
+        manifest_loaded.connect(self._manifest_loaded, sender=app, weak=False)
+
+    def disconnect(self, app):
+        """Stop recording the metrics of an application."""
+        request_rendered.disconnect(self._request_rendered, sender=app)
+        manifest_loaded.disconnect(self._manifest_loaded, sender=app)
+
+    @abstractmethod
+    def increment(self, name, value=1, **labels):
+        """Increment a counter."""
+
+    @abstractmethod
+    def observe(self, name, value, **labels):
+        """Record an observation, e.g. a duration in seconds."""
+
+    def _request_rendered(
+        self, sender, entries=0, emitted=0, deduplicated=0, seconds=0.0, **kwargs
+    ):
+        self.increment("assets_entries_rendered_total", entries)
+        self.increment("assets_chunks_emitted_total", emitted)
+        self.increment("assets_chunks_deduplicated_total", deduplicated)
+        self.observe("assets_render_seconds", seconds)
+
+    def _manifest_loaded(self, sender, seconds=0.0, reload=False, **kwargs):
+        self.observe(
+            "assets_manifest_load_seconds",
+            seconds,
+            reload="true" if reload else "false",
+        )
+
+
+class MemoryMetricsSink(MetricsSink):
+    """Sink which keeps the metrics in memory, e.g. for debugging or tests.
+
+    Counters are summed and observations are kept as ``(count, sum)``
+    tuples, keyed by the name of the metric and its sorted labels.
+    """
+
+    def __init__(self):
+        """Initialize sink."""
+        self.counters = {}
+        self.observations = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name, value=1, **labels):
+        """Increment a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """Record an observation."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            count, total = self.observations.get(key, (0, 0.0))
+            self.observations[key] = (count + 1, total + value)
+
+
+_prometheus_metrics = weakref.WeakKeyDictionary()
+_prometheus_lock = threading.Lock()
+
+
+def _create_prometheus_metrics(registry):
+    """Create the Prometheus metrics of a registry."""
+    metrics = {}
+    for name, description in METRICS.items():
+        if name.endswith("_total"):
+            metric = prometheus_client.Counter(name, description, registry=registry)
+        else:
+            labels = ("reload",) if name.startswith("assets_manifest") else ()
+            metric = prometheus_client.Histogram(
+                name, description, labels, registry=registry
+            )
+        metrics[name] = metric
+    return metrics
+
+
+class PrometheusMetricsSink(MetricsSink):
+    """Sink which records the metrics as Prometheus counters and histograms.
+
+    The metrics are registered once per registry, and shared by the sinks
+    using the same registry (e.g. of several applications).
+    """
+
+    def __init__(self, registry=None):
+        """Initialize sink.
+
+        :param registry: Prometheus collector registry, by default the
+            default registry of ``prometheus_client``.
+        :raises RuntimeError: If ``prometheus_client`` is not installed.
+        """
+        if prometheus_client is None:
+            raise RuntimeError("prometheus_client is required for Prometheus metrics.")
+        registry = registry or prometheus_client.REGISTRY
+        with _prometheus_lock:
+            metrics = _prometheus_metrics.get(registry)
+            if metrics is None:
+                metrics = _prometheus_metrics[registry] = _create_prometheus_metrics(
+                    registry
+                )
+        self.metrics = metrics
+
+    def increment(self, name, value=1, **labels):
+        """Increment a counter."""
+        metric = self.metrics[name]
+        (metric.labels(**labels) if labels else metric).inc(value)
+
+    def observe(self, name, value, **labels):
+        """Record an observation."""
+        metric = self.metrics[name]
+        (metric.labels(**labels) if labels else metric).observe(value)
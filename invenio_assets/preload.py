@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Preload ``Link`` headers and Early Hints for the chunks of a page.
+
+The webpack entries rendered in a request determine the chunks the page
+loads. If ``ASSETS_PRELOAD_HEADERS`` is enabled, they are announced in
+``Link: <...>; rel=preload`` response headers, which proxies and CDNs can
+turn into HTTP 103 Early Hints or pushes.
+
+If ``ASSETS_EARLY_HINTS`` is enabled, the links of the last successful
+response of each endpoint are remembered, and sent as HTTP 103 Early Hints
+by ``ASSETS_EARLY_HINTS_HANDLER`` before the following requests to the same
+endpoint are processed. The default handler uses the ``wsgi.early_hints``
+callable of the WSGI environment, provided e.g. by Gunicorn, and does nothing
+on servers without it.
+"""
+
+import os
+
+from flask import request
+from flask_webpackext.errors import ManifestKeyNotFoundError
+
+PRELOAD_TYPES = {".js": "script", ".css": "style"}
+"""Value of the ``as`` attribute of the preload links, per extension."""
+
+
+def preload_links(entries):
+    """Get the preload links of the chunks of webpack entries.
+
+    :param entries: Manifest entries, in the order they were rendered.
+    :returns: A list of ``Link`` header values, one per chunk, in the order
+        the chunks are output in the page.
+    """
+    links = []
+    seen = set()
+    for entry in entries:
+        # Inlined chunks are part of the page
+        seen.update(getattr(entry, "inlined", ()))
+        for path in entry:
+            if path in seen:
+                continue
+            seen.add(path)
+            preload_type = PRELOAD_TYPES.get(os.path.splitext(path.lower())[1])
+            if preload_type is not None:
+                links.append("<{0}>; rel=preload; as={1}".format(path, preload_type))
+    return links
+
+
+def rendered_entries(manifest):
+    """Get the manifest entries rendered in the current request."""
+    entries = []
+    for name in getattr(request, "_webpack_rendered_entries", ()):
+        try:
+            entries.append(manifest[name])
+        except ManifestKeyNotFoundError:
+            # The manifest was reloaded during the request
+            continue
+    return entries
+
+
+def wsgi_early_hints(links):
+    """Send Early Hints with the ``wsgi.early_hints`` callable of the server.
+
+    :param links: ``Link`` header values.
+    """
+    send = request.environ.get("wsgi.early_hints")
+    if send is not None:
+        send([("Link", link) for link in links])
@@ -0,0 +1,111 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Named build presets of the webpack project.
+
+A build preset selects the tools and options of a build, so that e.g. CI
+smoke builds can trade the size of the output for speed. The preset selected
+with ``ASSETS_BUILD_PRESET`` is written to the ``build.preset`` key of the
+generated ``config.json``, with the following keys:
+
+* ``transpiler``: loader of the JavaScript sources, one of
+  :data:`TRANSPILERS`.
+* ``minifier``: minifier of the JavaScript and CSS chunks in production
+  mode, one of :data:`MINIFIERS`, or ``None`` to not minify them.
+* ``sourceMap``: webpack ``devtool`` option, or ``False`` to not generate
+  source maps. If missing, ``source-map`` in production mode and
+  ``inline-source-map`` in development mode.
+* ``targets``: `browserslist <https://github.com/browserslist/browserslist>`_
+  queries of the supported browsers, or ``None`` for the default ones.
+  Overridden by the ``modern`` target of a differential build (see
+  :mod:`invenio_assets.differential`).
+
+The npm packages of the swc and esbuild tools, and of ``thread-loader`` (see
+:data:`TOOL_DEPENDENCIES`), are only added to the ``package.json`` of the
+project when the build uses them.
+
+Without preset, the build uses babel and Terser, as the ``production``
+preset does. The rspack project always uses its builtin SWC loader and
+minimizers: the preset only controls whether the chunks are minified, the
+source maps and the targets.
+"""
+
+from .differential import MODERN_BROWSERS, browser_queries
+
+TRANSPILERS = ("babel", "esbuild", "swc")
+"""Supported transpilers."""
+
+MINIFIERS = ("esbuild", "swc", "terser")
+"""Supported minifiers."""
+
+TOOL_DEPENDENCIES = {
+    "esbuild": {"esbuild": "^0.20.0", "esbuild-loader": "^4.0.0"},
+    "swc": {"@swc/core": "^1.6.13", "swc-loader": "^0.2.6"},
+    "thread-loader": {"thread-loader": "^4.0.0"},
+}
+"""npm packages of the tools only installed for the builds using them."""
+
+BUILD_PRESETS = {
+    "production": {
+        "transpiler": "babel",
+        "minifier": "terser",
+        "sourceMap": "source-map",
+        "targets": None,
+    },
+    "dev": {
+        "transpiler": "swc",
+        "minifier": None,
+        "sourceMap": "eval-cheap-module-source-map",
+        "targets": None,
+    },
+    "ci-fast": {
+        "transpiler": "esbuild",
+        "minifier": "esbuild",
+        "sourceMap": False,
+        "targets": browser_queries(MODERN_BROWSERS),
+    },
+}
+"""Default build presets, by name."""
+
+
+def preset_config(name, presets):
+    """Get the configuration of a build preset.
+
+    :param name: Name of the preset.
+    :param presets: Build presets, by name.
+    :returns: The preset, with its ``name``.
+    :raises ValueError: If the preset does not exist or is invalid.
+    """
+    try:
+        preset = dict(presets[name], name=name)
+    except KeyError:
+        raise ValueError("Unknown build preset {0!r}.".format(name))
+    transpiler = preset.setdefault("transpiler", "babel")
+    if transpiler not in TRANSPILERS:
+        raise ValueError(
+            "Unknown transpiler {0!r} of build preset {1!r}.".format(transpiler, name)
+        )
+    minifier = preset.setdefault("minifier", "terser")
+    if minifier is not None and minifier not in MINIFIERS:
+        raise ValueError(
+            "Unknown minifier {0!r} of build preset {1!r}.".format(minifier, name)
+        )
+    preset.setdefault("targets", None)
+    return preset
+
+
+def preset_dependencies(preset, babel_workers=0):
+    """Get the npm packages needed by the tools of a build preset.
+
+    :param preset: Preset returned by :func:`preset_config`.
+    :param babel_workers: Number of babel worker processes, which need
+        ``thread-loader``, see ``ASSETS_WEBPACK_BABEL_WORKERS``.
+    :returns: A dictionary of package versions, by package name.
+    """
+    tools = {preset["transpiler"], preset["minifier"]} - {None}
+    if babel_workers > 0 and preset["transpiler"] == "babel":
+        tools.add("thread-loader")
+    dependencies = {}
+    for tool in sorted(tools):
+        dependencies.update(TOOL_DEPENDENCIES.get(tool, {}))
+    return dependencies
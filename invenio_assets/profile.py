@@ -0,0 +1,117 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Build profiles of the webpack project.
+
+If ``ASSETS_WEBPACK_PROFILE`` is enabled, the shipped webpack and rspack
+configurations write a JSON profile of each build to
+``ASSETS_WEBPACK_PROFILE_PATH``, with the following keys:
+
+* ``time``: duration of the build.
+* ``modules``: time spent building each module, keyed by its path relative
+  to the webpack project, and the loaders which processed it.
+* ``loaders``: time spent building the modules, per loader.
+* ``plugins``: time spent in the hooks of each plugin.
+* ``entries``: output files and total size in bytes of each entry.
+
+Times are wall-clock milliseconds. As modules are built concurrently, they
+add up to more than the duration of the build.
+
+The profile is summarized per Python package, by mapping modules back to the
+bundles providing them, and bundles to the package of their entry point in
+the ``invenio_assets.webpack`` group.
+"""
+
+import json
+from collections import namedtuple
+
+PackageStats = namedtuple("PackageStats", "package time modules size")
+
+TEMPLATE_PACKAGE = "invenio_assets"
+"""Package to which the files of the project template are attributed."""
+
+
+def load_profile(path):
+    """Load a build profile."""
+    with open(path) as fp:
+        return json.load(fp)
+
+
+def bundle_packages(project):
+    """Map the files and entries of a project to the packages providing them.
+
+    :param project: A :class:`~invenio_assets.webpack.InvenioWebpackBundleProject`.
+    :returns: A tuple of two dictionaries, mapping the paths relative to the
+        project of the files (or of the directories, with a storage linking
+        directories such as the one of debug mode), and the names of the
+        entries, to packages.
+        Bundles which are not registered through an entry point are named
+        after their path.
+    """
+    registry = project._bundles_iter
+    files, entries = {}, {}
+    template = project.storage_cls(project._project_template_dir, project.project_path)
+    for _, relpath in template:
+        files.setdefault(relpath, TEMPLATE_PACKAGE)
+    for bundle in project.bundles:
+        package = None
+        if hasattr(registry, "package"):
+            package = registry.package(bundle)
+        package = package or bundle.path
+        for _, relpath in project.storage_cls(bundle.path, project.project_path):
+            files.setdefault(relpath, package)
+        for name in bundle.entry:
+            entries.setdefault(name, package)
+    return files, entries
+
+
+def module_package(name, files):
+    """Get the package of a module, from its path relative to the project.
+
+    The module is attributed to the package of the longest path of ``files``
+    which contains it.
+    """
+    parts = name.replace("\\", "/").split("/")
+    if "node_modules" in parts:
+        # Attribute dependencies to their npm package
+        parts = parts[len(parts) - parts[::-1].index("node_modules") :]
+        npm_name = "/".join(parts[:2]) if parts[0].startswith("@") else parts[0]
+        return "npm:" + npm_name
+    path = "/".join(parts)
+    while path:
+        if path in files:
+            return files[path]
+        path = path.rpartition("/")[0]
+    return "(other)"
+
+
+def summarize_profile(profile, files, entries):
+    """Summarize a build profile per package.
+
+    :param profile: Build profile, see :func:`load_profile`.
+    :param files: Mapping of the project files to packages.
+    :param entries: Mapping of the entry names to packages.
+    :returns: A list of :class:`PackageStats` tuples, sorted by decreasing
+        build time and size.
+    """
+    stats = {}
+
+    def add(package, time=0, modules=0, size=0):
+        current = stats.get(package, PackageStats(package, 0, 0, 0))
+        stats[package] = PackageStats(
+            package,
+            current.time + time,
+            current.modules + modules,
+            current.size + size,
+        )
+
+    for name, module in profile.get("modules", {}).items():
+        add(module_package(name, files), time=module["time"], modules=1)
+    for name, entry in profile.get("entries", {}).items():
+        add(entries.get(name, "(other)"), size=entry["size"])
+    return sorted(stats.values(), key=lambda s: (-s.time, -s.size, s.package))
+
+
+def top(timings, count):
+    """Get the largest timings of a mapping, as ``(name, time)`` tuples."""
+    return sorted(timings.items(), key=lambda item: (-item[1], item[0]))[:count]
@@ -0,0 +1,175 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Selective rebuilds of the webpack project.
+
+Changed files, or the names of packages, are mapped back to the bundles of
+the ``invenio_assets.webpack`` entry point group which provide them, and only
+the entries of these bundles are built again, like a shard of a sharded build
+(see :mod:`invenio_assets.shards`). The manifest of the last full build is
+then patched with the chunks of the rebuilt entries. With differential
+builds, the entries are rebuilt for both targets and both manifests are
+patched.
+
+Files are mapped to the bundle which provides them, not to the entries which
+import them. A file imported by the entries of other bundles (e.g. a theme
+variable of another package) needs a full build, as do the files of the
+project template.
+
+.. note::
+
+   The rebuilt entries have their own webpack runtime, so the modules they
+   share with the other entries of a page are loaded twice. Rebuilds are
+   meant for development; run a full build before deploying.
+"""
+
+import json
+import os
+
+from .differential import TARGETS, modern_manifest_path, target_options
+from .shards import run_build, shard_config, write_manifest
+
+
+class RebuildError(Exception):
+    """Changes cannot be rebuilt selectively, a full build is needed."""
+
+
+def _is_within(path, directory):
+    """Check if a path is inside a directory."""
+    directory = os.path.join(os.path.abspath(directory), "")
+    return os.path.abspath(path).startswith(directory)
+
+
+def affected_entries(project, targets):
+    """Get the entries affected by changed files or packages.
+
+    :param project: A :class:`~invenio_assets.webpack.InvenioWebpackBundleProject`.
+    :param targets: Paths of changed files, either in the source folder of a
+        bundle or relative to the webpack project, or names of packages (or
+        entry points) registering bundles.
+    :returns: The sorted names of the affected entries.
+    :raises RebuildError: If a target is a file of the project template or
+        is not provided by any bundle.
+    """
+    registry = project._bundles_iter
+    if hasattr(registry, "items"):
+        items = [
+            ((ep.name, registry.package(bundle)), bundle)
+            for ep, bundle in registry.items()
+        ]
+    else:
+        items = [((), bundle) for bundle in project.bundles]
+
+    bundles = []
+    for target in targets:
+        found = [bundle for names, bundle in items if target in names]
+        if not found:
+            if _is_within(target, project._project_template_dir):
+                relpath = os.path.relpath(target, project._project_template_dir)
+            elif _is_within(target, project.project_path):
+                relpath = os.path.relpath(target, project.project_path)
+            elif os.path.isabs(target) or os.path.exists(target):
+                relpath = None
+                found = [
+                    bundle for _, bundle in items if _is_within(target, bundle.path)
+                ]
+            else:
+                relpath = target
+            if relpath is not None:
+                # The files of the template and of the bundles are copied (or
+                # linked, in debug mode) at the same relative paths in the
+                # project.
+                relpath = os.path.normpath(relpath)
+                if os.path.isfile(os.path.join(project._project_template_dir, relpath)):
+                    raise RebuildError(
+                        "{0} is a file of the project template.".format(target)
+                    )
+                found = [
+                    bundle
+                    for _, bundle in items
+                    if not relpath.startswith(os.pardir)
+                    and os.path.exists(os.path.join(bundle.path, relpath))
+                ]
+        if not found:
+            raise RebuildError("{0} is not provided by any bundle.".format(target))
+        bundles.extend(found)
+
+    return sorted({name for bundle in bundles for name in bundle.entry})
+
+
+def patch_manifest(manifest, partial):
+    """Patch a manifest with the manifest of rebuilt entries.
+
+    The chunks of the rebuilt entries are replaced, and the assets which are
+    no longer used by any entry are removed from the manifest (but not from
+    the output folder).
+
+    :param manifest: Manifest of the last full build.
+    :param partial: Manifest of the rebuilt entries.
+    :returns: The patched manifest.
+    :raises RebuildError: If the build of the entries is not done.
+    """
+    if partial.get("status") != "done":
+        raise RebuildError("Build of the entries is not done.")
+    chunks = dict(manifest["chunks"], **partial["chunks"])
+    assets = dict(manifest["assets"], **partial["assets"])
+    used = {name for names in chunks.values() for name in names}
+    return dict(
+        manifest,
+        chunks=chunks,
+        assets={name: asset for name, asset in assets.items() if name in used},
+    )
+
+
+def rebuild_entries(project, entries, distdir, args=(), differential=False):
+    """Build some entries of a created project and patch its manifest.
+
+    :param project: A :class:`~invenio_assets.webpack.InvenioWebpackBundleProject`.
+    :param entries: Names of the entries to build.
+    :param distdir: Output directory of the last full build.
+    :param args: Arguments of the build script.
+    :param differential: If ``True``, the entries are built for each target
+        of a differential build (see :mod:`invenio_assets.differential`), and
+        the manifests of both targets are patched.
+    :returns: The patched manifest, which is also written to
+        ``manifest.json`` in the output directory.
+    :raises RebuildError: If there is no full build to patch.
+    :raises RuntimeError: If the build fails.
+    """
+    manifest_path = os.path.join(distdir, "manifest.json")
+    if differential:
+        targets = list(
+            zip(TARGETS, (manifest_path, modern_manifest_path(manifest_path)))
+        )
+    else:
+        targets = [(None, manifest_path)]
+    manifests = {}
+    for target, path in targets:
+        try:
+            with open(path) as fp:
+                manifests[target] = json.load(fp)
+        except (OSError, ValueError):
+            raise RebuildError("No manifest found in {0}.".format(distdir))
+
+    config = project.config
+    entry = {name: config["entry"][name] for name in entries}
+    build_dir = os.path.dirname(project.config_path)
+    for target, path in targets:
+        index = "rebuild-{0}".format(target) if target else "rebuild"
+        config_path = os.path.join(build_dir, "config.{0}.json".format(index))
+        partial_path = os.path.join(build_dir, "manifest.{0}.json".format(index))
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        target_config = shard_config(config, entry, index, partial_path)
+        if target:
+            target_config["build"]["target"] = target_options(target)
+        project._write_json(config_path, target_config)
+
+        exit_code = run_build(project.npmpkg, config_path, args)
+        if exit_code != 0:
+            raise RuntimeError("Build exited with code {0}".format(exit_code))
+
+        with open(partial_path) as fp:
+            manifests[target] = patch_manifest(manifests[target], json.load(fp))
+        write_manifest(path, manifests[target])
+    return manifests[targets[0][0]]
@@ -0,0 +1,235 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Sharded builds of the webpack project.
+
+The entries of the project are split into shards, which are built by
+separate bundler processes in parallel, each with its own ``config.json``
+(selected with the ``INVENIO_ASSETS_CONFIG`` environment variable). Each
+process has its own memory limit, so that large projects can be built on
+machines where a single process runs out of memory.
+
+Each shard is a separate compilation, with its own webpack runtime (with a
+unique ``output.uniqueName``, so that the runtimes of several shards can be
+loaded in the same page) and its own split chunks: a module used by entries
+of several shards is included in a chunk of each shard. All shards write
+their output to the same directory, and their manifests are merged into the
+manifest of the project once all shards are built.
+
+Modules are instantiated once per shard: if a page renders entries built in
+different shards (e.g. the base entry of the theme and the entry of a
+module), it loads the runtime of each shard, and the modules they share
+(e.g. jQuery) are downloaded and instantiated once per shard, so that e.g.
+jQuery plugins registered in one shard are not available in the others.
+Entries rendered in the same pages must thus be built in the same shard. The
+entries of a bundle are kept in the same shard, and so are the groups of
+entries of ``ASSETS_WEBPACK_SHARD_GROUPS``. Once per endpoint, a warning is
+logged if a response renders entries of several shards (see
+:func:`runtime_chunks`).
+"""
+
+import json
+import os
+import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+CONFIG_ENV_VAR = "INVENIO_ASSETS_CONFIG"
+"""Environment variable with the path of the ``config.json`` of a shard."""
+
+_env_lock = threading.Lock()
+
+
+class ManifestMergeError(Exception):
+    """Manifests of the shards cannot be merged."""
+
+
+def shard_entries(entry, shards, groups=()):
+    """Split webpack entries into shards.
+
+    Groups of entries are kept in the same shard, and groups sharing entries
+    are merged. Groups are assigned in turn to the shard with the fewest
+    entries, largest groups first and then in the order of their names, so
+    that the assignment only depends on the names of the entries. Entries
+    not in any group form their own group.
+
+    :param entry: Dictionary of webpack entries.
+    :param shards: Number of shards.
+    :param groups: Lists of names of entries used together, e.g. the
+        entries of each bundle.
+    :returns: A list of dictionaries of entries, without empty shards.
+    """
+    merged = []
+    for group in groups:
+        names = set(group) & entry.keys()
+        for other in [other for other in merged if other & names]:
+            names |= other
+            merged.remove(other)
+        if names:
+            merged.append(names)
+    grouped = set().union(*merged)
+    all_groups = [sorted(names) for names in merged]
+    all_groups.extend([name] for name in entry if name not in grouped)
+    all_groups.sort(key=lambda names: (-len(names), names[0]))
+
+    result = [{} for _ in range(shards)]
+    for names in all_groups:
+        entries = min(result, key=len)
+        entries.update((name, entry[name]) for name in names)
+    return [dict(sorted(entries.items())) for entries in result if entries]
+
+
+def runtime_chunks(entries):
+    """Get the webpack runtime chunks loaded by manifest entries.
+
+    webpack outputs the runtime chunk first in the chunks of an entry, so the
+    runtime of a JavaScript entry is its first chunk. Entries built in the
+    same shard have the same runtime.
+
+    :param entries: Manifest entries rendered in a page.
+    :returns: The set of the paths of the runtime chunks.
+    """
+    runtimes = set()
+    for entry in entries:
+        paths = list(entry)
+        if paths and entry.name.endswith(".js"):
+            runtimes.add(paths[0])
+    return runtimes
+
+
+def shard_config(config, entry, index, manifest_path):
+    """Create the ``config.json`` of a shard.
+
+    :param config: Configuration of the project.
+    :param entry: Entries of the shard.
+    :param index: Index (or name) of the shard.
+    :param manifest_path: Path of the manifest written by the shard.
+    """
+    config = dict(config, entry=entry)
+    config["build"] = dict(
+        config["build"],
+        shard={"index": index, "manifestPath": manifest_path},
+    )
+    return config
+
+
+def merge_manifests(manifests):
+    """Merge the webpack-bundle-tracker manifests of several shards.
+
+    :param manifests: Manifests of the shards, in the order of the shards.
+    :returns: The merged manifest.
+    :raises ManifestMergeError: If a manifest is not complete, or if
+        manifests have different chunks for the same entry or different
+        assets with the same name.
+    """
+    merged = {"status": "done", "chunks": {}, "assets": {}}
+    for manifest in manifests:
+        if manifest.get("status") != "done":
+            raise ManifestMergeError("Build of a shard is not done.")
+        for key, values in (
+            ("chunks", manifest["chunks"]),
+            ("assets", manifest["assets"]),
+        ):
+            for name, value in values.items():
+                if merged[key].setdefault(name, value) != value:
+                    raise ManifestMergeError(
+                        "Conflicting {0} for {1!r}.".format(key, name)
+                    )
+        if "publicPath" in manifest:
+            merged.setdefault("publicPath", manifest["publicPath"])
+    return merged
+
+
+def run_build(npmpkg, config_path, args=(), prefix=""):
+    """Run the build script with another ``config.json``.
+
+    :param npmpkg: The :class:`~pynpm.NPMPackage` of the project.
+    :param config_path: Path of the ``config.json``, passed to the bundler
+        in the ``INVENIO_ASSETS_CONFIG`` environment variable.
+    :param args: Arguments of the build script.
+    :param prefix: Prefix of each line of the output of the build.
+    :returns: The exit code of the build script.
+    """
+    with _env_lock:
+        previous = os.environ.get(CONFIG_ENV_VAR)
+        os.environ[CONFIG_ENV_VAR] = config_path
+        try:
+            process = npmpkg.run_script("build", *args, wait=False)
+        finally:
+            if previous is None:
+                del os.environ[CONFIG_ENV_VAR]
+            else:
+                os.environ[CONFIG_ENV_VAR] = previous
+
+    prefix = prefix.encode("utf-8")
+    out = getattr(sys.stdout, "buffer", None)
+    for line in process.stdout:
+        if out is not None:
+            out.write(prefix + line)
+            out.flush()
+    return process.wait()
+
+
+def write_manifest(path, manifest):
+    """Write a manifest atomically, so that it is never read half-written."""
+    tmp_path = "{0}.{1}.tmp".format(path, os.getpid())
+    with open(tmp_path, "w") as fp:
+        json.dump(manifest, fp, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def build_shards(project, args, shards, distdir, jobs=None, groups=()):
+    """Build the entries of a webpack project in shards.
+
+    :param project: A :class:`~invenio_assets.webpack.InvenioWebpackBundleProject`.
+    :param args: Arguments of the build script.
+    :param shards: Number of shards.
+    :param distdir: Output directory of the build, which is emptied first.
+    :param jobs: Number of shards built at the same time, by default all.
+    :param groups: Lists of names of entries kept in the same shard, in
+        addition to the entries of each bundle.
+    :returns: The merged manifest, which is also written to ``manifest.json``
+        in the output directory.
+    :raises RuntimeError: If the build of a shard fails.
+    """
+    config = project.config
+    build_dir = os.path.dirname(project.config_path)
+    groups = [list(bundle.entry) for bundle in project.bundles] + list(groups)
+    paths = []
+    for index, entry in enumerate(shard_entries(config["entry"], shards, groups)):
+        config_path = os.path.join(build_dir, "config.shard-{0}.json".format(index))
+        manifest_path = os.path.join(build_dir, "manifest.shard-{0}.json".format(index))
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        project._write_json(
+            config_path, shard_config(config, entry, index, manifest_path)
+        )
+        paths.append((config_path, manifest_path))
+
+    # Shards do not clean the output directory, as they share it
+    if os.path.isdir(distdir):
+        shutil.rmtree(distdir)
+    os.makedirs(distdir)
+
+    npmpkg = project.npmpkg
+
+    def run(index):
+        prefix = "[shard {0}] ".format(index)
+        return run_build(npmpkg, paths[index][0], args, prefix=prefix)
+
+    with ThreadPoolExecutor(max_workers=jobs or max(len(paths), 1)) as pool:
+        exit_codes = list(pool.map(run, range(len(paths))))
+    for index, exit_code in enumerate(exit_codes):
+        if exit_code != 0:
+            raise RuntimeError(
+                "Build of shard {0} exited with code {1}".format(index, exit_code)
+            )
+
+    manifests = []
+    for _, manifest_path in paths:
+        with open(manifest_path) as fp:
+            manifests.append(json.load(fp))
+    merged = merge_manifests(manifests)
+    write_manifest(os.path.join(distdir, "manifest.json"), merged)
+    return merged
@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Signals sent while rendering webpack entries and loading manifests.
+
+The rendering of entries is only measured while the signals have receivers,
+so that it costs nothing otherwise. The sender of the signals is the current
+application.
+"""
+
+from blinker import Namespace
+
+_signals = Namespace()
+
+entry_rendered = _signals.signal("entry-rendered")
+"""Signal sent when a webpack entry is rendered in a template.
+
+Keyword arguments:
+
+- ``entry``: name of the entry.
+- ``emitted``: number of chunks output.
+- ``deduplicated``: number of chunks skipped, as they were already output.
+- ``seconds``: time spent rendering the entry.
+
+Example subscriber:
+
+.. code-block:: python
+
+    def receiver(sender, entry=None, emitted=0, deduplicated=0, seconds=0):
+        # ...
+
+    from invenio_assets.signals import entry_rendered
+    entry_rendered.connect(receiver)
+"""
+
+request_rendered = _signals.signal("request-rendered")
+"""Signal sent after a request which rendered webpack entries.
+
+Keyword arguments:
+
+- ``entries``: number of entries rendered.
+- ``emitted``: number of chunks output.
+- ``deduplicated``: number of chunks skipped, as they were already output.
+- ``seconds``: time spent rendering the entries.
+"""
+
+manifest_loaded = _signals.signal("manifest-loaded")
+"""Signal sent when a webpack manifest file is loaded.
+
+Keyword arguments:
+
+- ``filepath``: path of the manifest file.
+- ``seconds``: time spent loading the manifest.
+- ``reload``: ``True`` if the manifest was loaded before, e.g. when it
+  changed (see ``ASSETS_MANIFEST_RELOAD_INTERVAL``) or in debug mode.
+"""
@@ -0,0 +1,139 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Incremental synchronization of files into a directory.
+
+A state file records, for each synchronized destination path, the source
+path, size, modification time and content hash of the file it was copied or
+linked from. Later synchronizations only copy files that were added or whose
+content changed, and remove the files whose source disappeared.
+"""
+
+import hashlib
+import json
+import os
+from collections import namedtuple
+
+SyncStats = namedtuple("SyncStats", "added updated removed unchanged")
+
+
+def file_hash(path):
+    """Compute the SHA-1 hash of the content of a file."""
+    sha = hashlib.sha1()
+    with open(path, "rb") as fp:
+        for block in iter(lambda: fp.read(1 << 16), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+class SyncState(object):
+    """Persisted state of the files synchronized into a directory."""
+
+    def __init__(self, filepath):
+        """Initialize state.
+
+        :param filepath: Path of the JSON state file.
+        """
+        self.filepath = filepath
+        self.files = {}
+
+    def load(self):
+        """Load the state file, if it exists and is valid."""
+        try:
+            with open(self.filepath) as fp:
+                self.files = json.load(fp)["files"]
+        except (OSError, ValueError, KeyError):
+            self.files = {}
+        return self
+
+    def save(self):
+        """Write the state file atomically."""
+        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+        tmp_filepath = "{}.{}.tmp".format(self.filepath, os.getpid())
+        with open(tmp_filepath, "w") as fp:
+            json.dump({"files": self.files}, fp, sort_keys=True)
+        os.replace(tmp_filepath, self.filepath)
+
+
+def _remove(path):
+    """Remove a synchronized file or link, but never a real directory."""
+    if os.path.islink(path) or os.path.isfile(path):
+        os.remove(path)
+
+
+def check_file(src, dst, prev, hash_content=True):
+    """Check whether a source file changed since it was synchronized.
+
+    :param src: Source path.
+    :param dst: Destination path.
+    :param prev: Previous state record of the destination, or ``None``.
+    :param hash_content: Compute the content hash of changed files, to detect
+        files which were touched without changing their content.
+    :returns: A tuple with the new state record of the destination and
+        whether it is unchanged.
+    """
+    st = os.stat(src)
+    same_source = prev is not None and prev[0] == src and os.path.lexists(dst)
+
+    # Unchanged size and modification time
+    if same_source and prev[1:3] == [st.st_size, st.st_mtime_ns]:
+        return prev, True
+
+    # Touched but identical content (directories are not hashed)
+    digest = file_hash(src) if hash_content and os.path.isfile(src) else None
+    record = [src, st.st_size, st.st_mtime_ns, digest]
+    return record, same_source and digest is not None and prev[3] == digest
+
+
+def remove_deleted(previous, files, dstdir):
+    """Remove the destinations of a previous state which are not synchronized.
+
+    :returns: The list of removed relative paths.
+    """
+    removed = []
+    for relpath in sorted(set(previous) - set(files)):
+        dst = os.path.join(dstdir, relpath)
+        if os.path.lexists(dst):
+            _remove(dst)
+            removed.append(relpath)
+    return removed
+
+
+def sync_files(sources, dstdir, state, copy_func, force=False):
+    """Synchronize files into a directory, only touching what changed.
+
+    :param sources: Iterable of ``(source path, relative destination path)``
+        tuples. If several sources have the same destination, the first one
+        wins.
+    :param dstdir: Destination directory.
+    :param state: :class:`SyncState` of the destination directory, which is
+        updated (but not saved).
+    :param copy_func: Function called with the source and destination paths
+        to copy (or link) a file. The destination does not exist when called.
+    :param force: Copy all files, regardless of the state.
+    :returns: A :class:`SyncStats` tuple.
+    """
+    previous = {} if force else state.files
+    files = {}
+    added = updated = unchanged = 0
+
+    for src, relpath in sources:
+        if relpath in files:
+            continue
+        dst = os.path.join(dstdir, relpath)
+        files[relpath], is_unchanged = check_file(src, dst, previous.get(relpath))
+        if is_unchanged:
+            unchanged += 1
+            continue
+
+        if os.path.lexists(dst):
+            _remove(dst)
+            updated += 1
+        else:
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            added += 1
+        copy_func(src, dst)
+
+    removed = remove_deleted(state.files, files, dstdir)
+    state.files = files
+    return SyncStats(added, updated, len(removed), unchanged)
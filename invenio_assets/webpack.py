@@ -3,36 +3,482 @@
 
 """Default Webpack project for Invenio."""
 
+import copy
+import hashlib
+import json
 import os
-from collections import OrderedDict
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict, namedtuple
+from importlib.metadata import EntryPoint
 
-from flask import current_app, request
-from flask_webpackext import WebpackBundle, WebpackBundleProject
+from flask import current_app, has_app_context, has_request_context, request
+from flask_webpackext import WebpackBundle, WebpackBundleProject, current_webpack
 from flask_webpackext.manifest import JinjaManifest, JinjaManifestLoader
+from flask_webpackext.project import flask_config
 from invenio_base.utils import obj_or_import_string
 from markupsafe import Markup
-from pywebpack import ManifestEntry, UnsupportedExtensionError, bundles_from_entry_point
+from pywebpack import ManifestEntry, UnsupportedExtensionError
+from pywebpack.helpers import entry_points, merge_deps
 from werkzeug.local import LocalProxy
 
-webpack_project = WebpackBundleProject(
+from .buildcache import LOCKFILES, BuildCache, build_fingerprint
+from .compress import compress_app_directory
+from .differential import build_targets, is_modern_request, modern_manifest_path
+from .inline import inline_chunks, is_inline, nonce_tag
+from .presets import preset_config, preset_dependencies
+from .rebuild import rebuild_entries
+from .shards import build_shards
+from .signals import entry_rendered, manifest_loaded, request_rendered
+from .sync import SyncState, sync_files
+
+
+def distributions_fingerprint():
+    """Compute a fingerprint of the installed Python distributions.
+
+    The fingerprint covers the name and modification time of the metadata
+    directory of each distribution found on ``sys.path``, which change when a
+    distribution is installed, upgraded or removed, without having to read the
+    metadata itself.
+    """
+    sha = hashlib.sha1()
+    for path in sys.path:
+        try:
+            names = sorted(os.listdir(path or "."))
+        except OSError:
+            continue
+        for name in names:
+            if name.endswith((".dist-info", ".egg-info", ".egg-link", ".pth")):
+                try:
+                    mtime = os.stat(os.path.join(path, name)).st_mtime_ns
+                except OSError:
+                    continue
+                sha.update("{}/{}:{}\n".format(path, name, mtime).encode("utf-8"))
+    return sha.hexdigest()
+
+
+class BundleRegistry(object):
+    """Bundles registered in an entry point group, discovered on first use.
+
+    Discovering the entry points of a group requires reading the metadata of
+    all installed distributions. It is therefore deferred until the bundles
+    are needed, done once per process, and shared by all the projects using
+    the registry. Within an application context, the discovered entry points
+    are also cached in ``ASSETS_CACHE_DIR``, keyed by
+    :func:`distributions_fingerprint`, so that other processes can skip the
+    discovery.
+    """
+
+    def __init__(self, group):
+        """Initialize registry.
+
+        :param group: Name of the entry point group.
+        """
+        self.group = group
+        self._bundles = None
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        """Iterate over the bundles."""
+        return (bundle for _, bundle in self.items())
+
+    def items(self):
+        """Get the entry points and their bundles."""
+        if self._bundles is None:
+            with self._lock:
+                if self._bundles is None:
+                    self._bundles = [
+                        (ep, self._load(ep)) for ep in self._entry_points()
+                    ]
+        return list(self._bundles)
+
+    def package(self, bundle):
+        """Get the top-level package of the entry point of a bundle.
+
+        :returns: The name of the package, or ``None`` if the bundle is not
+            registered in the group.
+        """
+        for ep, other in self.items():
+            if other is bundle:
+                return ep.value.split(":")[0].split(".")[0]
+        return None
+
+    @staticmethod
+    def _load(ep):
+        """Load the bundle of an entry point."""
+        bundle = ep.load()
+        return bundle() if callable(bundle) else bundle
+
+    def _entry_points(self):
+        """Get the entry points of the group, from the cache if possible."""
+        cache_dir = None
+        if has_app_context():
+            cache_dir = current_app.config.get("ASSETS_CACHE_DIR")
+        if not cache_dir:
+            return list(entry_points(group=self.group))
+
+        cache_path = os.path.join(cache_dir, "entry-points-{}.json".format(self.group))
+        fingerprint = distributions_fingerprint()
+        try:
+            with open(cache_path) as fp:
+                cached = json.load(fp)
+            if cached["fingerprint"] == fingerprint:
+                return [
+                    EntryPoint(name=name, value=value, group=self.group)
+                    for name, value in cached["entry_points"]
+                ]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        eps = list(entry_points(group=self.group))
+        data = {
+            "fingerprint": fingerprint,
+            "entry_points": [[ep.name, ep.value] for ep in eps],
+        }
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = "{}.{}.tmp".format(cache_path, os.getpid())
+            with open(tmp_path, "w") as fp:
+                json.dump(data, fp)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            current_app.logger.warning(
+                "Could not write entry points cache %s.", cache_path, exc_info=True
+            )
+        return eps
+
+
+webpack_bundles = BundleRegistry("invenio_assets.webpack")
+"""Bundles registered in the ``invenio_assets.webpack`` entry point group."""
+
+
+def invenio_config():
+    """Configuration injected in the webpack project.
+
+    Extends :func:`flask_webpackext.project.flask_config` with the following
+    keys inside ``build``:
+
+    * ``cache``: ``false``, or the ``directory`` and ``version`` of the
+      persistent build cache. The version changes whenever the dependencies
+      of the project change.
+    * ``parallel``: the number of ``babel`` workers (``0`` to run babel in the
+      main process) and the ``minimizer`` parallelism (``true`` for the
+      number of CPUs minus one, or a number of processes).
+    * ``profile``: ``false``, or the path of the JSON build profile (see
+      :mod:`invenio_assets.profile`).
+    * ``preset``: ``false``, or the build preset selected with
+      ``ASSETS_BUILD_PRESET`` (see :mod:`invenio_assets.presets`).
+    """
+    config = flask_config()
+    app_config = current_app.config
+    cache = False
+    if app_config["ASSETS_WEBPACK_CACHE"]:
+        package_json = current_webpack.project.package_json
+        dependencies = {
+            key: package_json.get(key, {})
+            for key in ("dependencies", "devDependencies", "peerDependencies")
+        }
+        cache = {
+            "directory": app_config["ASSETS_WEBPACK_CACHE_DIR"],
+            "version": hashlib.sha1(
+                json.dumps(dependencies, sort_keys=True).encode("utf-8")
+            ).hexdigest(),
+        }
+    config["build"].update(
+        {
+            "cache": cache,
+            "parallel": {
+                "babel": app_config["ASSETS_WEBPACK_BABEL_WORKERS"],
+                "minimizer": app_config["ASSETS_WEBPACK_MINIMIZER_PARALLEL"],
+            },
+            "profile": (
+                app_config["ASSETS_WEBPACK_PROFILE_PATH"]
+                if app_config["ASSETS_WEBPACK_PROFILE"]
+                else False
+            ),
+            "preset": (
+                preset_config(
+                    app_config["ASSETS_BUILD_PRESET"],
+                    app_config["ASSETS_BUILD_PRESETS"],
+                )
+                if app_config["ASSETS_BUILD_PRESET"]
+                else False
+            ),
+        }
+    )
+    return config
+
+
+class InvenioWebpackBundleProject(WebpackBundleProject):
+    """Webpack bundle project with an incremental ``create`` step.
+
+    If ``ASSETS_BUILD_CACHE`` is enabled, the output of each build is stored
+    in a cache directory, and restored instead of running npm and webpack when
+    the inputs of the build did not change (see
+    :mod:`invenio_assets.buildcache`).
+
+    If ``ASSETS_WEBPACK_SHARDS`` is larger than one, the entries are built in
+    shards by parallel processes (see :mod:`invenio_assets.shards`).
+
+    If ``ASSETS_DIFFERENTIAL_BUILD`` is enabled, the project is built for
+    modern and legacy browsers (see :mod:`invenio_assets.differential`).
+
+    Entries can also be rebuilt selectively, see :meth:`rebuild`.
+
+    If ``ASSETS_COMPRESS`` is enabled, the compressed sidecars of the output
+    files are written after each build (see :mod:`invenio_assets.compress`).
+
+    If ``ASSETS_WEBPACK_INCREMENTAL_CREATE`` is enabled, creating the project
+    only copies (or links) the files of the project template and of the
+    bundles which were added or changed since the last creation, and removes
+    the ones which were deleted, based on a state file kept in the project
+    folder. When several bundles provide the same file, the first one wins.
+    """
+
+    state_filename = ".create-state.json"
+    """Name of the state file of the incremental creation."""
+
+    @property
+    def package_json(self):
+        """Merge the bundle and build tool dependencies into ``package.json``.
+
+        The npm packages of the tools used by the build, depending on the
+        build preset selected with ``ASSETS_BUILD_PRESET`` and on
+        ``ASSETS_WEBPACK_BABEL_WORKERS``, are added to the ``devDependencies``.
+        """
+        package_json = super(InvenioWebpackBundleProject, self).package_json
+        name = current_app.config.get("ASSETS_BUILD_PRESET")
+        if name:
+            preset = preset_config(name, current_app.config["ASSETS_BUILD_PRESETS"])
+        else:
+            preset = {"transpiler": "babel", "minifier": "terser"}
+        dependencies = preset_dependencies(
+            preset,
+            babel_workers=current_app.config.get("ASSETS_WEBPACK_BABEL_WORKERS", 0),
+        )
+        if not dependencies:
+            return package_json
+        return merge_deps(
+            copy.deepcopy(package_json),
+            {"devDependencies": dependencies},
+            incoming_label="build preset {0}".format(name) if name else "build",
+        )
+
+    @property
+    def build_cache(self):
+        """Cache of the build outputs, or ``None`` if disabled."""
+        if not current_app.config.get("ASSETS_BUILD_CACHE"):
+            return None
+        return BuildCache(
+            current_app.config["ASSETS_BUILD_CACHE_DIR"],
+            max_entries=current_app.config["ASSETS_BUILD_CACHE_MAX_ENTRIES"],
+        )
+
+    def build_fingerprint(self, args=()):
+        """Fingerprint of the inputs of a build of the created project."""
+
+        def files():
+            for src, relpath in self._sources():
+                yield src, relpath
+            for path in (self.config_path, self.npmpkg.package_json_path):
+                yield path, os.path.relpath(path, self.project_path)
+            for filename in LOCKFILES:
+                yield os.path.join(self.project_path, filename), filename
+
+        return build_fingerprint(files(), args=args)
+
+    def build(self, *args):
+        """Run the build script, then compress its output if enabled."""
+        result = self._build(args)
+        self._compile_manifests()
+        self._compress_output()
+        return result
+
+    def buildall(self):
+        """Create, install and build the project.
+
+        Only the project creation is run if the build output is restored from
+        the build cache.
+        """
+        self.create()
+        self._build((), install=True)
+        self._compile_manifests()
+        self._compress_output()
+
+    def rebuild(self, entries, *args):
+        """Create the project, then build only some of its entries.
+
+        The manifest of the last build is patched with the chunks of the
+        rebuilt entries (see :mod:`invenio_assets.rebuild`).
+
+        :param entries: Names of the entries to build.
+        :param args: Arguments of the build script.
+        :returns: The patched manifest.
+        """
+        self.create()
+        manifest = rebuild_entries(
+            self,
+            entries,
+            current_app.config["WEBPACKEXT_PROJECT_DISTDIR"],
+            args=args,
+            differential=current_app.config.get("ASSETS_DIFFERENTIAL_BUILD", False),
+        )
+        self._compile_manifests()
+        self._compress_output()
+        return manifest
+
+    def _build(self, args, install=False):
+        """Restore the build output from the cache, or run the build."""
+        cache = self.build_cache
+        distdir = current_app.config["WEBPACKEXT_PROJECT_DISTDIR"]
+        if cache is not None:
+            fingerprint = self.build_fingerprint(args)
+            if cache.restore(fingerprint, distdir):
+                current_app.logger.info(
+                    "Restored webpack build %s from the build cache.", fingerprint
+                )
+                return 0
+
+        if install:
+            self.install()
+        shards = current_app.config.get("ASSETS_WEBPACK_SHARDS", 1)
+        if current_app.config.get("ASSETS_DIFFERENTIAL_BUILD"):
+            build_targets(
+                self,
+                args,
+                distdir,
+                jobs=current_app.config.get("ASSETS_WEBPACK_SHARD_JOBS"),
+            )
+            result = 0
+        elif shards > 1:
+            build_shards(
+                self,
+                args,
+                shards,
+                distdir,
+                jobs=current_app.config.get("ASSETS_WEBPACK_SHARD_JOBS"),
+                groups=current_app.config.get("ASSETS_WEBPACK_SHARD_GROUPS", ()),
+            )
+            result = 0
+        else:
+            result = super(InvenioWebpackBundleProject, self).build(*args)
+        if cache is not None:
+            if install:
+                # The lockfile is written by the installation, store the
+                # output under the fingerprint the next builds compute.
+                fingerprint = self.build_fingerprint(args)
+            cache.store(fingerprint, distdir)
+        return result
+
+    def _compile_manifests(self):
+        """Compile the manifests of the build output, if enabled.
+
+        Requests then do not have to compile them (see
+        :class:`~invenio_assets.manifest.CompiledManifestLoader`).
+        """
+        path = current_app.config.get("WEBPACKEXT_MANIFEST_PATH")
+        loader = current_webpack.manifest_loader()
+        if not path or not hasattr(loader, "compile"):
+            return
+        filepath = os.path.join(current_app.static_folder, path)
+        for filepath in (filepath, modern_manifest_path(filepath)):
+            if not os.path.exists(filepath):
+                continue
+            try:
+                loader.compile(filepath)
+            except OSError:
+                current_app.logger.warning(
+                    "Could not compile webpack manifest %s.", filepath, exc_info=True
+                )
+
+    def _compress_output(self):
+        """Write the compressed sidecars of the build output, if enabled."""
+        if current_app.config.get("ASSETS_COMPRESS"):
+            stats = compress_app_directory(
+                current_app, current_app.config["WEBPACKEXT_PROJECT_DISTDIR"]
+            )
+            current_app.logger.info(
+                "Compressed webpack output: %s files, %s sidecars written.", *stats
+            )
+
+    def _sources(self):
+        """Files of the project template and the bundles, with their paths."""
+        storage = self.storage_cls(self._project_template_dir, self.project_path)
+        for src, relpath in storage:
+            # package.json is generated from the bundle dependencies
+            if relpath != "package.json":
+                yield src, relpath
+        for bundle in self.bundles:
+            for src, relpath in self.storage_cls(bundle.path, self.project_path):
+                yield src, relpath
+
+    def create(self, force=None):
+        """Create webpack project from a template and the bundles."""
+        if force or not current_app.config.get("ASSETS_WEBPACK_INCREMENTAL_CREATE"):
+            return super(InvenioWebpackBundleProject, self).create(force=force)
+
+        def copy(src, dst):
+            self.storage_cls(src, dst)._copyfile(src, dst, force=True)
+
+        state = SyncState(os.path.join(self.project_path, self.state_filename))
+        stats = sync_files(self._sources(), self.project_path, state.load(), copy)
+        state.save()
+        current_app.logger.info(
+            "Created webpack project: %s added, %s updated, %s removed, "
+            "%s unchanged files.",
+            *stats,
+        )
+
+        # Only write the generated files if they changed, so that their
+        # modification time can be relied upon.
+        config = self.config
+        if config:
+            self._write_json(self.config_path, config)
+        self._write_json(self.npmpkg.package_json_path, self.package_json)
+
+    @staticmethod
+    def _write_json(path, data):
+        """Write a JSON file, unless it already has the same content."""
+        content = json.dumps(data, indent=2, sort_keys=True)
+        try:
+            with open(path) as fp:
+                if fp.read() == content:
+                    return
+        except OSError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as fp:
+            fp.write(content)
+
+
+webpack_project = InvenioWebpackBundleProject(
     __name__,
     project_folder="assets",
+    config=invenio_config,
     config_path="build/config.json",
-    bundles=bundles_from_entry_point("invenio_assets.webpack"),
+    bundles=webpack_bundles,
     package_json_source_path="package.json",
 )
 
-rspack_project = WebpackBundleProject(
+rspack_project = InvenioWebpackBundleProject(
     __name__,
     project_folder="assets",
+    config=invenio_config,
     config_path="build/config.json",
-    bundles=bundles_from_entry_point("invenio_assets.webpack"),
+    bundles=webpack_bundles,
     package_json_source_path="rspack-package.json",
 )
 
 # For backwards compatibility
 project = webpack_project
 
+BUNDLER_PROJECTS = {
+    "webpack": "invenio_assets.webpack:webpack_project",
+    "rspack": "invenio_assets.webpack:rspack_project",
+}
+"""Import path of the webpack project of each bundler, see ``ASSETS_BUNDLER``."""
+
 
 class WebpackThemeBundle(object):
     """Webpack themed bundle."""
@@ -50,6 +496,8 @@ class WebpackThemeBundle(object):
 
         """
         assert default and default in themes
+        # Active theme bundle per application, see ``resolve()``
+        self._resolved = weakref.WeakKeyDictionary()
         self.default = default
         self.themes = {}
         for theme, bundle in themes.items():
@@ -57,17 +505,46 @@ class WebpackThemeBundle(object):
                 import_name, os.path.join(folder, theme), **bundle
             )
 
-    @property
-    def _active_theme_bundle(self):
-        themes = current_app.config.get("APP_THEME", [])
+    def _select(self, themes):
+        """Select the theme bundle for a list of themes."""
         if not themes:
             return self.themes[self.default]
         for theme in themes:
             if theme in self.themes:
                 return self.themes[theme]
 
+    def resolve(self, app):
+        """Resolve the active theme bundle of an application.
+
+        The resolved bundle is cached per application and resolved again
+        only when the ``APP_THEME`` configuration of the application changes.
+
+        :param app: An instance of :class:`~flask.Flask`.
+        :returns: The active theme bundle, or ``None`` if none of the themes
+            in ``APP_THEME`` is provided by the bundle.
+        """
+        themes = app.config.get("APP_THEME", [])
+        resolved = self._resolved.get(app)
+        if resolved is not None and resolved[0] == themes:
+            return resolved[1]
+        bundle = self._select(themes)
+        self._resolved[app] = (list(themes), bundle)
+        return bundle
+
+    @property
+    def _active_theme_bundle(self):
+        if has_app_context():
+            return self.resolve(current_app._get_current_object())
+        # Outside of an application context, fall back to the bundle resolved
+        # for the only application which used it.
+        if len(self._resolved) == 1:
+            return next(iter(self._resolved.values()))[1]
+        raise RuntimeError("Working outside of application context.")
+
     def __getattr__(self, attr):
         """Proxy all attributes to the active theme bundle."""
+        if attr == "_resolved":  # e.g. while unpickling
+            raise AttributeError(attr)
         try:
             return getattr(self._active_theme_bundle, attr)
         except RuntimeError:
@@ -77,47 +554,455 @@ class WebpackThemeBundle(object):
             )
 
 
+def resolve_theme_bundles(app, bundles):
+    """Resolve the active theme of all the theme bundles of an application.
+
+    :param app: An instance of :class:`~flask.Flask`.
+    :param bundles: Iterable of bundles, where only the
+        :class:`WebpackThemeBundle` instances are resolved.
+    """
+    for bundle in bundles:
+        if isinstance(bundle, WebpackThemeBundle):
+            bundle.resolve(app)
+
+
+class ChunkTable(object):
+    """Table which interns chunk paths to small integer IDs.
+
+    Chunk IDs are used to track the chunks already output in a request in a
+    compact bitset (a ``bytearray`` with one bit per ID) instead of a
+    dictionary of paths.
+
+    Each manifest has its own table, so that the tables of the manifests
+    which were replaced (e.g. reloaded) are released with them.
+    """
+
+    def __init__(self):
+        """Initialize chunk table."""
+        self._ids = {}
+        self.paths = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Number of interned chunks."""
+        return len(self.paths)
+
+    def get(self, path):
+        """Get the ID of a chunk path, or ``None`` if it is not interned."""
+        return self._ids.get(path)
+
+    def intern(self, path):
+        """Get the ID of a chunk path, assigning a new one if needed."""
+        try:
+            return self._ids[path]
+        except KeyError:
+            with self._lock:
+                if path not in self._ids:
+                    self._ids[path] = len(self.paths)
+                    self.paths.append(path)
+                return self._ids[path]
+
+
+def _emitted_chunks(table):
+    """Get the chunks of a table already output in the current request.
+
+    :param table: :class:`ChunkTable` of the rendered entry.
+    :returns: A ``bytearray`` with one bit per chunk ID (bit ``id & 7`` of
+        byte ``id >> 3``), set once the chunk has been output.
+    """
+    size = (len(table) + 7) >> 3
+    emitted = getattr(request, "_webpack_emitted_chunks", None)
+    previous = getattr(request, "_webpack_chunk_table", None)
+    if emitted is not None and previous is table:
+        if len(emitted) < size:
+            # Chunks were interned since the request state was allocated
+            emitted.extend(bytes(size - len(emitted)))
+        return emitted
+
+    state = bytearray(size)
+    if emitted is not None:
+        # Entries of another manifest (e.g. before a reload) were rendered
+        for chunk_id, path in enumerate(previous.paths[: len(emitted) << 3]):
+            if emitted[chunk_id >> 3] & (1 << (chunk_id & 7)):
+                new_id = table.get(path)
+                if new_id is not None:
+                    state[new_id >> 3] |= 1 << (new_id & 7)
+    request._webpack_emitted_chunks = state
+    request._webpack_chunk_table = table
+    return state
+
+
+def emitted_chunk_paths():
+    """Get the paths of the chunks already output in the current request.
+
+    Replaces the ``request._jinja_webpack_entries`` dictionary of the
+    previous versions.
+
+    :returns: A list of chunk paths, in the order of their IDs.
+    """
+    emitted = getattr(request, "_webpack_emitted_chunks", None)
+    if emitted is None:
+        return []
+    paths = request._webpack_chunk_table.paths[: len(emitted) << 3]
+    return [
+        path
+        for chunk_id, path in enumerate(paths)
+        if emitted[chunk_id >> 3] & (1 << (chunk_id & 7))
+    ]
+
+
+RenderCacheInfo = namedtuple("RenderCacheInfo", "hits misses maxsize currsize")
+
+
+class RenderCache(object):
+    """LRU cache of the HTML rendered for a sequence of manifest entries.
+
+    The cache is keyed by the ordered names of the entries already rendered in
+    the request plus the name of the entry being rendered. Each value is the
+    rendered :class:`~markupsafe.Markup` and the chunks output so far.
+    """
+
+    def __init__(self, maxsize=256):
+        """Initialize render cache.
+
+        :param maxsize: Maximum number of cached entry sequences. Caching is
+            disabled if zero.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Get the cached ``(markup, emitted_chunks)`` tuple of a key."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Cache the ``(markup, emitted_chunks)`` tuple of a key."""
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached values and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def info(self):
+        """Get the cache statistics."""
+        return RenderCacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+
+class UniqueJinjaManifest(JinjaManifest):
+    """Manifest which caches the rendering of its entries.
+
+    The render cache and the table of chunk IDs live as long as the manifest,
+    hence they are invalidated whenever the manifest file changes and is
+    loaded again.
+    """
+
+    def __init__(self):
+        """Initialize manifest."""
+        super(UniqueJinjaManifest, self).__init__()
+        maxsize = 256
+        if has_app_context():
+            maxsize = current_app.config.get("ASSETS_RENDER_CACHE_SIZE", maxsize)
+        self.render_cache = RenderCache(maxsize=maxsize)
+        self.chunk_table = ChunkTable()
+
+    def add(self, entry):
+        """Add an entry to the manifest."""
+        super(UniqueJinjaManifest, self).add(entry)
+        entry._render_cache = self.render_cache
+        if entry._chunk_table is not self.chunk_table:
+            entry._chunk_table = self.chunk_table
+            entry._chunks = tuple(
+                (self.chunk_table.intern(path), ext, path, tag)
+                for _, ext, path, tag in entry._chunks
+            )
+
+
 class UniqueJinjaManifestEntry(ManifestEntry):
-    """Manifest entry which avoids double output of chunks."""
+    """Manifest entry which avoids double output of chunks.
+
+    The HTML tag of each chunk is rendered once, when the entry is created
+    (i.e. when the manifest is loaded), so that rendering an entry in a
+    template only has to filter out the chunks already output.
+    """
+
+    def __init__(self, name, paths, tags=None, chunk_table=None):
+        """Initialize manifest entry.
+
+        :param name: Name of the entry.
+        :param paths: List of chunk paths of the entry.
+        :param tags: List of the pre-rendered HTML tags of the chunks, e.g.
+            from a compiled manifest. By default the tags are rendered from
+            :attr:`templates`.
+        :param chunk_table: :class:`ChunkTable` of the manifest of the entry.
+            By default the entry has its own table, which is replaced when
+            the entry is added to a :class:`UniqueJinjaManifest`.
+        :raises pywebpack.UnsupportedExtensionError: If a chunk has an
+            extension without a template.
+        """
+        super(UniqueJinjaManifestEntry, self).__init__(name, paths)
+        self._chunk_table = chunk_table if chunk_table is not None else ChunkTable()
+        self._chunks = self._compile_chunks(paths, tags=tags)
+        # Paths of the chunks output inline, see :mod:`invenio_assets.inline`
+        self.inlined = frozenset(
+            path for _, ext, path, tag in self._chunks if is_inline(ext, tag)
+        )
+        # Set when the entry is added to a UniqueJinjaManifest
+        self._render_cache = None
+
+    def _compile_chunks(self, paths, tags=None):
+        """Render the ``(id, extension, path, tag)`` tuple of each chunk."""
+        chunks = []
+        for i, p in enumerate(paths):
+            _, ext = os.path.splitext(p.lower())
+            tpl = self.templates.get(ext)
+            if tpl is None:
+                raise UnsupportedExtensionError(p)
+            tag = tags[i] if tags is not None else tpl.format(p)
+            chunks.append((self._chunk_table.intern(p), ext, p, tag))
+        return tuple(chunks)
 
     def __html__(self):
         """Output chunk HTML tags that haven't been yet output."""
-        if not hasattr(request, "_jinja_webpack_entries"):
-            setattr(
-                request,
-                "_jinja_webpack_entries",
-                {
-                    ".js": OrderedDict(),
-                    ".css": OrderedDict(),
-                },
-            )
+        if entry_rendered.receivers or request_rendered.receivers:
+            return self._render_measured()
+        return self._render()
 
-        output = []
+    def _render_measured(self):
+        """Render the entry, and send the :data:`.signals.entry_rendered` signal."""
+        output = _emitted_chunks(self._chunk_table)
+        deduplicated = sum(
+            1
+            for chunk_id, _, _, _ in self._chunks
+            if output[chunk_id >> 3] & (1 << (chunk_id & 7))
+        )
+        emitted = len(self._chunks) - deduplicated
+        start = time.perf_counter()
+        html = self._render()
+        seconds = time.perf_counter() - start
+
+        stats = getattr(request, "_webpack_render_stats", None)
+        if stats is None:
+            stats = request._webpack_render_stats = [0, 0, 0, 0.0]
+        stats[0] += 1
+        stats[1] += emitted
+        stats[2] += deduplicated
+        stats[3] += seconds
+        entry_rendered.send(
+            current_app._get_current_object(),
+            entry=self.name,
+            emitted=emitted,
+            deduplicated=deduplicated,
+            seconds=seconds,
+        )
+        return html
+
+    def _csp_nonce(self):
+        """Get the CSP nonce of the inline tags in the current request."""
+        assets = current_app.extensions.get("invenio-assets")
+        get_nonce = getattr(assets, "inline_csp_nonce", None)
+        if get_nonce is None or not self.inlined:
+            return None
+        return get_nonce()
+
+    def _render(self):
+        """Render the chunk HTML tags that haven't been yet output."""
+        emitted = _emitted_chunks(self._chunk_table)
+
+        # The chunks already output only depend on the entries rendered before
+        key = getattr(request, "_webpack_rendered_entries", ()) + (self.name,)
+        request._webpack_rendered_entries = key
 
         # For debugging add from which entry the chunk came
-        if current_app.debug:
+        debug = current_app.debug
+        # The nonce changes on every request, so its tags cannot be cached
+        nonce = self._csp_nonce()
+        cache = None if debug or nonce else self._render_cache
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                html, state = cached
+                emitted[: len(state)] = state
+                return html
+
+        output = []
+        if debug:
             output.append("<!-- {} -->".format(self.name))
-        for p in self._paths:
-            _, ext = os.path.splitext(p.lower())
+        for chunk_id, ext, _, tag in self._chunks:
             # If we haven't come across the chunk yet, we add it to the output
-            if ext not in request._jinja_webpack_entries:
-                raise UnsupportedExtensionError(p)
-            if p not in request._jinja_webpack_entries[ext]:
-                tpl = self.templates.get(ext)
-                if tpl is None:
-                    raise UnsupportedExtensionError(p)
-                output.append(tpl.format(p))
+            mask = 1 << (chunk_id & 7)
+            if not emitted[chunk_id >> 3] & mask:
+                if nonce and is_inline(ext, tag):
+                    tag = nonce_tag(tag, nonce)
+                output.append(tag)
+                # Mark the we have already output the chunk
+                emitted[chunk_id >> 3] |= mask
+        html = Markup("\n".join(output))
 
-            # Mark the we have already output the chunk
-            request._jinja_webpack_entries[ext][p] = None
-        return Markup("\n".join(output))
+        if cache is not None:
+            cache.set(key, (html, bytes(emitted)))
+        return html
+
+
+_WatchedManifest = namedtuple("_WatchedManifest", "manifest stat_key next_check")
 
 
 class UniqueJinjaManifestLoader(JinjaManifestLoader):
-    """Factory which uses the Jinja manifest entry."""
+    """Factory which uses the Jinja manifest entry.
+
+    By default a manifest is loaded once per process (or on every access in
+    debug mode). If a ``reload_interval`` is given, the loader checks, at most
+    once per interval, whether the inode, modification time or size of the
+    manifest file changed, and only then parses the file again. The new
+    manifest replaces the previous one atomically, so that a new build can be
+    deployed without restarting the application.
+    """
+
+    watched = {}
+    """Manifests loaded with a reload interval, keyed by file path."""
+
+    missing = {}
+    """Time of the next check of the missing modern manifests, by file path."""
 
-    def __init__(self, manifest_cls=JinjaManifest, entry_cls=UniqueJinjaManifestEntry):
-        """Initialize manifest loader."""
+    _watch_lock = threading.Lock()
+
+    def __init__(
+        self,
+        manifest_cls=UniqueJinjaManifest,
+        entry_cls=UniqueJinjaManifestEntry,
+        reload_interval=None,
+    ):
+        """Initialize manifest loader.
+
+        :param manifest_cls: Manifest class.
+        :param entry_cls: Manifest entry class.
+        :param reload_interval: Minimum number of seconds between two checks
+            of the manifest file for changes. By default the manifest is
+            never reloaded.
+        """
         super(UniqueJinjaManifestLoader, self).__init__(
             manifest_cls=manifest_cls, entry_cls=entry_cls
         )
+        self.reload_interval = reload_interval
+
+    def parse(self, filepath):
+        """Parse a manifest file, without caching."""
+        # Bypass the cache of JinjaManifestLoader
+        manifest = super(JinjaManifestLoader, self).load(filepath)
+        inline_max_size = current_app.config.get("ASSETS_INLINE_CHUNK_MAX_SIZE")
+        if inline_max_size:
+            inline_chunks(manifest, inline_max_size)
+        return manifest
+
+    def _parse(self, filepath, reload=False):
+        """Parse a manifest file, and send the manifest loaded signal."""
+        if not manifest_loaded.receivers:
+            return self.parse(filepath)
+        start = time.perf_counter()
+        manifest = self.parse(filepath)
+        manifest_loaded.send(
+            current_app._get_current_object(),
+            filepath=filepath,
+            seconds=time.perf_counter() - start,
+            reload=reload,
+        )
+        return manifest
+
+    def load(self, filepath):
+        """Load a manifest from a file.
+
+        If ``ASSETS_DIFFERENTIAL_BUILD`` is enabled, the manifest of the
+        modern build is loaded instead for modern browsers, if it exists.
+        """
+        if current_app.config.get("ASSETS_DIFFERENTIAL_BUILD") and (
+            has_request_context() and is_modern_request()
+        ):
+            modern_filepath = modern_manifest_path(filepath)
+            if self._modern_exists(modern_filepath):
+                filepath = modern_filepath
+        if self.reload_interval is None or current_app.debug:
+            if current_app.debug or filepath not in JinjaManifestLoader.cache:
+                JinjaManifestLoader.cache[filepath] = self._parse(
+                    filepath, reload=filepath in JinjaManifestLoader.cache
+                )
+            return JinjaManifestLoader.cache[filepath]
+
+        watched = self.watched.get(filepath)
+        if watched is not None and time.monotonic() < watched.next_check:
+            return watched.manifest
+
+        # Only one thread checks the file, the others keep the current manifest
+        if not self._watch_lock.acquire(blocking=watched is None):
+            return watched.manifest
+        try:
+            return self._reload(filepath)
+        finally:
+            self._watch_lock.release()
+
+    def _modern_exists(self, filepath):
+        """Check if the manifest of the modern build exists.
+
+        A missing manifest is checked again after the reload interval (or
+        never without interval), as the main manifest.
+        """
+        if filepath in JinjaManifestLoader.cache or filepath in self.watched:
+            return True
+        now = time.monotonic()
+        if not current_app.debug and now < self.missing.get(filepath, now):
+            return False
+        if os.path.exists(filepath):
+            self.missing.pop(filepath, None)
+            return True
+        if self.reload_interval is None:
+            self.missing[filepath] = float("inf")
+        else:
+            self.missing[filepath] = now + self.reload_interval
+        return False
+
+    def _reload(self, filepath):
+        """Parse the manifest file again if it changed since the last check."""
+        watched = self.watched.get(filepath)
+        now = time.monotonic()
+        if watched is not None and now < watched.next_check:
+            return watched.manifest
+
+        try:
+            stat = os.stat(filepath)
+            stat_key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if watched is not None and watched.stat_key == stat_key:
+                manifest = watched.manifest
+            else:
+                manifest = self._parse(filepath, reload=watched is not None)
+        except Exception:
+            if watched is None:
+                raise
+            # Most likely a build in progress, which removed or is writing the
+            # manifest: keep the current manifest and check again after the
+            # interval.
+            current_app.logger.warning(
+                "Could not reload webpack manifest %s.", filepath, exc_info=True
+            )
+            manifest, stat_key = watched.manifest, watched.stat_key
+
+        self.watched[filepath] = _WatchedManifest(
+            manifest, stat_key, now + self.reload_interval
+        )
+        return manifest
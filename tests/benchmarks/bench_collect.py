@@ -0,0 +1,101 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Benchmark of ``flask collect``.
+
+Creates blueprints whose static folders hold a synthetic tree of files, and
+runs the ``collect`` command with the file and link storages of Flask-Collect:
+a full collection, then a collection where no file changed. Reports the time
+and throughput of each run as JSON::
+
+    $ python tests/benchmarks/bench_collect.py
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from click.testing import CliRunner
+from flask import Blueprint, Flask
+from flask.cli import ScriptInfo
+
+from invenio_assets import InvenioAssets
+from invenio_assets.cli import collect
+
+STORAGES = {
+    "file": "flask_collect.storage.file",
+    "link": "flask_collect.storage.link",
+}
+
+
+def make_tree(root, n_blueprints=20, files_per_blueprint=500, size=512):
+    """Create the static folders of the blueprints."""
+    content = b"x" * size
+    folders = []
+    for i in range(n_blueprints):
+        folder = os.path.join(root, "bp{}".format(i))
+        for j in range(files_per_blueprint):
+            dirpath = os.path.join(folder, "bp{}".format(i), "d{}".format(j % 20))
+            os.makedirs(dirpath, exist_ok=True)
+            with open(os.path.join(dirpath, "f{}.js".format(j)), "wb") as fp:
+                fp.write(content)
+        folders.append(folder)
+    return folders
+
+
+def create_app(instance_path, folders, storage):
+    """Create an application with a blueprint per static folder."""
+    app = Flask(
+        "bench_collect",
+        instance_path=instance_path,
+        static_folder=os.path.join(instance_path, "static"),
+    )
+    app.config["COLLECT_STORAGE"] = storage
+    InvenioAssets(app)
+    for i, folder in enumerate(folders):
+        app.register_blueprint(
+            Blueprint("bp{}".format(i), __name__, static_folder=folder)
+        )
+    return app
+
+
+def bench_collect(n_blueprints=20, files_per_blueprint=500, jobs=4):
+    """Measure full and unchanged collections with each storage."""
+    results = []
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        folders = make_tree(
+            os.path.join(tmp_dir, "src"), n_blueprints, files_per_blueprint
+        )
+        files = n_blueprints * files_per_blueprint
+        for name, storage in sorted(STORAGES.items()):
+            app = create_app(os.path.join(tmp_dir, name), folders, storage)
+            obj = ScriptInfo(create_app=lambda: app)
+            runner = CliRunner()
+            for run, args in (("full", ["--full"]), ("unchanged", [])):
+                start = time.perf_counter()
+                result = runner.invoke(collect, args + ["-j", str(jobs)], obj=obj)
+                elapsed = time.perf_counter() - start
+                assert result.exit_code == 0, result.output
+                results.append(
+                    {
+                        "name": "collect",
+                        "storage": name,
+                        "run": run,
+                        "files": files,
+                        "jobs": jobs,
+                        "seconds": elapsed,
+                        "files_per_second": files / elapsed,
+                    }
+                )
+    finally:
+        shutil.rmtree(tmp_dir)
+    return results
+
+
+if __name__ == "__main__":
+    json.dump(bench_collect(), sys.stdout, indent=2)
+    sys.stdout.write("\n")
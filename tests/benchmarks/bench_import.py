@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Benchmark of the import cost of ``invenio_assets.webpack``.
+
+Imports the module in fresh interpreters with ``-X importtime``, and reports
+the wall time of the interpreter, the cumulative import time of the module
+(including its parent packages) and its slowest imports as JSON::
+
+    $ python tests/benchmarks/bench_import.py
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+MODULE = "invenio_assets.webpack"
+
+
+def parse_importtime(output):
+    """Parse the output of ``-X importtime`` into cumulative microseconds."""
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def bench_import(module=MODULE, n_runs=10, top=10):
+    """Measure the import of a module in fresh interpreters."""
+    command = [sys.executable, "-X", "importtime", "-c", "import " + module]
+    # Warm up the filesystem caches
+    subprocess.run(command, stderr=subprocess.DEVNULL, check=True)
+
+    walls, imports = [], []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        process = subprocess.run(
+            command,
+            stderr=subprocess.PIPE,
+            check=True,
+            universal_newlines=True,
+        )
+        walls.append(time.perf_counter() - start)
+        imports.append(parse_importtime(process.stderr))
+
+    # Baseline of an empty interpreter
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    baseline = time.perf_counter() - start
+
+    # Importing a module imports its parent packages first
+    root = module.split(".")[0]
+    last = imports[-1]
+    slowest = sorted(last.items(), key=lambda item: -item[1])[:top]
+    return {
+        "name": "import",
+        "module": module,
+        "runs": n_runs,
+        "wall_seconds": statistics.median(walls),
+        "interpreter_seconds": baseline,
+        "import_seconds": statistics.median(t[root] for t in imports) / 1e6,
+        "slowest_imports": [
+            {"module": name, "seconds": cumulative / 1e6}
+            for name, cumulative in slowest
+        ],
+    }
+
+
+if __name__ == "__main__":
+    json.dump(bench_import(), sys.stdout, indent=2)
+    sys.stdout.write("\n")
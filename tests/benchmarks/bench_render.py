@@ -0,0 +1,121 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Benchmark of the rendering of webpack entries in templates.
+
+Writes a synthetic webpack-bundle-tracker manifest with thousands of entries
+sharing vendor chunks, loads it with
+:class:`~invenio_assets.webpack.UniqueJinjaManifestLoader`, and renders a few
+overlapping entries per request, like a typical Invenio page does. Pages are
+rendered with and without the render cache of the manifest. Reports the
+render time and the memory allocated per request as JSON::
+
+    $ python tests/benchmarks/bench_render.py
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from flask import Flask
+
+from invenio_assets.webpack import UniqueJinjaManifestLoader
+
+
+def make_manifest(filepath, n_entries=5000, n_vendor=1000, chunks_per_entry=8, seed=42):
+    """Write a manifest whose entries share chunks out of a pool of vendor chunks.
+
+    :returns: The names of the entries.
+    """
+    rng = random.Random(seed)
+    vendor = ["js/vendor-{}.js".format(i) for i in range(n_vendor)]
+    chunks = {}
+    for i in range(n_entries):
+        paths = rng.sample(vendor, chunks_per_entry - 2)
+        paths.append("js/entry-{}.js".format(i))
+        paths.append("css/entry-{}.css".format(i))
+        chunks["entry-{}".format(i)] = paths
+    assets = {
+        path: {"name": path, "publicPath": "/static/dist/" + path}
+        for paths in chunks.values()
+        for path in paths
+    }
+    with open(filepath, "w") as fp:
+        json.dump({"status": "done", "chunks": chunks, "assets": assets}, fp)
+    return sorted(chunks)
+
+
+def bench_page_render(filepath, names, cache_size, entries_per_request, n_requests):
+    """Measure the rendering of overlapping entries per request."""
+    app = Flask(__name__)
+    app.config["ASSETS_RENDER_CACHE_SIZE"] = cache_size
+    with app.app_context():
+        manifest = UniqueJinjaManifestLoader().load(filepath)
+    rng = random.Random(42)
+    pages = [
+        [
+            manifest[name + ext]
+            for name in rng.sample(names, entries_per_request // 2)
+            for ext in (".js", ".css")
+        ]
+        # The sequences of entries of all the pages fit in the default cache
+        for _ in range(20)
+    ]
+
+    # Time spent rendering (request context setup excluded)
+    elapsed = 0.0
+    for i in range(n_requests):
+        with app.test_request_context():
+            start = time.perf_counter()
+            for entry in pages[i % len(pages)]:
+                entry.__html__()
+            elapsed += time.perf_counter() - start
+
+    # Memory allocated by the rendering of a page
+    tracemalloc.start()
+    peaks = []
+    for page in pages:
+        with app.test_request_context():
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            output = [entry.__html__() for entry in page]
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+            del output
+    tracemalloc.stop()
+
+    cache = manifest.render_cache
+    return {
+        "name": "render-cached" if cache_size else "render-uncached",
+        "entries": len(names),
+        "requests": n_requests,
+        "entries_per_request": entries_per_request,
+        "requests_per_second": n_requests / elapsed,
+        "us_per_entry": elapsed / (n_requests * entries_per_request) * 1e6,
+        "peak_bytes_per_request": sum(peaks) / len(peaks),
+        "cache_hit_ratio": cache.hits / max(cache.hits + cache.misses, 1),
+    }
+
+
+def bench_render(entries_per_request=12, n_requests=2000):
+    """Measure the rendering of entries with and without the render cache."""
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for cache_size in (256, 0):
+            # Loaded manifests are kept per file
+            filepath = os.path.join(tmpdir, "manifest-{}.json".format(cache_size))
+            names = make_manifest(filepath)
+            results.append(
+                bench_page_render(
+                    filepath, names, cache_size, entries_per_request, n_requests
+                )
+            )
+    return results
+
+
+if __name__ == "__main__":
+    json.dump(bench_render(), sys.stdout, indent=2)
+    sys.stdout.write("\n")
@@ -0,0 +1,74 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Benchmark of the attribute resolution of theme bundles.
+
+Creates theme bundles like the ones of the Invenio modules, and reads their
+attributes within an application context, as the webpack project does when it
+collects the entries and dependencies of the bundles. Reports the throughput
+as JSON::
+
+    $ python tests/benchmarks/bench_theme.py
+"""
+
+import json
+import sys
+import time
+
+from flask import Flask
+
+from invenio_assets.webpack import WebpackThemeBundle
+
+ATTRIBUTES = ("path", "entry", "dependencies", "aliases")
+
+
+def make_bundles(n_bundles=100):
+    """Create theme bundles with two themes each."""
+    return [
+        WebpackThemeBundle(
+            "invenio_assets",
+            "assets",
+            default="semantic-ui",
+            themes={
+                theme: dict(
+                    entry={"theme-{}".format(i): "./theme-{}.js".format(theme)},
+                    dependencies={"jquery": "^3.2.1"},
+                    aliases={"@bundle{}".format(i): "js/bundle{}".format(i)},
+                )
+                for theme in ("bootstrap3", "semantic-ui")
+            },
+        )
+        for i in range(n_bundles)
+    ]
+
+
+def bench_theme(n_bundles=100, n_rounds=200):
+    """Measure the resolution of bundle attributes, per theme configuration."""
+    bundles = make_bundles(n_bundles)
+    results = []
+    for themes in ([], ["bootstrap3"]):
+        app = Flask(__name__)
+        app.config["APP_THEME"] = themes
+        with app.app_context():
+            start = time.perf_counter()
+            for _ in range(n_rounds):
+                for bundle in bundles:
+                    for attr in ATTRIBUTES:
+                        getattr(bundle, attr)
+            elapsed = time.perf_counter() - start
+        lookups = n_rounds * n_bundles * len(ATTRIBUTES)
+        results.append(
+            {
+                "name": "theme",
+                "app_theme": themes,
+                "lookups": lookups,
+                "lookups_per_second": lookups / elapsed,
+                "us_per_lookup": elapsed / lookups * 1e6,
+            }
+        )
+    return results
+
+
+if __name__ == "__main__":
+    json.dump(bench_theme(), sys.stdout, indent=2)
+    sys.stdout.write("\n")
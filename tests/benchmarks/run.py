@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Run all the benchmarks of the asset pipeline.
+
+Writes the results as JSON, with the versions of Python and Invenio-Assets, so
+that they can be compared between releases::
+
+    $ python tests/benchmarks/run.py -o results.json
+    $ python tests/benchmarks/run.py -b render -b theme
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+from bench_collect import bench_collect
+from bench_import import bench_import
+from bench_render import bench_render
+from bench_theme import bench_theme
+
+from invenio_assets import __version__
+
+BENCHMARKS = {
+    "collect": bench_collect,
+    "import": bench_import,
+    "render": bench_render,
+    "theme": bench_theme,
+}
+
+
+def main(argv=None):
+    """Run the benchmarks and write their results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-b",
+        "--benchmark",
+        action="append",
+        choices=sorted(BENCHMARKS),
+        help="Benchmark to run, by default all of them.",
+    )
+    parser.add_argument("-o", "--output", help="Output file, by default stdout.")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.benchmark or sorted(BENCHMARKS):
+        result = BENCHMARKS[name]()
+        results.extend(result if isinstance(result, list) else [result])
+
+    data = {
+        "invenio_assets": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": int(time.time()),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(data, fp, indent=2)
+    else:
+        json.dump(data, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
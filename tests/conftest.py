@@ -4,7 +4,10 @@
 
 """Pytest configuration."""
 
+import json
 import shutil
+import subprocess
+import sys
 import tempfile
 from os import makedirs
 from os.path import dirname, exists, join
@@ -12,9 +15,70 @@ from os.path import dirname, exists, join
 import pytest
 from flask import Blueprint, Flask
 from flask.cli import ScriptInfo
+from pynpm import NPMPackage
 
 from invenio_assets import InvenioAssets
 
+# Build script writing a manifest like webpack-bundle-tracker for the entries
+# of its config: each entry has the runtime of the shard, a vendor chunk
+# depending on the entries of the shard, and its own chunk, suffixed with
+# the name of the target of differential builds.
+FAKE_BUILD_SCRIPT = """
+import hashlib, json, os, sys
+if int(sys.argv[1]):
+    sys.exit(int(sys.argv[1]))
+with open(os.environ["INVENIO_ASSETS_CONFIG"]) as fp:
+    config = json.load(fp)
+shard, target = config["build"]["shard"], config["build"].get("target")
+suffix = "." + target["name"] if target else ""
+vendor = hashlib.md5((" ".join(sorted(config["entry"])) + suffix).encode())
+runtime = "js/manifest.{0}.js".format(shard["index"])
+vendor = "js/vendor.{0}.js".format(vendor.hexdigest()[:8])
+chunks = {
+    name: [runtime, vendor, "js/{0}{1}.js".format(name, suffix)]
+    for name in config["entry"]
+}
+assets = {
+    name: {
+        "name": name,
+        "path": os.path.join(config["build"]["assetsPath"], name),
+        "publicPath": config["build"]["assetsURL"] + name,
+    }
+    for paths in chunks.values()
+    for name in paths
+}
+with open(shard["manifestPath"], "w") as fp:
+    json.dump({"status": "done", "chunks": chunks, "assets": assets}, fp)
+print("built", shard["index"])
+"""
+
+
+class FakeBuildPackage(NPMPackage):
+    """Package running the fake build script instead of the bundler."""
+
+    def __init__(self, path, exit_code=0):
+        """Initialize package."""
+        super().__init__(path)
+        self.exit_code = exit_code
+
+    def run_script(self, script, *args, wait=True):
+        """Run the fake build script."""
+        return subprocess.Popen(
+            [sys.executable, "-c", FAKE_BUILD_SCRIPT, str(self.exit_code)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+
+
+@pytest.fixture()
+def fake_build():
+    """Replace the bundler of webpack projects by a fake build script."""
+
+    def use_fake_build(project, exit_code=0):
+        project._npmpkg = FakeBuildPackage(project.path, exit_code=exit_code)
+
+    return use_fake_build
+
 
 @pytest.yield_fixture()
 def instance_path():
@@ -60,6 +124,27 @@ def app(instance_path):
     yield app
 
 
+@pytest.fixture()
+def manifest(app):
+    """Webpack manifest, in the format of webpack-bundle-tracker."""
+    chunks = {
+        "base": ["js/manifest.js", "js/vendor.js", "js/base.js", "css/base.css"],
+        "search": ["js/manifest.js", "js/vendor.js", "js/search.js"],
+        "deposit": ["js/manifest.js", "js/deposit.js"],
+    }
+    assets = {
+        path: {"name": path, "publicPath": "/static/dist/" + path}
+        for paths in chunks.values()
+        for path in paths
+    }
+    manifest_dir = join(app.static_folder, "dist")
+    makedirs(manifest_dir)
+    filepath = join(manifest_dir, "manifest.json")
+    with open(filepath, "w") as fp:
+        json.dump({"status": "done", "chunks": chunks, "assets": assets}, fp)
+    yield filepath
+
+
 @pytest.yield_fixture()
 def script_info(app):
     """Get ScriptInfo object for testing CLI."""
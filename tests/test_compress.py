@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Test precompressed sidecars."""
+
+import gzip
+import os
+from os.path import exists, join
+
+from invenio_assets.compress import (
+    compress_file,
+    compress_files,
+    compressible_files,
+    remove_sidecars,
+)
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as fp:
+        fp.write(content)
+
+
+def test_compress_files(instance_path):
+    """Test writing the sidecars of compressible files."""
+    _write(join(instance_path, "js", "app.js"), "var a = 1;\n" * 200)
+    _write(join(instance_path, "css", "small.css"), "* {}")
+    _write(join(instance_path, "img", "logo.png"), "x" * 2000)
+
+    paths = list(compressible_files(instance_path))
+    assert paths == [
+        join(instance_path, "css", "small.css"),
+        join(instance_path, "js", "app.js"),
+    ]
+    stats = compress_files(paths, min_size=1024, suffixes=[".gz"], jobs=2)
+    assert stats.files == 2
+    assert stats.written == 1
+    with gzip.open(join(instance_path, "js", "app.js.gz"), "rt") as fp:
+        assert fp.read() == "var a = 1;\n" * 200
+    # Too small to be compressed
+    assert not exists(join(instance_path, "css", "small.css.gz"))
+
+    # Sidecars newer than their file are not written again
+    assert compress_files(paths, suffixes=[".gz"]).written == 0
+
+
+def test_compress_outdated_sidecar(instance_path):
+    """Test that outdated sidecars are written again."""
+    path = join(instance_path, "app.js")
+    _write(path, "a" * 2000)
+    assert compress_file(path, suffixes=[".gz"]) == 1
+
+    _write(path, "b" * 2000)
+    stat = os.stat(path + ".gz")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert compress_file(path, level=1, suffixes=[".gz"]) == 1
+    with gzip.open(path + ".gz", "rt") as fp:
+        assert fp.read() == "b" * 2000
+
+
+def test_remove_sidecars(instance_path):
+    """Test removing the sidecars of a file."""
+    path = join(instance_path, "app.js")
+    for suffix in ("", ".gz", ".br"):
+        _write(path + suffix, "a")
+    remove_sidecars(path)
+    assert exists(path)
+    assert not exists(path + ".gz")
+    assert not exists(path + ".br")
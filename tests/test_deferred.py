@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Test the deferred output of webpack entries."""
+
+from flask import render_template_string
+
+from invenio_assets import InvenioAssets
+from invenio_assets.deferred import ENTRY_MARKER
+
+TEMPLATE = """<head>{{ assets_placeholder() }}</head>
+<body>{{ fragment|safe }}{{ webpack['search.js'] }}{{ webpack['base.css'] }}</body>"""
+
+
+def test_deferred_emission(app, manifest):
+    """Test replacing the placeholder by the tags of the page."""
+    app.config.update(ASSETS_DEFERRED_EMISSION=True, ASSETS_PRELOAD_HEADERS=True)
+    InvenioAssets(app)
+    fragments = {}
+
+    @app.route("/")
+    def index():
+        # Fragment cached by a previous request, e.g. with jinja2-fragments
+        if "base" not in fragments:
+            fragments["base"] = render_template_string("{{ webpack['base.js'] }}")
+        return render_template_string(TEMPLATE, fragment=fragments["base"])
+
+    @app.route("/inline")
+    def inline():
+        return render_template_string("{{ webpack['base.js'] }}")
+
+    client = app.test_client()
+    for _ in range(2):
+        response = client.get("/")
+        assert response.get_data(as_text=True) == (
+            "<head>"
+            '<script src="/static/dist/js/manifest.js"></script>\n'
+            '<script src="/static/dist/js/vendor.js"></script>\n'
+            '<script src="/static/dist/js/base.js"></script>\n'
+            '<script src="/static/dist/js/search.js"></script>\n'
+            '<link rel="stylesheet" href="/static/dist/css/base.css" />'
+            "</head>\n<body></body>"
+        )
+    assert fragments["base"] == ENTRY_MARKER.format("base.js")
+    # Hooks using the rendered entries run after the tags are output
+    assert len(response.headers.getlist("Link")) == 5
+
+    # Without placeholder, the markers are replaced in place
+    response = client.get("/inline")
+    assert response.get_data(as_text=True).startswith(
+        '<script src="/static/dist/js/manifest.js"></script>'
+    )
+
+
+def test_deferred_emission_unknown_entry(app, manifest):
+    """Test removing the markers of entries missing from the manifest."""
+    app.config.update(ASSETS_DEFERRED_EMISSION=True)
+    InvenioAssets(app)
+    # Fragment cached before the manifest was reloaded without the entry
+    fragment = ENTRY_MARKER.format("gone.js")
+
+    @app.route("/")
+    def index():
+        return render_template_string(TEMPLATE, fragment=fragment)
+
+    @app.route("/inline")
+    def inline():
+        return fragment + "<p></p>"
+
+    client = app.test_client()
+    response = client.get("/")
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert "gone.js" not in html
+    assert '<script src="/static/dist/js/search.js"></script>' in html
+    response = client.get("/inline")
+    assert response.status_code == 200
+    assert response.get_data(as_text=True) == "<p></p>"
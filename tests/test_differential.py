@@ -0,0 +1,165 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Test differential builds for modern and legacy browsers."""
+
+import json
+import os
+import time
+
+import pytest
+from flask import render_template_string
+from flask_webpackext import WebpackBundle
+from mock import patch
+
+from invenio_assets import InvenioAssets
+from invenio_assets.differential import (
+    browser_queries,
+    is_modern_user_agent,
+    modern_manifest_path,
+)
+from invenio_assets.webpack import InvenioWebpackBundleProject
+
+CHROME_120 = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+IE_11 = "Mozilla/5.0 (Windows NT 10.0; Trident/7.0; rv:11.0) like Gecko"
+
+
+def test_is_modern_user_agent():
+    """Test detecting the modern browsers from the user agent."""
+    browsers = {"chrome": 80, "edge": 80, "firefox": 78, "safari": 14}
+    assert is_modern_user_agent(CHROME_120, browsers)
+    assert not is_modern_user_agent(CHROME_120.replace("120.", "79."), browsers)
+    assert not is_modern_user_agent(IE_11, browsers)
+    assert is_modern_user_agent(
+        "Mozilla/5.0 (X11; Linux x86_64; rv:115.0) Gecko/20100101 Firefox/115.0",
+        browsers,
+    )
+    assert is_modern_user_agent(
+        CHROME_120 + " Edg/120.0.2210.91", {"chrome": 80, "edge": 80}
+    )
+    assert not is_modern_user_agent(CHROME_120 + " Edg/120.0.2210.91", {"chrome": 80})
+    assert not is_modern_user_agent("curl/8.0.1", browsers)
+    assert not is_modern_user_agent(None, browsers)
+    assert browser_queries({"safari": 14, "chrome": 80}) == [
+        "chrome >= 80",
+        "safari >= 14",
+    ]
+
+
+def test_build_targets(app, instance_path, fake_build):
+    """Test building a project for modern and legacy browsers."""
+    bundle_dir = os.path.join(instance_path, "bundle")
+    os.makedirs(bundle_dir)
+    project = InvenioWebpackBundleProject(
+        "invenio_assets.webpack",
+        project_folder="assets",
+        config_path="build/config.json",
+        bundles=[WebpackBundle("tests", bundle_dir, entry={"a": "./a.js"})],
+    )
+    dist_dir = os.path.join(instance_path, "dist")
+    app.config.update(
+        WEBPACKEXT_PROJECT=project,
+        WEBPACKEXT_PROJECT_DISTDIR=dist_dir,
+        ASSETS_DIFFERENTIAL_BUILD=True,
+        ASSETS_MODERN_BROWSERS={"chrome": 100},
+    )
+    InvenioAssets(app)
+
+    with app.app_context():
+        project.create()
+        fake_build(project)
+        assert project.build() == 0
+
+    manifest_path = os.path.join(dist_dir, "manifest.json")
+    for path, target in (
+        (manifest_path, "legacy"),
+        (modern_manifest_path(manifest_path), "modern"),
+    ):
+        with open(path) as fp:
+            assert json.load(fp)["chunks"]["a"][-1] == "js/a.{0}.js".format(target)
+    with open(os.path.join(project.path, "build", "config.modern.json")) as fp:
+        assert json.load(fp)["build"]["target"] == {
+            "name": "modern",
+            "browsers": ["chrome >= 100"],
+        }
+
+
+def test_differential_build_with_shards(app):
+    """Test that differential builds cannot be sharded."""
+    app.config.update(ASSETS_DIFFERENTIAL_BUILD=True, ASSETS_WEBPACK_SHARDS=2)
+    with pytest.raises(ValueError):
+        InvenioAssets(app)
+
+
+def test_modern_manifest(app, manifest):
+    """Test rendering the modern build for modern browsers."""
+    with open(manifest) as fp:
+        data = json.load(fp)
+    data["chunks"] = {"base": ["js/base.modern.js"]}
+    data["assets"] = {
+        "js/base.modern.js": {
+            "name": "js/base.modern.js",
+            "publicPath": "/static/dist/js/base.modern.js",
+        }
+    }
+    with open(modern_manifest_path(manifest), "w") as fp:
+        json.dump(data, fp)
+    app.config.update(ASSETS_DIFFERENTIAL_BUILD=True)
+    InvenioAssets(app)
+
+    @app.route("/")
+    def index():
+        return render_template_string("{{ webpack['base.js'] }}")
+
+    @app.route("/empty")
+    def empty():
+        return ""
+
+    client = app.test_client()
+    response = client.get("/", headers={"User-Agent": CHROME_120})
+    assert response.get_data(as_text=True) == (
+        '<script src="/static/dist/js/base.modern.js"></script>'
+    )
+    assert response.headers["Vary"] == "User-Agent"
+    response = client.get("/", headers={"User-Agent": IE_11})
+    assert response.get_data(as_text=True).startswith(
+        '<script src="/static/dist/js/manifest.js"></script>'
+    )
+    assert "Vary" not in client.get("/empty").headers
+
+
+@pytest.mark.parametrize("reload_interval", [None, 3600])
+def test_missing_modern_manifest(app, manifest, reload_interval):
+    """Test that a missing modern manifest is only checked once per interval."""
+    app.config.update(
+        ASSETS_DIFFERENTIAL_BUILD=True,
+        ASSETS_MANIFEST_RELOAD_INTERVAL=reload_interval,
+    )
+    InvenioAssets(app)
+    app.add_url_rule(
+        "/", "index", lambda: render_template_string("{{ webpack['base.js'] }}")
+    )
+
+    client = app.test_client()
+    with patch("invenio_assets.webpack.os.path.exists", wraps=os.path.exists) as exists:
+        for _ in range(3):
+            response = client.get("/", headers={"User-Agent": CHROME_120})
+            assert "js/base.js" in response.get_data(as_text=True)
+        modern_checks = [
+            call
+            for call in exists.call_args_list
+            if call.args[0] == modern_manifest_path(manifest)
+        ]
+        assert len(modern_checks) == 1
+
+        if reload_interval:
+            # Checked again after the interval
+            with patch(
+                "invenio_assets.webpack.time.monotonic",
+                return_value=time.monotonic() + reload_interval,
+            ):
+                client.get("/", headers={"User-Agent": CHROME_120})
+            assert exists.call_args_list[-1].args[0] == modern_manifest_path(manifest)
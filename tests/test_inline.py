@@ -0,0 +1,98 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Test the inlining of small chunks."""
+
+import os
+
+import pytest
+from flask import request
+from flask_webpackext import current_manifest
+
+from invenio_assets import InvenioAssets
+from invenio_assets.inline import inline_tag, nonce_tag
+from invenio_assets.preload import preload_links
+
+
+@pytest.fixture()
+def chunks(app, manifest):
+    """Write the chunks of the manifest in the static folder."""
+    dist_dir = os.path.dirname(manifest)
+    contents = {
+        "js/manifest.js": "var runtime;\n//# sourceMappingURL=manifest.js.map",
+        "js/vendor.js": "var vendor;" * 100,
+        "js/base.js": "var html = '</script>';",
+        "js/search.js": "var search;",
+        "js/deposit.js": "var deposit;",
+        "css/base.css": "body{color:red}",
+    }
+    for relpath, content in contents.items():
+        filepath = os.path.join(dist_dir, relpath)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, "w") as fp:
+            fp.write(content)
+    return contents
+
+
+def test_inline_tag():
+    """Test rendering the inline tag of a chunk."""
+    assert inline_tag("/a.js", "var a;") == "<script>var a;</script>"
+    assert inline_tag("/a.css", "a{}") == "<style>a{}</style>"
+    assert inline_tag("/a.js", "a = '</SCRIPT>'") is None
+    assert inline_tag("/a.css", "a{background:url(a.png)}") is None
+    assert inline_tag("/a.svg", "<svg/>") is None
+    assert inline_tag("/dist/a.js", "//# sourceMappingURL=a.js.map") == (
+        "<script>//# sourceMappingURL=/dist/a.js.map</script>"
+    )
+    assert nonce_tag("<script>var a = '<b>';</script>", 'a"b') == (
+        "<script nonce=\"a&#34;b\">var a = '<b>';</script>"
+    )
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_inline_chunks(app, chunks, compiled):
+    """Test outputting the small chunks inline, once per page."""
+    app.config.update(
+        ASSETS_INLINE_CHUNK_MAX_SIZE=1024, ASSETS_MANIFEST_COMPILED=compiled
+    )
+    InvenioAssets(app)
+
+    with app.test_request_context():
+        base = current_manifest["base.js"]
+        assert base.inlined == {"/static/dist/js/manifest.js"}
+        # Computed once, not on every render
+        assert base.inlined is base.inlined
+        assert base.__html__() == (
+            "<script>var runtime;\n"
+            "//# sourceMappingURL=/static/dist/js/manifest.js.map</script>\n"
+            '<script src="/static/dist/js/vendor.js"></script>\n'
+            '<script src="/static/dist/js/base.js"></script>'
+        )
+        assert current_manifest["base.css"].__html__() == (
+            "<style>body{color:red}</style>"
+        )
+        assert current_manifest["search.js"].__html__() == (
+            "<script>var search;</script>"
+        )
+        assert preload_links([current_manifest["deposit.js"]]) == []
+
+
+def test_inline_csp_nonce(app, chunks):
+    """Test adding the CSP nonce of the request to the inline tags."""
+    app.config.update(
+        ASSETS_INLINE_CHUNK_MAX_SIZE=1024,
+        ASSETS_INLINE_CSP_NONCE="invenio_assets.inline:request_csp_nonce",
+    )
+    InvenioAssets(app)
+
+    for nonce in ("n1", "n2"):
+        with app.test_request_context():
+            request.csp_nonce = nonce
+            html = current_manifest["base.js"].__html__()
+            assert html.startswith('<script nonce="{0}">var runtime;'.format(nonce))
+            assert '<script src="/static/dist/js/vendor.js"></script>' in html
+            assert current_manifest["base.css"].__html__() == (
+                '<style nonce="{0}">body{{color:red}}</style>'.format(nonce)
+            )
+    with app.test_request_context():
+        assert "nonce" not in current_manifest["search.js"].__html__()
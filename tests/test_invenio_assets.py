@@ -3,6 +3,11 @@
 
 """Test Invenio Assets module."""
 
+import json
+from os import makedirs
+from os.path import join
+
+import pytest
 from mock import patch
 from pywebpack.storage import FileStorage, LinkStorage
 
@@ -44,6 +49,7 @@ def test_init_cli(app):
 
     cli._load_plugin_commands()
     assert "collect" in cli.commands
+    assert "assets" in cli.commands
     assert "webpack" in cli.commands
 
 
@@ -53,3 +59,53 @@ def test_init_debug(app):
     InvenioAssets(app)
     # Storage class changed to LinkStorage when in debug mode.
     assert app.config["WEBPACKEXT_STORAGE_CLS"] != FileStorage
+
+
+def test_url_for_fingerprint(app):
+    """Test URLs of fingerprinted static files and their cache headers."""
+    app.config["ASSETS_FINGERPRINT"] = True
+    assets = InvenioAssets(app)
+    makedirs(app.static_folder)
+    with open(app.config["ASSETS_FINGERPRINT_MANIFEST"], "w") as fp:
+        json.dump({"test.css": "test.0123abcd.css"}, fp)
+    for name in ("test.css", "test.0123abcd.css"):
+        with open(join(app.static_folder, name), "w") as fp:
+            fp.write("* {color: white;}")
+
+    with app.test_request_context():
+        assert assets.url_for("test.css") == "/static/test.0123abcd.css"
+        assert assets.url_for("other.css") == "/static/other.css"
+        assert app.jinja_env.from_string(
+            "{{ assets_url_for('test.css') }}"
+        ).render() == ("/static/test.0123abcd.css")
+
+    with app.test_client() as client:
+        res = client.get("/static/test.0123abcd.css")
+        assert res.cache_control.immutable
+        assert res.cache_control.max_age == 31536000
+        res = client.get("/static/test.css")
+        assert not res.cache_control.immutable
+
+
+def test_url_for_without_fingerprint(app):
+    """Test URLs of static files when fingerprinting is disabled."""
+    assets = InvenioAssets(app)
+    with app.test_request_context():
+        assert assets.url_for("test.css") == "/static/test.css"
+
+
+def test_init_bundler(app):
+    """Test selecting the bundler."""
+    app.config["ASSETS_BUNDLER"] = "rspack"
+    InvenioAssets(app)
+    assert app.config["WEBPACKEXT_PROJECT"] == "invenio_assets.webpack:rspack_project"
+    with app.app_context():
+        project = app.extensions["flask-webpackext"].project
+        assert project.package_json_source_path.endswith("rspack-package.json")
+
+
+def test_init_invalid_bundler(app):
+    """Test that an invalid bundler is rejected."""
+    app.config["ASSETS_BUNDLER"] = "parcel"
+    with pytest.raises(ValueError):
+        InvenioAssets(app)
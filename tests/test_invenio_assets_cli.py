@@ -3,12 +3,30 @@
 
 """Test Invenio Assets module."""
 
-from os.path import exists, isfile, join
+import json
+import os
+import re
+from functools import partial
+from importlib.metadata import EntryPoint
+from os.path import exists, isfile, islink, join
 from time import sleep
 
+import pytest
 from click.testing import CliRunner
+from flask import current_app
+from flask.cli import ScriptInfo
+from flask_webpackext import WebpackBundle
+from mock import patch
+from pywebpack.storage import LinkStorage
 
-from invenio_assets.cli import collect
+from invenio_assets import InvenioAssets
+from invenio_assets.cli import assets, collect
+from invenio_assets.webpack import (
+    BundleRegistry,
+    InvenioWebpackBundleProject,
+    rspack_project,
+    webpack_project,
+)
 
 
 def test_collect(app, script_info_assets, testcss):
@@ -36,3 +54,265 @@ def test_collect(app, script_info_assets, testcss):
     result = runner.invoke(collect, ["-v"], obj=script_info_assets)
     assert result.exit_code == 0
     assert "Copied" in result.output
+
+
+def test_collect_jobs(app, script_info_assets, static_dir, testcss):
+    """Test collecting files with several threads."""
+    for i in range(20):
+        with open(join(static_dir, "file{0}.js".format(i)), "w") as fp:
+            fp.write("var i = {0};".format(i))
+
+    runner = CliRunner()
+    result = runner.invoke(collect, ["-v", "--jobs", "4"], obj=script_info_assets)
+    assert result.exit_code == 0
+    assert "Collected 21 files (21 changed, 0 removed)" in result.output
+    for i in range(20):
+        assert isfile(
+            join(app.extensions["collect"].static_root, "file{0}.js".format(i))
+        )
+
+    result = runner.invoke(collect, ["--jobs", "4"], obj=script_info_assets)
+    assert result.exit_code == 0
+    assert "Collected 21 files (0 changed, 0 removed)" in result.output
+
+
+def test_collect_incremental(app, script_info_assets, static_dir, testcss):
+    """Test that unchanged files are skipped and deleted files removed."""
+    app.config["ASSETS_COLLECT_INCREMENTAL"] = True
+    static_root = app.extensions["collect"].static_root
+    js_path = join(static_dir, "app.js")
+    with open(js_path, "w") as fp:
+        fp.write("var a = 1;")
+
+    runner = CliRunner()
+    result = runner.invoke(collect, [], obj=script_info_assets)
+    assert "Collected 2 files (2 changed, 0 removed)" in result.output
+    # The state file is not served
+    assert isfile(join(app.instance_path, "collect-state.json"))
+    assert not exists(join(static_root, ".collect-state.json"))
+
+    # Touched files with the same content are not copied again
+    stat = os.stat(js_path)
+    os.utime(js_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    result = runner.invoke(collect, [], obj=script_info_assets)
+    assert "Collected 2 files (0 changed, 0 removed)" in result.output
+
+    # Deleted files are removed
+    os.remove(js_path)
+    result = runner.invoke(collect, ["-v"], obj=script_info_assets)
+    assert "Removed: 'app.js'" in result.output
+    assert "Collected 1 files (0 changed, 1 removed)" in result.output
+    assert not exists(join(static_root, "app.js"))
+
+    # Full collection copies all files again
+    result = runner.invoke(collect, ["--full"], obj=script_info_assets)
+    assert "Collected 1 files (1 changed, 0 removed)" in result.output
+
+
+def test_collect_without_state(app, script_info_assets, testcss):
+    """Test that incremental collection is disabled by default."""
+    runner = CliRunner()
+    result = runner.invoke(collect, [], obj=script_info_assets)
+    assert "Collected 1 files (1 changed, 0 removed)" in result.output
+    assert not exists(app.config["ASSETS_COLLECT_STATE_PATH"])
+
+
+def test_collect_fingerprint(app, script_info_assets, testcss):
+    """Test writing fingerprinted copies of the collected files."""
+    app.config["ASSETS_FINGERPRINT"] = True
+    static_root = app.extensions["collect"].static_root
+    runner = CliRunner()
+    result = runner.invoke(collect, [], obj=script_info_assets)
+    assert "Wrote 1 fingerprinted files." in result.output
+
+    with open(app.config["ASSETS_FINGERPRINT_MANIFEST"]) as fp:
+        fingerprints = json.load(fp)
+    name = fingerprints["test.css"]
+    assert re.match(r"^test\.[0-9a-f]{8}\.css$", name)
+    with open(join(static_root, name)) as fp:
+        assert fp.read() == "* {color: white;}"
+
+    # Unchanged files are not written again
+    result = runner.invoke(collect, [], obj=script_info_assets)
+    assert "Wrote 0 fingerprinted files." in result.output
+
+    # Changed files get a new copy, and the previous one is kept
+    with open(testcss, "w") as fp:
+        fp.write("* {color: black;}")
+    result = runner.invoke(collect, [], obj=script_info_assets)
+    assert "Wrote 1 fingerprinted files." in result.output
+    with open(app.config["ASSETS_FINGERPRINT_MANIFEST"]) as fp:
+        new_name = json.load(fp)["test.css"]
+    assert new_name != name
+    assert isfile(join(static_root, name))
+
+    # Copies of removed files are removed, with their sidecars
+    open(join(static_root, new_name + ".gz"), "w").close()
+    os.remove(testcss)
+    result = runner.invoke(collect, [], obj=script_info_assets)
+    assert not exists(join(static_root, new_name))
+    assert not exists(join(static_root, new_name + ".gz"))
+
+
+def test_collect_compress(app, script_info_assets, static_dir, testcss):
+    """Test writing compressed sidecars of the collected files."""
+    app.config.update(
+        ASSETS_COMPRESS=True,
+        ASSETS_COMPRESS_MIN_SIZE=0,
+        ASSETS_COLLECT_INCREMENTAL=True,
+    )
+    result = CliRunner().invoke(collect, [], obj=script_info_assets)
+    assert "Compressed 1 files" in result.output
+    sidecar = join(app.extensions["collect"].static_root, "test.css.gz")
+    assert isfile(sidecar)
+
+    # Sidecars of removed files are removed
+    os.remove(testcss)
+    result = CliRunner().invoke(collect, [], obj=script_info_assets)
+    assert not exists(sidecar)
+
+
+def test_collect_link(app, script_info_assets, testcss):
+    """Test collecting files with the link storage."""
+    app.extensions["collect"].storage = "flask_collect.storage.link"
+    css_path = join(app.extensions["collect"].static_root, "test.css")
+
+    runner = CliRunner()
+    result = runner.invoke(collect, ["-v", "-j", "2"], obj=script_info_assets)
+    assert result.exit_code == 0
+    assert islink(css_path)
+    assert "conftest:test.css symbolink link created" in result.output
+
+    result = runner.invoke(collect, ["-v", "-j", "2"], obj=script_info_assets)
+    assert "symbolink link created" not in result.output
+
+
+def test_collect_other_storage(app, script_info_assets):
+    """Test that other storages are run as is."""
+    app.extensions["collect"].storage = "flask_collect.storage.test"
+    result = CliRunner().invoke(collect, [], obj=script_info_assets)
+    assert result.exit_code == 0
+    assert "Collected" not in result.output
+
+
+@pytest.mark.parametrize("debug", [False, True])
+def test_assets_profile(app, instance_path, debug):
+    """Test the summary of a build profile."""
+    if debug:
+        # The storage of debug mode links directories
+        app.config["WEBPACKEXT_STORAGE_CLS"] = partial(LinkStorage, depth=2)
+    bundle_dir = join(instance_path, "bundle")
+    os.makedirs(join(bundle_dir, "js", "my_package"))
+    with open(join(bundle_dir, "js", "my_package", "app.js"), "w") as fp:
+        fp.write("app")
+    bundle = WebpackBundle("tests", bundle_dir, entry={"app": "./js/my_package/app.js"})
+    registry = BundleRegistry("test")
+    registry._bundles = [(EntryPoint("app", "my_package.bundles:app", "test"), bundle)]
+    project = InvenioWebpackBundleProject(
+        "invenio_assets.webpack",
+        project_folder="assets",
+        config_path="build/config.json",
+        bundles=registry,
+    )
+    profile_path = join(instance_path, "profile.json")
+    app.config.update(WEBPACKEXT_PROJECT=project)
+    InvenioAssets(app)
+    script_info = ScriptInfo(create_app=lambda: app)
+
+    runner = CliRunner()
+    result = runner.invoke(assets, ["profile", "-p", profile_path], obj=script_info)
+    assert result.exit_code != 0
+    assert "No build profile found" in result.output
+
+    with open(profile_path, "w") as fp:
+        json.dump(
+            {
+                "time": 4000,
+                "modules": {
+                    "js/my_package/app.js": {
+                        "time": 1500,
+                        "loaders": ["babel-loader"],
+                    },
+                    "node_modules/@babel/runtime/helpers.js": {
+                        "time": 500,
+                        "loaders": [],
+                    },
+                },
+                "loaders": {"babel-loader": 1500, "(none)": 500},
+                "plugins": {"TerserPlugin": 2000},
+                "entries": {"app": {"files": ["js/app.js"], "size": 2048}},
+            },
+            fp,
+        )
+    result = runner.invoke(assets, ["profile", "-p", profile_path], obj=script_info)
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert lines[0] == "Build time: 4.0s"
+    assert lines[3].split() == ["my_package", "1.5", "1", "2.0"]
+    assert lines[4].split() == ["npm:@babel/runtime", "0.5", "1", "0.0"]
+    assert "TerserPlugin" in result.output
+    assert "js/my_package/app.js" in result.output
+
+
+def test_assets_compare(app, instance_path):
+    """Test comparing the builds of several bundlers."""
+    InvenioAssets(app)
+    script_info = ScriptInfo(create_app=lambda: app)
+
+    def buildall(project):
+        # Each bundler is run in its own process and directories
+        assert (
+            project
+            is {"webpack": webpack_project, "rspack": rspack_project}[
+                os.path.basename(
+                    os.path.dirname(current_app.config["WEBPACKEXT_PROJECT_DISTDIR"])
+                )
+            ]
+        )
+        distdir = current_app.config["WEBPACKEXT_PROJECT_DISTDIR"]
+        os.makedirs(join(distdir, "js"), exist_ok=True)
+        chunks = {"app": ["js/app.js"]}
+        size = 1024
+        if project is rspack_project:
+            chunks["extra"] = ["js/app.js"]
+            size = 512
+        with open(join(distdir, "js", "app.js"), "w") as fp:
+            fp.write("x" * size)
+        with open(join(distdir, "manifest.json"), "w") as fp:
+            assets = {"js/app.js": {"name": "js/app.js"}}
+            json.dump({"status": "done", "chunks": chunks, "assets": assets}, fp)
+
+    output_dir = join(instance_path, "compare")
+    runner = CliRunner()
+    with patch.object(InvenioWebpackBundleProject, "buildall", buildall):
+        result = runner.invoke(
+            assets, ["compare", "-o", output_dir, "-b", "webpack"], obj=script_info
+        )
+        assert result.exit_code == 0, result.output
+        assert "webpack (kB)" in result.output
+        assert "rspack" not in result.output
+
+        result = runner.invoke(assets, ["compare", "-o", output_dir], obj=script_info)
+    assert result.exit_code != 0
+    lines = result.output.splitlines()
+    assert [line.split()[0] for line in lines[2:4]] == ["webpack", "rspack"]
+    assert lines[6].split() == ["app", "1.0", "0.5", "-50.0%"]
+    assert lines[7].split() == ["extra", "missing", "0.5"]
+    assert "The builds do not have the same entries." in result.output
+
+
+def test_assets_compare_failed_build(app, instance_path):
+    """Test comparing builds when a build fails."""
+    InvenioAssets(app)
+    script_info = ScriptInfo(create_app=lambda: app)
+    with patch.object(
+        InvenioWebpackBundleProject, "buildall", side_effect=RuntimeError
+    ):
+        result = CliRunner().invoke(
+            assets,
+            ["compare", "-o", join(instance_path, "compare"), "-b", "rspack"],
+            obj=script_info,
+        )
+    assert result.exit_code != 0
+    assert "failed" in result.output
+    assert "Some builds failed." in result.output
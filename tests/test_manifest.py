@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Test compiled manifest module."""
+
+import os
+
+import pytest
+from flask_webpackext import current_manifest
+from flask_webpackext.errors import ManifestKeyNotFoundError
+
+from invenio_assets import InvenioAssets
+from invenio_assets.manifest import (
+    CompiledManifest,
+    CompiledManifestLoader,
+    InvalidCompiledManifestError,
+)
+from invenio_assets.webpack import UniqueJinjaManifestLoader, webpack_project
+
+
+def test_compiled_manifest_loader(app, manifest):
+    """Test loading of a compiled manifest."""
+    compiled = os.path.splitext(manifest)[0] + ".bin"
+    with app.app_context():
+        expected = UniqueJinjaManifestLoader().parse(manifest)
+        loaded = CompiledManifestLoader().parse(manifest)
+    assert os.path.exists(compiled)
+    assert isinstance(loaded, CompiledManifest)
+
+    assert [e.name for e in loaded] == sorted(e.name for e in expected)
+    for entry in expected:
+        # Chunk IDs are specific to each manifest
+        assert [c[1:] for c in loaded[entry.name]._chunks] == [
+            c[1:] for c in entry._chunks
+        ]
+    # Entries are only created once
+    assert loaded["base.js"] is loaded["base.js"]
+    pytest.raises(ManifestKeyNotFoundError, loaded.__getitem__, "missing.js")
+    pytest.raises(ManifestKeyNotFoundError, getattr, loaded, "missing")
+
+    # Outdated compiled manifest is rejected
+    stat = os.stat(manifest)
+    os.utime(manifest, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    pytest.raises(
+        InvalidCompiledManifestError, CompiledManifest.open, compiled, os.stat(manifest)
+    )
+
+
+def test_compiled_manifest_invalid_file(app, manifest):
+    """Test that invalid compiled manifests are compiled again."""
+    compiled = os.path.splitext(manifest)[0] + ".bin"
+    open(compiled, "w").close()
+    pytest.raises(
+        InvalidCompiledManifestError, CompiledManifest.open, compiled, os.stat(manifest)
+    )
+    with app.app_context():
+        loaded = CompiledManifestLoader().parse(manifest)
+    assert len(list(loaded)) == 4
+
+
+def test_compiled_manifest_config(app, manifest):
+    """Test the compiled manifest configuration."""
+    app.config["ASSETS_MANIFEST_COMPILED"] = True
+    InvenioAssets(app)
+    with app.test_request_context():
+        assert isinstance(current_manifest._get_current_object(), CompiledManifest)
+        assert current_manifest["deposit.js"].__html__() == (
+            '<script src="/static/dist/js/manifest.js"></script>\n'
+            '<script src="/static/dist/js/deposit.js"></script>'
+        )
+
+
+def test_compiled_manifest_read_only(app, manifest, monkeypatch):
+    """Test falling back to the JSON manifest if it cannot be compiled."""
+
+    def compile_manifest(*args, **kwargs):
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr("invenio_assets.manifest.compile_manifest", compile_manifest)
+    with app.app_context():
+        loaded = CompiledManifestLoader().parse(manifest)
+    assert not isinstance(loaded, CompiledManifest)
+    assert len(list(loaded)) == 4
+
+
+def test_compile_manifests_after_build(app, manifest):
+    """Test compiling the manifest after a build."""
+    app.config["ASSETS_MANIFEST_COMPILED"] = True
+    InvenioAssets(app)
+    with app.app_context():
+        webpack_project._compile_manifests()
+    assert os.path.exists(os.path.splitext(manifest)[0] + ".bin")
@@ -0,0 +1,103 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Test the render signals and the metrics sinks."""
+
+import pytest
+from flask import render_template_string
+
+from invenio_assets import InvenioAssets
+from invenio_assets.metrics import (
+    MemoryMetricsSink,
+    MetricsSink,
+    PrometheusMetricsSink,
+)
+from invenio_assets.signals import entry_rendered, manifest_loaded
+
+TEMPLATE = "{{ webpack['base.js'] }}{{ webpack['search.js'] }}"
+
+
+def test_signals(app, manifest):
+    """Test the signals sent while rendering entries."""
+    InvenioAssets(app)
+    app.add_url_rule("/", "index", lambda: render_template_string(TEMPLATE))
+
+    entries, loads = [], []
+
+    def on_entry(sender, **kwargs):
+        entries.append((sender, kwargs.pop("seconds") >= 0, kwargs))
+
+    def on_load(sender, **kwargs):
+        loads.append((sender, kwargs["filepath"], kwargs["reload"]))
+
+    with entry_rendered.connected_to(on_entry), manifest_loaded.connected_to(on_load):
+        assert app.test_client().get("/").status_code == 200
+
+    assert loads == [(app, manifest, False)]
+    assert entries == [
+        (app, True, {"entry": "base.js", "emitted": 3, "deduplicated": 0}),
+        (app, True, {"entry": "search.js", "emitted": 1, "deduplicated": 2}),
+    ]
+
+    # No signals are sent without receivers
+    assert app.test_client().get("/").status_code == 200
+    assert len(entries) == 2
+
+
+def test_metrics_sink(app, manifest):
+    """Test recording the metrics in a sink."""
+    app.config["ASSETS_METRICS_SINK"] = "invenio_assets.metrics:MemoryMetricsSink"
+    ext = InvenioAssets(app)
+    sink = ext.metrics_sink
+    assert isinstance(sink, MemoryMetricsSink)
+    app.add_url_rule("/", "index", lambda: render_template_string(TEMPLATE))
+
+    client = app.test_client()
+    for _ in range(2):
+        assert client.get("/").status_code == 200
+    assert sink.counters == {
+        ("assets_entries_rendered_total", ()): 4,
+        ("assets_chunks_emitted_total", ()): 8,
+        ("assets_chunks_deduplicated_total", ()): 4,
+    }
+    assert sink.observations[("assets_render_seconds", ())][0] == 2
+    assert (
+        sink.observations[("assets_manifest_load_seconds", (("reload", "false"),))][0]
+        == 1
+    )
+
+    sink.disconnect(app)
+    assert client.get("/").status_code == 200
+    assert sink.counters[("assets_entries_rendered_total", ())] == 4
+
+
+def test_prometheus_metrics_sink(app, manifest):
+    """Test recording the metrics in Prometheus."""
+    prometheus_client = pytest.importorskip("prometheus_client")
+    registry = prometheus_client.CollectorRegistry()
+    app.config["ASSETS_METRICS_SINK"] = PrometheusMetricsSink(registry=registry)
+    InvenioAssets(app)
+    app.add_url_rule("/", "index", lambda: render_template_string(TEMPLATE))
+    assert app.test_client().get("/").status_code == 200
+
+    assert registry.get_sample_value("assets_entries_rendered_total") == 2
+    assert registry.get_sample_value("assets_chunks_emitted_total") == 4
+    assert registry.get_sample_value("assets_render_seconds_count") == 1
+    assert (
+        registry.get_sample_value(
+            "assets_manifest_load_seconds_count", {"reload": "false"}
+        )
+        == 1
+    )
+
+    # Sinks of other applications share the metrics of the registry
+    assert PrometheusMetricsSink(registry=registry).metrics == (
+        app.extensions["invenio-assets"].metrics_sink.metrics
+    )
+    assert PrometheusMetricsSink().metrics is PrometheusMetricsSink().metrics
+
+
+def test_metrics_sink_abstract():
+    """Test that sinks implement the recording methods."""
+    with pytest.raises(TypeError):
+        MetricsSink()
@@ -0,0 +1,116 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Test the preload headers and Early Hints."""
+
+import json
+import os
+
+from flask import render_template_string
+
+from invenio_assets import InvenioAssets
+from invenio_assets.preload import preload_links
+from invenio_assets.webpack import UniqueJinjaManifestEntry
+
+TEMPLATE = "{{ webpack['base.js'] }}{{ webpack['search.js'] }}"
+
+
+def test_preload_links():
+    """Test the links of the chunks of entries."""
+    entries = [
+        UniqueJinjaManifestEntry("a.js", ["/a.js", "/vendor.js"]),
+        UniqueJinjaManifestEntry("b.js", ["/vendor.js", "/b.js"]),
+        UniqueJinjaManifestEntry("b.css", ["/b.css"]),
+    ]
+    assert preload_links(entries) == [
+        "</a.js>; rel=preload; as=script",
+        "</vendor.js>; rel=preload; as=script",
+        "</b.js>; rel=preload; as=script",
+        "</b.css>; rel=preload; as=style",
+    ]
+
+
+def test_preload_headers(app, manifest):
+    """Test the preload headers of the responses."""
+    app.config["ASSETS_PRELOAD_HEADERS"] = True
+    InvenioAssets(app)
+    app.add_url_rule("/", "index", lambda: render_template_string(TEMPLATE))
+    app.add_url_rule("/plain", "plain", lambda: "plain")
+
+    client = app.test_client()
+    assert client.get("/").headers.getlist("Link") == [
+        "</static/dist/js/manifest.js>; rel=preload; as=script",
+        "</static/dist/js/vendor.js>; rel=preload; as=script",
+        "</static/dist/js/base.js>; rel=preload; as=script",
+        "</static/dist/js/search.js>; rel=preload; as=script",
+    ]
+    assert client.get("/plain").headers.getlist("Link") == []
+
+
+def test_preload_headers_reload(app, manifest):
+    """Test skipping the entries removed by a reload during the request."""
+    app.config.update(ASSETS_PRELOAD_HEADERS=True, ASSETS_MANIFEST_RELOAD_INTERVAL=0)
+    InvenioAssets(app)
+
+    @app.route("/")
+    def index():
+        html = render_template_string(TEMPLATE)
+        # A new build without the search entry is deployed
+        with open(manifest) as fp:
+            data = json.load(fp)
+        del data["chunks"]["search"]
+        with open(manifest + ".tmp", "w") as fp:
+            json.dump(data, fp)
+        os.replace(manifest + ".tmp", manifest)
+        return html
+
+    response = app.test_client().get("/")
+    assert response.status_code == 200
+    assert response.headers.getlist("Link") == [
+        "</static/dist/js/manifest.js>; rel=preload; as=script",
+        "</static/dist/js/vendor.js>; rel=preload; as=script",
+        "</static/dist/js/base.js>; rel=preload; as=script",
+    ]
+
+
+def test_early_hints(app, manifest):
+    """Test sending the links learned from a previous request."""
+    hints = []
+    app.config.update(
+        ASSETS_EARLY_HINTS=True,
+        ASSETS_EARLY_HINTS_HANDLER=hints.append,
+    )
+    InvenioAssets(app)
+    app.add_url_rule("/", "index", lambda: render_template_string(TEMPLATE))
+
+    client = app.test_client()
+    response = client.get("/")
+    assert hints == []
+    # Preload headers are disabled
+    assert response.headers.getlist("Link") == []
+
+    client.get("/")
+    assert len(hints) == 1
+    assert hints[0][0] == "</static/dist/js/manifest.js>; rel=preload; as=script"
+
+
+def test_early_hints_wsgi(app, manifest):
+    """Test the default Early Hints handler."""
+    app.config["ASSETS_EARLY_HINTS"] = True
+    InvenioAssets(app)
+    app.add_url_rule("/", "index", lambda: render_template_string(TEMPLATE))
+
+    sent = []
+    client = app.test_client()
+    for _ in range(2):
+        client.get("/", environ_base={"wsgi.early_hints": sent.append})
+    assert sent == [
+        [
+            ("Link", "</static/dist/js/manifest.js>; rel=preload; as=script"),
+            ("Link", "</static/dist/js/vendor.js>; rel=preload; as=script"),
+            ("Link", "</static/dist/js/base.js>; rel=preload; as=script"),
+            ("Link", "</static/dist/js/search.js>; rel=preload; as=script"),
+        ]
+    ]
+    # Servers without Early Hints are supported
+    assert client.get("/").status_code == 200
@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Test the build presets."""
+
+import pytest
+
+from invenio_assets import InvenioAssets
+from invenio_assets.presets import BUILD_PRESETS, preset_config, preset_dependencies
+from invenio_assets.webpack import invenio_config, webpack_project
+
+
+def test_preset_config():
+    """Test getting the configuration of a build preset."""
+    assert preset_config("ci-fast", BUILD_PRESETS) == dict(
+        BUILD_PRESETS["ci-fast"], name="ci-fast"
+    )
+    assert preset_config("quick", {"quick": {"sourceMap": False}}) == {
+        "name": "quick",
+        "transpiler": "babel",
+        "minifier": "terser",
+        "sourceMap": False,
+        "targets": None,
+    }
+    with pytest.raises(ValueError):
+        preset_config("unknown", BUILD_PRESETS)
+    with pytest.raises(ValueError):
+        preset_config("quick", {"quick": {"transpiler": "tsc"}})
+    with pytest.raises(ValueError):
+        preset_config("quick", {"quick": {"minifier": "uglify"}})
+
+
+def test_build_preset(app):
+    """Test writing the build preset in the webpack config."""
+    InvenioAssets(app)
+    with app.app_context():
+        assert invenio_config()["build"]["preset"] is False
+        app.config["ASSETS_BUILD_PRESET"] = "dev"
+        preset = invenio_config()["build"]["preset"]
+        assert preset["name"] == "dev"
+        assert preset["minifier"] is None
+
+
+def test_build_preset_dependencies(app):
+    """Test installing the tools of the build preset only."""
+    assert preset_dependencies(preset_config("production", BUILD_PRESETS)) == {}
+    assert set(preset_dependencies(preset_config("ci-fast", BUILD_PRESETS))) == {
+        "esbuild",
+        "esbuild-loader",
+    }
+    InvenioAssets(app)
+    with app.app_context():
+        assert "esbuild" not in webpack_project.package_json["devDependencies"]
+        app.config["ASSETS_BUILD_PRESET"] = "ci-fast"
+        dependencies = webpack_project.package_json["devDependencies"]
+        assert dependencies["esbuild-loader"] == "^4.0.0"
+        assert "babel-loader" in dependencies
+
+        # thread-loader is only installed for babel worker processes
+        app.config["ASSETS_WEBPACK_BABEL_WORKERS"] = 2
+        assert "thread-loader" not in webpack_project.package_json["devDependencies"]
+        app.config["ASSETS_BUILD_PRESET"] = None
+        dependencies = webpack_project.package_json["devDependencies"]
+        assert dependencies["thread-loader"] == "^4.0.0"
+        app.config["ASSETS_WEBPACK_BABEL_WORKERS"] = 0
+        assert "thread-loader" not in webpack_project.package_json["devDependencies"]
+
+
+def test_unknown_build_preset(app):
+    """Test that unknown build presets are rejected."""
+    app.config.update(ASSETS_BUILD_PRESET="fast")
+    with pytest.raises(ValueError):
+        InvenioAssets(app)
@@ -0,0 +1,174 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Test selective rebuilds."""
+
+import json
+import os
+from functools import partial
+from importlib.metadata import EntryPoint
+
+import pytest
+from click.testing import CliRunner
+from flask_webpackext import WebpackBundle
+from pywebpack.storage import LinkStorage
+
+from invenio_assets import InvenioAssets
+from invenio_assets.cli import rebuild
+from invenio_assets.rebuild import RebuildError, affected_entries, patch_manifest
+from invenio_assets.webpack import BundleRegistry, InvenioWebpackBundleProject
+
+
+@pytest.fixture()
+def project(app, instance_path):
+    """Project with the bundles of two packages."""
+    registry = BundleRegistry("test")
+    registry._bundles = []
+    for package, entries in (("search_ui", ("search",)), ("deposit_ui", ("a", "b"))):
+        bundle_dir = os.path.join(instance_path, package)
+        os.makedirs(os.path.join(bundle_dir, "js", package))
+        with open(os.path.join(bundle_dir, "js", package, "index.js"), "w") as fp:
+            fp.write("")
+        bundle = WebpackBundle(
+            "tests",
+            bundle_dir,
+            entry={name: "./js/{0}/index.js".format(package) for name in entries},
+        )
+        ep = EntryPoint(
+            name=package.split("_")[0],
+            value="{0}.webpack:bundle".format(package),
+            group="test",
+        )
+        registry._bundles.append((ep, bundle))
+
+    project = InvenioWebpackBundleProject(
+        "invenio_assets.webpack",
+        project_folder="assets",
+        config_path="build/config.json",
+        bundles=registry,
+    )
+    app.config.update(
+        WEBPACKEXT_PROJECT=project,
+        WEBPACKEXT_PROJECT_DISTDIR=os.path.join(instance_path, "dist"),
+    )
+    InvenioAssets(app)
+    return project
+
+
+@pytest.mark.parametrize("debug", [False, True])
+def test_affected_entries(app, project, instance_path, debug):
+    """Test mapping changes to the affected entries."""
+    if debug:
+        # The storage of debug mode links directories
+        app.config["WEBPACKEXT_STORAGE_CLS"] = partial(LinkStorage, depth=2)
+    with app.app_context():
+        source = os.path.join(instance_path, "search_ui", "js", "search_ui", "x.js")
+        assert affected_entries(project, [source]) == ["search"]
+        assert affected_entries(project, ["js/deposit_ui/index.js"]) == ["a", "b"]
+        assert affected_entries(
+            project, [os.path.join(project.project_path, "js/deposit_ui/index.js")]
+        ) == ["a", "b"]
+        assert affected_entries(project, ["deposit_ui"]) == ["a", "b"]
+        assert affected_entries(project, ["search", "deposit"]) == [
+            "a",
+            "b",
+            "search",
+        ]
+
+        with pytest.raises(RebuildError):
+            affected_entries(project, ["js/other/index.js"])
+        # Files of the template need a full build
+        with pytest.raises(RebuildError):
+            affected_entries(project, ["build/webpack.config.js"])
+
+
+def test_patch_manifest():
+    """Test patching the manifest of a full build."""
+    manifest = {
+        "status": "done",
+        "chunks": {"a": ["js/vendor.js", "js/a.js"], "b": ["js/b.js"]},
+        "assets": {name: {"name": name} for name in ("js/vendor.js", "js/a.js")},
+        "publicPath": "/static/dist/",
+    }
+    manifest["assets"]["js/b.js"] = {"name": "js/b.js"}
+    partial = {
+        "status": "done",
+        "chunks": {"a": ["js/a.new.js"]},
+        "assets": {"js/a.new.js": {"name": "js/a.new.js"}},
+    }
+    patched = patch_manifest(manifest, partial)
+    assert patched["chunks"] == {"a": ["js/a.new.js"], "b": ["js/b.js"]}
+    assert sorted(patched["assets"]) == ["js/a.new.js", "js/b.js"]
+    assert patched["publicPath"] == "/static/dist/"
+
+    pytest.raises(RebuildError, patch_manifest, manifest, dict(partial, status="x"))
+
+
+def test_rebuild(app, project, script_info_assets, instance_path, fake_build):
+    """Test rebuilding the entries of a package."""
+    runner = CliRunner()
+    source = os.path.join(instance_path, "search_ui", "js", "search_ui", "index.js")
+
+    with app.app_context():
+        fake_build(project)
+    result = runner.invoke(rebuild, [source], obj=script_info_assets)
+    assert result.exit_code == 1
+    assert "No manifest found" in result.output
+
+    dist_dir = app.config["WEBPACKEXT_PROJECT_DISTDIR"]
+    os.makedirs(dist_dir)
+    manifest_path = os.path.join(dist_dir, "manifest.json")
+    with open(manifest_path, "w") as fp:
+        json.dump(
+            {
+                "status": "done",
+                "chunks": {name: ["js/" + name + ".js"] for name in "ab"},
+                "assets": {"js/a.js": {}, "js/b.js": {}},
+            },
+            fp,
+        )
+
+    result = runner.invoke(rebuild, ["-n", "deposit"], obj=script_info_assets)
+    assert result.exit_code == 0
+    assert "Rebuilding a, b." in result.output
+
+    result = runner.invoke(rebuild, [source], obj=script_info_assets)
+    assert result.exit_code == 0, result.output
+    assert "Rebuilt 1 entries" in result.output
+    with open(manifest_path) as fp:
+        chunks = json.load(fp)["chunks"]
+    assert sorted(chunks) == ["a", "b", "search"]
+    assert chunks["a"] == ["js/a.js"]
+    assert chunks["search"][-1] == "js/search.js"
+
+    result = runner.invoke(rebuild, ["unknown"], obj=script_info_assets)
+    assert result.exit_code == 1
+    assert "not provided by any bundle" in result.output
+
+
+def test_rebuild_differential(app, project, fake_build):
+    """Test patching the manifests of both targets of a differential build."""
+    app.config["ASSETS_DIFFERENTIAL_BUILD"] = True
+    dist_dir = app.config["WEBPACKEXT_PROJECT_DISTDIR"]
+    os.makedirs(dist_dir)
+    paths = [
+        os.path.join(dist_dir, "manifest.json"),
+        os.path.join(dist_dir, "manifest.modern.json"),
+    ]
+    for path in paths:
+        with open(path, "w") as fp:
+            json.dump({"status": "done", "chunks": {}, "assets": {}}, fp)
+
+    with app.app_context():
+        project.create()
+        fake_build(project)
+        project.rebuild(["search"])
+        with open(
+            os.path.join(project.path, "build", "config.rebuild-modern.json")
+        ) as fp:
+            assert json.load(fp)["build"]["target"]["name"] == "modern"
+    for path, target in zip(paths, ("legacy", "modern")):
+        with open(path) as fp:
+            chunks = json.load(fp)["chunks"]
+        assert list(chunks) == ["search"]
+        assert chunks["search"][-1] == "js/search.{0}.js".format(target)
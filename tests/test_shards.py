@@ -0,0 +1,148 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Test sharded builds."""
+
+import json
+import os
+
+import pytest
+from flask_webpackext import WebpackBundle, current_manifest
+
+from invenio_assets import InvenioAssets
+from invenio_assets.shards import (
+    ManifestMergeError,
+    merge_manifests,
+    shard_entries,
+)
+from invenio_assets.webpack import InvenioWebpackBundleProject
+
+
+def test_shard_entries():
+    """Test the deterministic split of the entries."""
+    entry = {name: "./{0}.js".format(name) for name in "edcba"}
+    assert shard_entries(entry, 2) == [
+        {"a": "./a.js", "c": "./c.js", "e": "./e.js"},
+        {"b": "./b.js", "d": "./d.js"},
+    ]
+    assert shard_entries({"a": "./a.js"}, 3) == [{"a": "./a.js"}]
+    groups = [["a", "e"], ["b", "c", "x"]]
+    assert shard_entries(entry, 2, groups) == [
+        {"a": "./a.js", "d": "./d.js", "e": "./e.js"},
+        {"b": "./b.js", "c": "./c.js"},
+    ]
+    # Groups sharing entries are merged
+    assert shard_entries(entry, 2, [["a"], ["b", "e"], ["a", "b"]]) == [
+        {"a": "./a.js", "b": "./b.js", "e": "./e.js"},
+        {"c": "./c.js", "d": "./d.js"},
+    ]
+    assert shard_entries(entry, 3, groups) == [
+        {"a": "./a.js", "e": "./e.js"},
+        {"b": "./b.js", "c": "./c.js"},
+        {"d": "./d.js"},
+    ]
+
+
+def test_merge_manifests():
+    """Test merging the manifests of the shards."""
+    copied = {"name": "js/tinymce/skin.css", "path": "/dist/js/tinymce/skin.css"}
+
+    def manifest(index, name):
+        chunks = ["js/manifest.{0}.js".format(index), "js/{0}.js".format(index)]
+        chunks.append("js/{0}.js".format(name))
+        assets = {chunk: {"name": chunk} for chunk in chunks}
+        assets[copied["name"]] = copied
+        return {"status": "done", "chunks": {name: chunks}, "assets": assets}
+
+    first, second = manifest(0, "a"), manifest(1, "b")
+    merged = merge_manifests([first, second])
+    assert merged == merge_manifests([second, first])
+    assert merged["chunks"] == {
+        "a": ["js/manifest.0.js", "js/0.js", "js/a.js"],
+        "b": ["js/manifest.1.js", "js/1.js", "js/b.js"],
+    }
+    assert len(merged["assets"]) == 7
+
+    conflict = dict(second, chunks={"a": ["js/b.js"]})
+    pytest.raises(ManifestMergeError, merge_manifests, [first, conflict])
+    pending = dict(second, status="compile")
+    pytest.raises(ManifestMergeError, merge_manifests, [first, pending])
+
+
+def test_build_shards(app, instance_path, fake_build):
+    """Test building the entries of a project in shards."""
+    bundle_dir = os.path.join(instance_path, "bundle")
+    os.makedirs(bundle_dir)
+    project = InvenioWebpackBundleProject(
+        "invenio_assets.webpack",
+        project_folder="assets",
+        config_path="build/config.json",
+        bundles=[
+            WebpackBundle("tests", bundle_dir, entry={"a": "./a.js", "c": "./c.js"}),
+            WebpackBundle("tests", bundle_dir, entry={"b": "./b.js"}),
+        ],
+    )
+    dist_dir = os.path.join(instance_path, "dist")
+    os.makedirs(dist_dir)
+    open(os.path.join(dist_dir, "stale.js"), "w").close()
+    app.config.update(
+        WEBPACKEXT_PROJECT=project,
+        WEBPACKEXT_PROJECT_DISTDIR=dist_dir,
+        ASSETS_WEBPACK_SHARDS=2,
+    )
+    InvenioAssets(app)
+
+    with app.app_context():
+        project.create()
+        fake_build(project)
+        assert project.build() == 0
+
+        with open(os.path.join(dist_dir, "manifest.json")) as fp:
+            manifest = json.load(fp)
+        chunks = manifest["chunks"]
+        assert sorted(chunks) == ["a", "b", "c"]
+        # Entries of the same bundle share the runtime and vendor chunks
+        assert chunks["a"][:2] == chunks["c"][:2]
+        assert not set(chunks["a"][:2]) & set(chunks["b"][:2])
+        assert set(manifest["assets"]) == {
+            name for names in chunks.values() for name in names
+        }
+        assert not os.path.exists(os.path.join(dist_dir, "stale.js"))
+
+        # Entries rendered in the same pages are built in the same shard
+        app.config["ASSETS_WEBPACK_SHARD_GROUPS"] = [["b", "c"]]
+        assert project.build() == 0
+        with open(os.path.join(dist_dir, "manifest.json")) as fp:
+            chunks = json.load(fp)["chunks"]
+        assert len({names[0] for names in chunks.values()}) == 1
+
+        fake_build(project, exit_code=2)
+        with pytest.raises(RuntimeError):
+            project.build()
+
+
+def test_shard_runtimes_warning(app, manifest, caplog):
+    """Test the warning for the pages rendering entries of several shards."""
+    with open(manifest) as fp:
+        data = json.load(fp)
+    data["chunks"]["search"][0] = "js/manifest.1.js"
+    data["assets"]["js/manifest.1.js"] = {"publicPath": "/static/dist/js/m1.js"}
+    with open(manifest, "w") as fp:
+        json.dump(data, fp)
+    app.config.update(ASSETS_WEBPACK_SHARDS=2)
+    InvenioAssets(app)
+
+    @app.route("/<path:names>")
+    def index(names):
+        return "".join(current_manifest[name].__html__() for name in names.split("/"))
+
+    client = app.test_client()
+    assert client.get("/base.js/deposit.js").status_code == 200
+    assert not caplog.records
+    for _ in range(2):
+        assert client.get("/base.js/search.js").status_code == 200
+    assert [record.getMessage() for record in caplog.records] == [
+        "Endpoint index renders webpack entries built in different shards "
+        "(base, search), which load the modules they share once per shard. Add "
+        "them to ASSETS_WEBPACK_SHARD_GROUPS to build them in the same shard."
+    ]
@@ -0,0 +1,65 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Test incremental synchronization of files."""
+
+import os
+import shutil
+from os.path import exists, join
+
+from invenio_assets.sync import SyncState, sync_files
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as fp:
+        fp.write(content)
+
+
+def test_sync_files(instance_path):
+    """Test that only changed files are copied."""
+    src = join(instance_path, "src")
+    dst = join(instance_path, "dst")
+    _write(join(src, "a.js"), "a")
+    _write(join(src, "css", "b.css"), "b")
+
+    def sources():
+        return [
+            (join(src, "a.js"), "a.js"),
+            (join(src, "css", "b.css"), "css/b.css"),
+        ]
+
+    copied = []
+
+    def copy(s, d):
+        copied.append(d)
+        shutil.copy(s, d)
+
+    state = SyncState(join(dst, ".state.json"))
+    assert sync_files(sources(), dst, state.load(), copy) == (2, 0, 0, 0)
+    state.save()
+    assert exists(join(dst, "css", "b.css"))
+
+    # Nothing changed
+    state = SyncState(join(dst, ".state.json")).load()
+    assert sync_files(sources(), dst, state, copy) == (0, 0, 0, 2)
+    assert len(copied) == 2
+
+    # Touched, but same content
+    st = os.stat(join(src, "a.js"))
+    os.utime(join(src, "a.js"), ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert sync_files(sources(), dst, state, copy) == (0, 0, 0, 2)
+    assert len(copied) == 2
+
+    # Changed content
+    _write(join(src, "a.js"), "changed")
+    assert sync_files(sources(), dst, state, copy) == (0, 1, 0, 1)
+    with open(join(dst, "a.js")) as fp:
+        assert fp.read() == "changed"
+
+    # Deleted source
+    assert sync_files(sources()[:1], dst, state, copy) == (0, 0, 1, 1)
+    assert not exists(join(dst, "css", "b.css"))
+
+    # Forced copy
+    assert sync_files(sources()[:1], dst, state, copy, force=True) == (0, 1, 0, 0)
@@ -3,16 +3,69 @@
 
 """Test Webpack module."""
 
+import json
+import os
+from importlib.metadata import EntryPoint
+
 import pytest
-from flask_webpackext import WebpackBundle
+from flask_webpackext import WebpackBundle, WebpackBundleProject, current_manifest
+from mock import patch
 from pywebpack import UnsupportedExtensionError
 
+from invenio_assets import InvenioAssets, current_assets
+from invenio_assets.buildcache import build_fingerprint
 from invenio_assets.webpack import (
+    BundleRegistry,
+    ChunkTable,
+    InvenioWebpackBundleProject,
+    RenderCache,
+    UniqueJinjaManifest,
     UniqueJinjaManifestEntry,
     UniqueJinjaManifestLoader,
     WebpackThemeBundle,
+    emitted_chunk_paths,
+    invenio_config,
+    rspack_project,
+    webpack_bundles,
+    webpack_project,
 )
 
+bundle = WebpackBundle("tests", "assets", entry={"test": "./test.js"})
+
+
+def test_bundle_registry(app):
+    """Test lazy discovery of bundles."""
+    eps = [EntryPoint(name="test", value="test_webpack:bundle", group="test")]
+
+    # Projects share the registry, which does not scan the entry points at import
+    assert webpack_project._bundles_iter is webpack_bundles
+    assert rspack_project._bundles_iter is webpack_bundles
+
+    registry = BundleRegistry("test")
+    with patch("invenio_assets.webpack.entry_points", return_value=eps) as mock:
+        assert list(registry) == [bundle]
+        assert list(registry) == [bundle]
+        mock.assert_called_once_with(group="test")
+    assert registry.package(bundle) == "test_webpack"
+    assert registry.package(object()) is None
+
+    # Entry points are cached in the cache directory
+    app.config["ASSETS_CACHE_DIR"] = os.path.join(app.instance_path, "cache")
+    with app.app_context():
+        with patch("invenio_assets.webpack.entry_points", return_value=eps) as mock:
+            assert list(BundleRegistry("test")) == [bundle]
+            assert mock.call_count == 1
+            assert list(BundleRegistry("test")) == [bundle]
+            assert mock.call_count == 1
+
+        # A change of the installed distributions invalidates the cache
+        with patch("invenio_assets.webpack.entry_points", return_value=[]) as mock:
+            with patch(
+                "invenio_assets.webpack.distributions_fingerprint", return_value="new"
+            ):
+                assert list(BundleRegistry("test")) == []
+            assert mock.call_count == 1
+
 
 def test_webpack_theme_bundle_outside_app():
     """Access a bundle property outside app context."""
@@ -73,6 +126,45 @@ def test_webpack_theme_bundle(app):
         assert bundle._active_theme_bundle is None
 
 
+def test_webpack_theme_bundle_cache(app):
+    """Test caching of the resolved theme bundle."""
+    bundle = WebpackThemeBundle(
+        "tests",
+        "assets",
+        default="semantic-ui",
+        themes={"semantic-ui": dict(entry={}), "bootstrap3": dict(entry={})},
+    )
+    with app.app_context():
+        with patch.object(bundle, "_select", wraps=bundle._select) as select:
+            assert bundle.path == bundle.themes["semantic-ui"].path
+            assert bundle.entry == {}
+            assert select.call_count == 1
+
+            # Changing APP_THEME invalidates the cache
+            app.config["APP_THEME"] = ["bootstrap3"]
+            assert bundle.path == bundle.themes["bootstrap3"].path
+            assert select.call_count == 2
+
+    # Resolved bundle is used outside of the application context
+    assert bundle.path == bundle.themes["bootstrap3"].path
+
+
+def test_resolve_theme_bundles(app):
+    """Test resolving theme bundles when initializing the extension."""
+    bundle = WebpackThemeBundle(
+        "tests",
+        "assets",
+        default="semantic-ui",
+        themes={"semantic-ui": dict(entry={})},
+    )
+    app.config["ASSETS_RESOLVE_THEMES_ON_INIT"] = True
+    app.config["WEBPACKEXT_PROJECT"] = WebpackBundleProject(
+        __name__, project_folder="assets", bundles=[bundle]
+    )
+    InvenioAssets(app)
+    assert bundle.path == bundle.themes["semantic-ui"].path
+
+
 def test_unique_jinja_manifest_entry(app):
     """Test UniqueJinjaManifestEntry."""
     # b.js is only output once, despite being twice in manifest
@@ -92,13 +184,336 @@ def test_unique_jinja_manifest_entry(app):
             '<script src="/b.js"></script>'
         )
 
-    # Unsupported file extension
-    m = UniqueJinjaManifestEntry("script", ["/a.less"])
+    # Unsupported file extension is detected when the entry is created
+    pytest.raises(
+        UnsupportedExtensionError, UniqueJinjaManifestEntry, "script", ["/a.less"]
+    )
+
+
+def test_unique_jinja_manifest_entry_chunks(app):
+    """Test that chunk tags are rendered once, on entry creation."""
+    m = UniqueJinjaManifestEntry("manifestname", ["/a.JS", "/b.css"])
+    assert [c[1:] for c in m._chunks] == [
+        (".js", "/a.JS", '<script src="/a.JS"></script>'),
+        (".css", "/b.css", '<link rel="stylesheet" href="/b.css" />'),
+    ]
+    assert list(m) == ["/a.JS", "/b.css"]
+
+    # Chunks shared between entries are only output once per request
+    other = UniqueJinjaManifestEntry("other", ["/b.css", "/c.js"])
     with app.test_request_context():
-        pytest.raises(UnsupportedExtensionError, m.__html__)
+        assert m.__html__() == (
+            '<script src="/a.JS"></script>\n' '<link rel="stylesheet" href="/b.css" />'
+        )
+        assert other.__html__() == '<script src="/c.js"></script>'
 
 
 def test_unique_jinja_manifest_loader(app):
     """Test UniqueJinjaManifestLoader."""
     loader = UniqueJinjaManifestLoader()
     assert loader.entry_cls == UniqueJinjaManifestEntry
+
+
+def test_chunk_table():
+    """Test interning of chunk paths."""
+    table = ChunkTable()
+    assert table.intern("/a.js") == 0
+    assert table.intern("/b.js") == 1
+    assert table.intern("/a.js") == 0
+    assert len(table) == 2
+    assert table.paths == ["/a.js", "/b.js"]
+
+
+def test_unique_jinja_manifest_entry_shared_ids(app):
+    """Test that the entries of a manifest share the ID of a chunk."""
+    manifest = UniqueJinjaManifest()
+    a = UniqueJinjaManifestEntry("a", ["/vendor.js", "/a.js"])
+    b = UniqueJinjaManifestEntry("b", ["/vendor.js", "/b.js"])
+    manifest.add(a)
+    manifest.add(b)
+    assert a._chunks[0][0] == b._chunks[0][0]
+    assert a._chunks[1][0] != b._chunks[1][0]
+    assert len(manifest.chunk_table) == 3
+
+    with app.test_request_context():
+        a.__html__()
+        # Entry created after the request state was allocated
+        c = UniqueJinjaManifestEntry(
+            "c", ["/a.js", "/late.js"], chunk_table=manifest.chunk_table
+        )
+        assert c.__html__() == '<script src="/late.js"></script>'
+
+        # Entry of a manifest loaded during the request
+        reloaded = UniqueJinjaManifest()
+        d = UniqueJinjaManifestEntry("d", ["/vendor.js", "/late.js", "/d.js"])
+        reloaded.add(d)
+        assert d._chunk_table is not manifest.chunk_table
+        assert d.__html__() == '<script src="/d.js"></script>'
+        assert emitted_chunk_paths() == ["/vendor.js", "/late.js", "/d.js"]
+
+
+def test_emitted_chunk_paths(app):
+    """Test the chunks output in a request, with more than 8 chunk IDs."""
+    manifest = UniqueJinjaManifest()
+    paths = ["/{0}.js".format(i) for i in range(20)]
+    a = UniqueJinjaManifestEntry("a", paths[:12])
+    b = UniqueJinjaManifestEntry("b", paths[8:])
+    manifest.add(a)
+    manifest.add(b)
+
+    with app.test_request_context():
+        assert emitted_chunk_paths() == []
+        a.__html__()
+        assert emitted_chunk_paths() == paths[:12]
+        assert b.__html__() == "\n".join(
+            '<script src="{0}"></script>'.format(path) for path in paths[12:]
+        )
+        assert emitted_chunk_paths() == paths
+
+
+def test_render_cache():
+    """Test the LRU render cache."""
+    cache = RenderCache(maxsize=2)
+    cache.set(("a",), ("<a>", b"1"))
+    cache.set(("a", "b"), ("<b>", b"11"))
+    assert cache.get(("a",)) == ("<a>", b"1")
+    cache.set(("c",), ("<c>", b"001"))
+    # ("a", "b") was the least recently used key
+    assert cache.get(("a", "b")) is None
+    assert cache.info() == (1, 1, 2, 2)
+
+    cache.clear()
+    assert cache.info() == (0, 0, 2, 0)
+
+    # Disabled cache
+    cache = RenderCache(maxsize=0)
+    cache.set(("a",), ("<a>", b"1"))
+    assert cache.get(("a",)) is None
+
+
+def test_unique_jinja_manifest_render_cache(app, manifest):
+    """Test caching of the output of a sequence of entries."""
+    InvenioAssets(app)
+
+    def render(*names):
+        return [current_manifest[name].__html__() for name in names]
+
+    with app.test_request_context():
+        assert isinstance(current_manifest._get_current_object(), UniqueJinjaManifest)
+        first = render("base.js", "search.js", "base.css")
+        assert first == [
+            '<script src="/static/dist/js/manifest.js"></script>\n'
+            '<script src="/static/dist/js/vendor.js"></script>\n'
+            '<script src="/static/dist/js/base.js"></script>',
+            '<script src="/static/dist/js/search.js"></script>',
+            '<link rel="stylesheet" href="/static/dist/css/base.css" />',
+        ]
+        assert current_assets.render_cache.info() == (0, 3, 256, 3)
+
+    # Same sequence of entries is served from the cache
+    with app.test_request_context():
+        assert render("base.js", "search.js", "base.css") == first
+        assert current_assets.render_cache.info() == (3, 3, 256, 3)
+        # Emitted chunks are restored from the cache as well
+        assert render("deposit.js") == [
+            '<script src="/static/dist/js/deposit.js"></script>'
+        ]
+
+    # Different order gives a different output
+    with app.test_request_context():
+        assert render("search.js", "base.js")[1] == (
+            '<script src="/static/dist/js/base.js"></script>'
+        )
+        assert current_assets.render_cache.info().misses == 6
+
+
+def test_unique_jinja_manifest_loader_reload(app, manifest):
+    """Test reloading of the manifest when the file changes."""
+    app.config["ASSETS_MANIFEST_RELOAD_INTERVAL"] = 0
+    InvenioAssets(app)
+
+    def write(data):
+        tmp = manifest + ".tmp"
+        with open(tmp, "w") as fp:
+            json.dump(data, fp)
+        os.replace(tmp, manifest)
+
+    with app.app_context():
+        first = current_manifest._get_current_object()
+        # Unchanged file gives the same manifest
+        assert current_manifest._get_current_object() is first
+
+        # Unfinished build keeps the current manifest
+        write({"status": "compile", "chunks": {}})
+        assert current_manifest._get_current_object() is first
+
+        # So does a build which removed the manifest
+        os.remove(manifest)
+        assert current_manifest._get_current_object() is first
+
+        write(
+            {
+                "status": "done",
+                "chunks": {"base": ["js/base.js"]},
+                "assets": {"js/base.js": {"publicPath": "/static/dist/js/new.js"}},
+            }
+        )
+        second = current_manifest._get_current_object()
+        assert second is not first
+        assert list(second["base.js"]) == ["/static/dist/js/new.js"]
+
+
+def test_unique_jinja_manifest_loader_reload_interval(app, manifest):
+    """Test that the manifest file is not checked before the interval."""
+    loader = UniqueJinjaManifestLoader(reload_interval=3600)
+    with app.app_context():
+        first = loader.load(manifest)
+        os.remove(manifest)
+        assert loader.load(manifest) is first
+
+
+def test_incremental_create(app, instance_path):
+    """Test incremental creation of the webpack project."""
+    bundle_dir = os.path.join(instance_path, "bundle")
+    os.makedirs(os.path.join(bundle_dir, "js"))
+    with open(os.path.join(bundle_dir, "js", "app.js"), "w") as fp:
+        fp.write("app")
+    project = InvenioWebpackBundleProject(
+        "invenio_assets.webpack",
+        project_folder="assets",
+        config_path="build/config.json",
+        bundles=[WebpackBundle("tests", bundle_dir, entry={"app": "./js/app.js"})],
+    )
+    app.config.update(
+        ASSETS_WEBPACK_INCREMENTAL_CREATE=True, WEBPACKEXT_PROJECT=project
+    )
+    InvenioAssets(app)
+
+    with app.app_context():
+        project.create()
+        app_js = os.path.join(project.path, "js", "app.js")
+        assert os.path.exists(app_js)
+        assert os.path.exists(os.path.join(project.path, "build", "webpack.config.js"))
+        with open(project.config_path) as fp:
+            assert json.load(fp)["entry"] == {"app": "./js/app.js"}
+        mtimes = [
+            os.stat(path).st_mtime_ns
+            for path in (app_js, project.config_path, project.npmpkg.package_json_path)
+        ]
+
+        # Nothing changed: no file is written again
+        project.create()
+        assert mtimes == [
+            os.stat(path).st_mtime_ns
+            for path in (app_js, project.config_path, project.npmpkg.package_json_path)
+        ]
+
+        # Deleted bundle file is removed from the project
+        os.remove(os.path.join(bundle_dir, "js", "app.js"))
+        project.create()
+        assert not os.path.exists(app_js)
+
+
+def test_build_compress(app, instance_path):
+    """Test compressing the webpack output after a build."""
+    dist_dir = os.path.join(instance_path, "dist")
+    os.makedirs(dist_dir)
+    with open(os.path.join(dist_dir, "app.js"), "w") as fp:
+        fp.write("var a = 1;\n" * 200)
+    app.config.update(ASSETS_COMPRESS=True, WEBPACKEXT_PROJECT_DISTDIR=dist_dir)
+    InvenioAssets(app)
+
+    with app.app_context():
+        with patch.object(WebpackBundleProject, "build", return_value=None) as build:
+            webpack_project.build("--mode", "production")
+        build.assert_called_once_with("--mode", "production")
+    assert os.path.exists(os.path.join(dist_dir, "app.js.gz"))
+
+
+def test_build_cache(app, instance_path):
+    """Test restoring the build output from the build cache."""
+    bundle_dir = os.path.join(instance_path, "bundle")
+    os.makedirs(bundle_dir)
+    with open(os.path.join(bundle_dir, "app.js"), "w") as fp:
+        fp.write("app")
+    project = InvenioWebpackBundleProject(
+        "invenio_assets.webpack",
+        project_folder="assets",
+        config_path="build/config.json",
+        bundles=[WebpackBundle("tests", bundle_dir, entry={"app": "./app.js"})],
+    )
+    dist_dir = os.path.join(instance_path, "dist")
+    app.config.update(
+        ASSETS_BUILD_CACHE=True,
+        WEBPACKEXT_PROJECT=project,
+        WEBPACKEXT_PROJECT_DISTDIR=dist_dir,
+    )
+    InvenioAssets(app)
+
+    def build(*args):
+        os.makedirs(dist_dir, exist_ok=True)
+        with open(os.path.join(dist_dir, "app.js"), "w") as fp:
+            fp.write("built")
+        return 0
+
+    def install(*args):
+        with open(os.path.join(project.path, "package-lock.json"), "w") as fp:
+            fp.write("{}")
+
+    with app.app_context():
+        with patch.object(WebpackBundleProject, "build", side_effect=build) as run:
+            with patch.object(
+                WebpackBundleProject, "install", side_effect=install
+            ) as install:
+                project.buildall()
+                assert run.call_count == install.call_count == 1
+
+                # Same inputs: the output is restored without npm
+                os.remove(os.path.join(dist_dir, "app.js"))
+                project.buildall()
+                assert run.call_count == install.call_count == 1
+                assert os.path.exists(os.path.join(dist_dir, "app.js"))
+                project.build()
+                assert run.call_count == 1
+
+                # Changed bundle file
+                with open(os.path.join(bundle_dir, "app.js"), "w") as fp:
+                    fp.write("changed")
+                project.buildall()
+                assert run.call_count == install.call_count == 2
+    assert len(os.listdir(app.config["ASSETS_BUILD_CACHE_DIR"])) == 2
+
+
+def test_build_fingerprint_directories(instance_path):
+    """Test that the files inside linked directories are fingerprinted."""
+    src_dir = os.path.join(instance_path, "src")
+    os.makedirs(os.path.join(src_dir, "js", "components"))
+    filepath = os.path.join(src_dir, "js", "components", "app.js")
+    with open(filepath, "w") as fp:
+        fp.write("app")
+    files = [(os.path.join(src_dir, "js"), "js")]
+    fingerprint = build_fingerprint(files)
+    assert fingerprint == build_fingerprint(files)
+    assert fingerprint == build_fingerprint([(filepath, "js/components/app.js")])
+
+    with open(filepath, "w") as fp:
+        fp.write("changed")
+    assert build_fingerprint(files) != fingerprint
+
+
+def test_invenio_config(app):
+    """Test the build cache and parallelism settings in the webpack config."""
+    app.config.update(ASSETS_WEBPACK_BABEL_WORKERS=4)
+    InvenioAssets(app)
+    with app.app_context():
+        build = invenio_config()["build"]
+        assert build["cache"] is False
+        assert build["parallel"] == {"babel": 4, "minimizer": True}
+        assert "assetsURL" in build
+
+        app.config["ASSETS_WEBPACK_CACHE"] = True
+        cache = invenio_config()["build"]["cache"]
+        assert cache["directory"] == app.config["ASSETS_WEBPACK_CACHE_DIR"]
+        assert cache["directory"].startswith(app.instance_path)
+        assert cache == invenio_config()["build"]["cache"]
+        assert webpack_project.config["build"]["cache"] == cache